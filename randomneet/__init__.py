@@ -1,4 +1,24 @@
-import randomneet.constraints as constraints  # noqa
-import randomneet.randomizer as randomizer  # noqa
-import randomneet.topology as topology  # noqa
-import randomneet.dynamics as dynamics  # noqa
+import importlib
+import sys
+
+__all__ = ['constraints', 'randomizer', 'topology', 'dynamics', 'tables', 'ensemble',
+           'service', 'cli', 'shared', 'summary', 'attractors', 'profiling',
+           'mcmc', 'importance', 'arrays', 'encoded']
+
+if sys.version_info >= (3, 7):
+    def __getattr__(name):
+        """
+        Import submodules on first use, so that importing randomneet does not
+        pay for importing neet, networkx and numpy.
+        """
+        if name in __all__:
+            module = importlib.import_module('.' + name, __name__)
+            globals()[name] = module
+            return module
+        raise AttributeError('module {!r} has no attribute {!r}'.format(__name__, name))
+
+    def __dir__():
+        return sorted(set(globals()) | set(__all__))
+else:
+    for _name in __all__:
+        importlib.import_module('.' + _name, __name__)
@@ -0,0 +1,5 @@
+import sys
+
+from randomneet.cli import main
+
+sys.exit(main())
@@ -0,0 +1,25 @@
+import sys
+
+
+def is_network(obj):
+    """
+    Determine whether an object is a ``neet.Network`` without importing neet.
+    If neet has not been imported, then no object can be a neet network.
+
+    :param obj: the object
+    :returns: ``True`` if the object is a neet.Network
+    """
+    neet = sys.modules.get('neet')
+    return neet is not None and isinstance(obj, neet.Network)
+
+
+def is_logic_network(obj):
+    """
+    Determine whether an object is a ``neet.boolean.LogicNetwork`` without
+    importing neet.
+
+    :param obj: the object
+    :returns: ``True`` if the object is a neet.boolean.LogicNetwork
+    """
+    boolean = sys.modules.get('neet.boolean')
+    return boolean is not None and isinstance(obj, boolean.LogicNetwork)
@@ -0,0 +1,115 @@
+import numpy as np
+
+from .dynamics import NetworkRandomizer
+from .tables import canonical
+
+
+def _capacity(randomizer):
+    """
+    Get the number of states of the widest truth table a randomizer can
+    draw, if its topology randomizer preserves in-degrees, or ``None``.
+    """
+    trand = randomizer.trand if isinstance(randomizer, NetworkRandomizer) else randomizer
+    if 'in_degree' not in trand.preserves:
+        return None
+    return 2**max([k for _, k in randomizer.graph.in_degree()] + [0])
+
+
+def to_arrays(randomizer, n, out=None, packed=False):
+    """
+    Draw ``n`` networks or graphs from a randomizer into dense arrays.
+
+    The adjacency tensor has shape ``(n, N, N)``, where :math:`N` is the
+    number of nodes, and ``adjacency[s, i, j]`` is ``1`` if the
+    :math:`s`-th sample has an edge from node :math:`i` to node :math:`j`.
+
+    If the randomizer is a ``NetworkRandomizer``, the truth tables are drawn
+    with its ``random_tables`` method and written straight into a tensor of
+    shape ``(n, N, 2**kmax)``, where ``kmax`` is the largest in-degree. The
+    entry ``tables[s, j, x]`` is the output of node :math:`j` when its
+    predecessors, in increasing order, are in the state whose binary
+    representation (most significant bit first) is :math:`x`; the states
+    of nodes with fewer than ``kmax`` inputs are padded with zeros. If
+    ``packed`` is ``True``, each node's states are packed eight to a byte
+    with ``numpy.packbits``, giving a tensor of shape
+    ``(n, N, ceil(2**kmax / 8))``. For topology randomizers, ``tables`` is
+    ``None``.
+
+    Preallocated ``(adjacency, tables)`` buffers may be provided as ``out``,
+    in which case they are overwritten and returned, and ``kmax`` is given by
+    the width of ``tables``. Without buffers, ``kmax`` is the largest
+    in-degree of the base graph if the topology randomizer preserves
+    in-degrees, and otherwise grows as wider tables are drawn.
+
+    .. code-block:: python
+
+        adjacency, tables = to_arrays(UniformBias(myeloid, trand=InDegree), 1000)
+
+    :param randomizer: the randomizer
+    :type randomizer: AbstractRandomizer
+    :param n: the number of samples
+    :type n: int
+    :param out: preallocated uint8 ``(adjacency, tables)`` buffers
+    :type out: a pair of numpy.ndarray, or None
+    :param packed: whether to pack the truth tables into bits
+    :type packed: bool
+    :returns: the ``(adjacency, tables)`` pair of uint8 numpy.ndarray
+    :raises ValueError: if the buffers have the wrong shape, or a truth table
+                        is too wide for them
+    """
+    size = len(randomizer.graph)
+    dynamical = isinstance(randomizer, NetworkRandomizer)
+    bits = 8 if packed else 1
+
+    if out is None:
+        adjacency = np.zeros((n, size, size), dtype=np.uint8)
+        capacity = _capacity(randomizer) if dynamical else None
+        tables = None
+        if capacity is not None:
+            tables = np.zeros((n, size, -(-capacity // bits)), dtype=np.uint8)
+        growable = capacity is None
+    else:
+        adjacency, tables = out
+        if adjacency.shape != (n, size, size):
+            raise ValueError('adjacency must have shape {}'.format((n, size, size)))
+        if dynamical and (tables is None or tables.ndim != 3 or tables.shape[:2] != (n, size)):
+            raise ValueError('tables must have shape {} + (width,)'.format((n, size)))
+        capacity = tables.shape[2] * bits if dynamical else None
+        growable = False
+        adjacency[...] = 0
+
+    if dynamical and capacity is None:
+        capacity = bits
+        tables = np.zeros((n, size, 1), dtype=np.uint8)
+
+    states = np.zeros((size, capacity), dtype=np.uint8) if dynamical else None
+    for sample in range(n):
+        if not dynamical:
+            graph = randomizer.random()
+            index = dict((node, i) for i, node in enumerate(graph))
+            for source, target in graph.edges():
+                adjacency[sample, index[source], index[target]] = 1
+            continue
+
+        _, functions = randomizer.random_tables()
+        widest = max([len(table) for _, table in functions] + [1])
+        if widest > capacity:
+            if not growable:
+                raise ValueError('a truth table with {} states does not fit in the tables'.format(widest))
+            while capacity < widest:
+                capacity *= 2
+            grown = np.zeros((n, size, -(-capacity // bits)), dtype=np.uint8)
+            grown[:, :, :tables.shape[2]] = tables
+            tables = grown
+            states = np.zeros((size, capacity), dtype=np.uint8)
+
+        states[...] = 0
+        for node, (predecessors, table) in enumerate(functions):
+            predecessors, table = canonical(predecessors, table)
+            adjacency[sample, list(predecessors), node] = 1
+            states[node, :len(table)] = table
+        if packed:
+            tables[sample] = np.packbits(states, axis=1)
+        else:
+            tables[sample] = states
+    return adjacency, tables
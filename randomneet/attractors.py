@@ -0,0 +1,178 @@
+import numpy as np
+
+from collections import namedtuple
+from .tables import network_tables
+from ._neet import is_logic_network
+
+#: The attractors found in a network's state space. ``lengths`` is the sorted
+#: list of the cycle length of each attractor; ``exhaustive`` is ``False`` if
+#: the attractors were found by sampling initial states, in which case
+#: attractors with small basins may have been missed.
+Attractors = namedtuple('Attractors', ['lengths', 'exhaustive'])
+
+
+def compile_network(network):
+    """
+    Get the predecessors, as integer arrays, and the dense truth table of
+    each node of a logic network.
+
+    :param network: the network
+    :type network: neet.boolean.LogicNetwork
+    :returns: a list of ``(predecessors, table)`` pairs, one per node
+    :raises TypeError: if the network is not a logic network
+    """
+    if not is_logic_network(network):
+        raise TypeError('network must be a neet.boolean.LogicNetwork')
+    return [(np.asarray(predecessors, dtype=np.int64), table)
+            for predecessors, table in network_tables(network)]
+
+
+def step(rows, states):
+    """
+    Synchronously update a batch of states.
+
+    :param rows: the compiled network, as returned by ``compile_network``
+    :type rows: list
+    :param states: the states, one per row
+    :type states: numpy.ndarray of bool with shape ``(m, n)``
+    :returns: the updated states
+    """
+    updated = np.empty_like(states)
+    for node, (predecessors, table) in enumerate(rows):
+        index = np.zeros(len(states), dtype=np.int64)
+        for predecessor in predecessors:
+            index = (index << 1) | states[:, predecessor]
+        updated[:, node] = table[index]
+    return updated
+
+
+def transitions(rows):
+    """
+    Compute the successor of every state of a network. State :math:`s`
+    encodes the state of node :math:`i` in bit :math:`i`, as in neet.
+
+    :param rows: the compiled network, as returned by ``compile_network``
+    :type rows: list
+    :returns: numpy.ndarray of int with length :math:`2^n`
+    """
+    states = np.arange(2**len(rows), dtype=np.int64)
+    successors = np.zeros_like(states)
+    for node, (predecessors, table) in enumerate(rows):
+        index = np.zeros_like(states)
+        for predecessor in predecessors:
+            index = (index << 1) | ((states >> predecessor) & 1)
+        successors |= table[index].astype(np.int64) << node
+    return successors
+
+
+def _exhaustive(successors):
+    """
+    Find the attractors of a transition table.
+    """
+    # After 2^m >= 2^n steps, every state has reached its attractor
+    image = successors
+    for _ in range(int(len(successors)).bit_length()):
+        image = image[image]
+    recurrent = np.unique(image)
+
+    # Label each recurrent state by the least state on its cycle
+    label = recurrent.copy()
+    length = np.zeros(len(recurrent), dtype=np.int64)
+    current = successors[recurrent]
+    t = 1
+    while np.any(length == 0):
+        unfinished = length == 0
+        length[unfinished & (current == recurrent)] = t
+        label = np.where(unfinished, np.minimum(label, current), label)
+        current = successors[current]
+        t += 1
+    return sorted(length[label == recurrent].tolist())
+
+
+def _state_hashes(states, weights):
+    """
+    Hash each row of a batch of states to a 64-bit integer.
+    """
+    packed = np.packbits(states, axis=1).astype(np.uint64)
+    h = np.sum((packed + np.uint64(1)) * weights[:packed.shape[1]], axis=1, dtype=np.uint64)
+    h ^= h >> np.uint64(29)
+    return h * np.uint64(0xbf58476d1ce4e5b9)
+
+
+def _sampled(rows, samples, max_steps):
+    """
+    Find the attractors reached from uniformly random initial states, using a
+    vectorized form of Brent's cycle detection.
+    """
+    n = len(rows)
+    tortoise = np.random.rand(samples, n) < 0.5
+    hare = step(rows, tortoise)
+    power = np.ones(samples, dtype=np.int64)
+    length = np.ones(samples, dtype=np.int64)
+    for _ in range(max_steps):
+        active = np.any(tortoise != hare, axis=1)
+        if not np.any(active):
+            break
+        reset = active & (power == length)
+        tortoise[reset] = hare[reset]
+        power[reset] *= 2
+        length[reset] = 0
+        hare[active] = step(rows, hare[active])
+        length[active] += 1
+    found = np.all(tortoise == hare, axis=1)
+    hare, length = hare[found], length[found]
+
+    # Label each cycle by the XOR of the hashes of its states, which does not
+    # depend on where the trajectory entered the cycle
+    weights = np.random.RandomState(0).randint(1, 2**62, size=(n + 7) // 8).astype(np.uint64)
+    label = np.zeros(len(hare), dtype=np.uint64)
+    for t in range(int(length.max()) if len(length) else 0):
+        on_cycle = t < length
+        label[on_cycle] ^= _state_hashes(hare[on_cycle], weights)
+        hare[on_cycle] = step(rows, hare[on_cycle])
+    cycles = set(zip(label.tolist(), length.tolist()))
+    return sorted(length for _, length in cycles)
+
+
+def attractors(network, max_exhaustive=16, samples=1000, max_steps=10000):
+    """
+    Find the attractors of a logic network under synchronous update.
+
+    Networks with at most ``max_exhaustive`` nodes are analyzed exactly by
+    computing the successor of every state at once and following all
+    trajectories in parallel by repeated squaring of the transition table.
+    Larger networks are analyzed by following the trajectories of ``samples``
+    random initial states for at most ``max_steps`` steps; attractors with
+    small basins may be missed, so the number of attractors found is a lower
+    bound.
+
+    :param network: the network
+    :type network: neet.boolean.LogicNetwork
+    :param max_exhaustive: the largest network to analyze exactly
+    :type max_exhaustive: int
+    :param samples: the number of initial states sampled for larger networks
+    :type samples: int
+    :param max_steps: the maximum trajectory length for larger networks
+    :type max_steps: int
+    :returns: Attractors
+    """
+    rows = compile_network(network)
+    if len(rows) <= max_exhaustive:
+        return Attractors(_exhaustive(transitions(rows)), True)
+    return Attractors(_sampled(rows, samples, max_steps), False)
+
+
+def fixed_points(network, max_exhaustive=16, samples=1000, max_steps=10000):
+    """
+    Count the fixed points of a logic network. Small networks are counted
+    exactly without searching for longer cycles; see ``attractors``.
+
+    :param network: the network
+    :type network: neet.boolean.LogicNetwork
+    :returns: int
+    """
+    rows = compile_network(network)
+    if len(rows) <= max_exhaustive:
+        successors = transitions(rows)
+        return int(np.sum(successors == np.arange(len(successors))))
+    return _sampled(rows, samples, max_steps).count(1)
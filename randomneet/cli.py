@@ -0,0 +1,354 @@
+import argparse
+import gzip
+import json
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+
+TOPOLOGY = {
+    'fixed': 'FixedTopology',
+    'mean-degree': 'MeanDegree',
+    'in-degree': 'InDegree',
+    'out-degree': 'OutDegree',
+    'configuration': 'ConfigurationModel',
+}
+
+DYNAMICS = {
+    'none': None,
+    'uniform-bias': 'UniformBias',
+    'mean-bias': 'MeanBias',
+    'local-bias': 'LocalBias',
+    'mean-sensitivity': 'MeanSensitivity',
+}
+
+CONSTRAINTS = ['connected', 'irreducible', 'external-nodes', 'canalizing-nodes', 'attractors',
+               'fixed-points', 'max-cycle-length', 'sensitivity']
+
+#: the constraints whose target is measured on a logic network
+NETWORK_CONSTRAINTS = ['canalizing-nodes', 'attractors', 'fixed-points', 'max-cycle-length',
+                       'sensitivity']
+
+#: the constraints which require a dynamics randomizer
+DYNAMICAL_CONSTRAINTS = ['irreducible'] + NETWORK_CONSTRAINTS
+
+#: the dynamics randomizers whose parameters are measured on a logic network
+NETWORK_DYNAMICS = ['mean-bias', 'local-bias', 'mean-sensitivity']
+
+#: the topology randomizers which ``'local-bias'`` supports
+LOCAL_BIAS_TOPOLOGY = ['fixed', 'in-degree']
+
+
+def read_bnet(path):
+    """
+    Read a logic network from a BoolNet/BNet file, i.e. lines of the form
+    ``target, factor`` using ``&``, ``|`` and ``!`` as logical operators.
+
+    :param path: the path to the file
+    :type path: str
+    :returns: neet.boolean.LogicNetwork
+    """
+    from neet.boolean import LogicNetwork
+
+    lines = []
+    with open(path) as f:
+        for line in f:
+            line = line.split('#', 1)[0].strip()
+            if not line or line.lower().replace(' ', '') == 'targets,factors':
+                continue
+            target, factor = (part.strip() for part in line.split(',', 1))
+            for symbol, word in (('(', ' ( '), (')', ' ) '), ('&', ' AND '),
+                                 ('|', ' OR '), ('!', ' NOT ')):
+                factor = factor.replace(symbol, word)
+            lines.append('{} = {}'.format(target, ' '.join(factor.split())))
+
+    handle, logic_path = tempfile.mkstemp(suffix='.txt', text=True)
+    try:
+        with os.fdopen(handle, 'w') as f:
+            f.write('\n'.join(lines) + '\n')
+        return LogicNetwork.read_logic(logic_path)
+    finally:
+        os.remove(logic_path)
+
+
+def read_network(path, fmt='auto'):
+    """
+    Read a base network or graph from a file.
+
+    :param path: the path to the file
+    :type path: str
+    :param fmt: ``'logic'``, ``'table'``, ``'bnet'``, ``'edgelist'`` or
+                ``'auto'`` to infer the format from the file extension
+    :type fmt: str
+    :returns: neet.boolean.LogicNetwork or networkx.DiGraph
+    """
+    if fmt == 'auto':
+        ext = os.path.splitext(path)[1].lower()
+        fmt = {'.bnet': 'bnet', '.edges': 'edgelist', '.edgelist': 'edgelist',
+               '.table': 'table'}.get(ext, 'logic')
+
+    if fmt == 'edgelist':
+        import networkx as nx
+        return nx.read_edgelist(path, create_using=nx.DiGraph, nodetype=int)
+    elif fmt == 'bnet':
+        return read_bnet(path)
+    elif fmt == 'table':
+        from neet.boolean import LogicNetwork
+        return LogicNetwork.read_table(path)
+    elif fmt == 'logic':
+        from neet.boolean import LogicNetwork
+        return LogicNetwork.read_logic(path)
+    raise ValueError('unknown network format {!r}'.format(fmt))
+
+
+def encode(net):
+    """
+    Encode a logic network or graph as a compact JSON-compatible dict. Logic
+    networks are stored as the predecessors and the hex-encoded, bit-packed
+    truth table of each node; graphs as their number of nodes and edges.
+
+    :param net: the network or graph
+    :type net: neet.boolean.LogicNetwork or networkx.DiGraph
+    :returns: dict
+    """
+    import numpy as np
+    from .tables import network_tables
+
+    if hasattr(net, 'table'):
+        return {'table': [[list(map(int, predecessors)), np.packbits(table).tobytes().hex()]
+                          for predecessors, table in network_tables(net)]}
+    return {'nodes': len(net), 'edges': [[int(i), int(j)] for i, j in net.edges]}
+
+
+def decode(record):
+    """
+    Decode a network or graph encoded by ``encode``.
+
+    :param record: the encoded network
+    :type record: dict
+    :returns: neet.boolean.LogicNetwork or networkx.DiGraph
+    """
+    import numpy as np
+    from .tables import conditions
+
+    if 'table' in record:
+        from neet.boolean import LogicNetwork
+        table = []
+        for predecessors, packed in record['table']:
+            bits = np.unpackbits(np.frombuffer(bytes.fromhex(packed), dtype=np.uint8))
+            table.append((tuple(predecessors), conditions(bits[:2**len(predecessors)] != 0)))
+        return LogicNetwork(table)
+
+    import networkx as nx
+    graph = nx.DiGraph()
+    graph.add_nodes_from(range(record['nodes']))
+    graph.add_edges_from(map(tuple, record['edges']))
+    return graph
+
+
+def build_randomizer(network, topology='fixed', dynamics='uniform-bias', p=0.5,
+                     bias_mode='exact', constraints=(), timeout=1000):
+    """
+    Construct a randomizer from the names used on the command line.
+
+    :param network: the base network or graph
+    :param topology: the name of the topology randomizer
+    :param dynamics: the name of the dynamics randomizer, or ``'none'``
+    :param p: the bias used by ``'uniform-bias'``
+    :param bias_mode: the bias mode of the dynamics randomizer
+    :param constraints: the names of the constraints
+    :param timeout: the randomizer's timeout
+    :returns: AbstractRandomizer
+    :raises ValueError: if a name is unknown, or the names cannot be combined
+    """
+    from . import constraints as cons, dynamics as dyn, topology as top
+
+    logic = hasattr(network, 'table')
+    if not logic and dynamics in NETWORK_DYNAMICS:
+        raise ValueError('{} dynamics requires a logic network'.format(dynamics))
+    if dynamics == 'local-bias' and topology not in LOCAL_BIAS_TOPOLOGY:
+        raise ValueError('local-bias dynamics requires {} topology'.format(' or '.join(LOCAL_BIAS_TOPOLOGY)))
+    for name in constraints:
+        if not logic and name in NETWORK_CONSTRAINTS:
+            raise ValueError('the {} constraint requires a logic network'.format(name))
+        if dynamics == 'none' and name in DYNAMICAL_CONSTRAINTS:
+            raise ValueError('the {} constraint requires a dynamics randomizer'.format(name))
+
+    base_graph = network if not logic else network.network_graph()
+
+    built = []
+    for name in constraints:
+        if name == 'connected':
+            built.append(cons.IsConnected())
+        elif name == 'irreducible':
+            built.append(cons.IsIrreducible())
+        elif name == 'external-nodes':
+            built.append(cons.HasExternalNodes(base_graph))
+        elif name == 'canalizing-nodes':
+            built.append(cons.HasCanalizingNodes(network))
+        elif name == 'attractors':
+            built.append(cons.HasAttractors(network))
+        elif name == 'fixed-points':
+            built.append(cons.HasFixedPoints(network))
+        elif name == 'max-cycle-length':
+            built.append(cons.HasMaxCycleLength(network))
+        elif name == 'sensitivity':
+            built.append(cons.HasSensitivity(network))
+        else:
+            raise ValueError('unknown constraint {!r}'.format(name))
+
+    trand = getattr(top, TOPOLOGY[topology])
+    if DYNAMICS[dynamics] is None:
+        return trand(network, constraints=built, timeout=timeout)
+
+    drand = getattr(dyn, DYNAMICS[dynamics])
+    kwargs = {'trand': trand, 'constraints': built, 'timeout': timeout, 'bias_mode': bias_mode}
+    if drand is dyn.UniformBias:
+        kwargs['p'] = p
+    return drand(network, **kwargs)
+
+
+def _acceptance(randomizer):
+    """
+    Get the attempts and accepted counts of a randomizer and its topology
+    randomizer, if any.
+    """
+    counts = [randomizer.attempts, randomizer.accepted]
+    trand = getattr(randomizer, 'trand', None)
+    if trand is not None:
+        counts += [trand.attempts, trand.accepted]
+    return counts
+
+
+def _generate(_):
+    """
+    Generate and encode a single network in a worker process.
+    """
+    from . import service
+    randomizer = service._RANDOMIZER
+    before = _acceptance(randomizer)
+    line = json.dumps(encode(randomizer.random()), separators=(',', ':'))
+    return line, [a - b for a, b in zip(_acceptance(randomizer), before)]
+
+
+def generate(randomizer, n, output, processes=1):
+    """
+    Generate ``n`` networks, writing one JSON-encoded network per line to
+    ``output``.
+
+    :param randomizer: the randomizer
+    :type randomizer: AbstractRandomizer
+    :param n: the number of networks
+    :type n: int
+    :param output: a writable text stream
+    :param processes: the number of worker processes
+    :type processes: int
+    :returns: a list of the total attempts and accepted counts of the
+              randomizer (and its topology randomizer)
+    """
+    from .service import _initialize_worker
+
+    totals = [0] * len(_acceptance(randomizer))
+    if processes <= 1:
+        _initialize_worker(randomizer, reseed=False)
+        results = map(_generate, range(n))
+        pool = None
+    else:
+        pool = multiprocessing.Pool(processes, _initialize_worker, (randomizer,))
+        results = pool.imap_unordered(_generate, range(n), chunksize=max(1, n // (8 * processes)))
+    try:
+        for line, counts in results:
+            output.write(line + '\n')
+            totals = [a + b for a, b in zip(totals, counts)]
+    finally:
+        if pool is not None:
+            pool.terminate()
+    return totals
+
+
+def main(argv=None):
+    """
+    Generate an ensemble of random networks from the command line.
+    """
+    parser = argparse.ArgumentParser(prog='randomneet',
+                                     description='Generate an ensemble of random networks')
+    parser.add_argument('network', help='the base network file')
+    parser.add_argument('-n', '--num', type=int, default=100,
+                        help='the number of networks to generate (default: 100)')
+    parser.add_argument('-f', '--format', default='auto',
+                        choices=['auto', 'logic', 'table', 'bnet', 'edgelist'],
+                        help='the format of the base network (default: infer from extension)')
+    parser.add_argument('-t', '--topology', default='fixed', choices=sorted(TOPOLOGY),
+                        help='the topology randomizer (default: fixed)')
+    parser.add_argument('-d', '--dynamics', default='uniform-bias', choices=sorted(DYNAMICS),
+                        help='the dynamics randomizer (default: uniform-bias)')
+    parser.add_argument('-c', '--constraint', action='append', default=[], choices=CONSTRAINTS,
+                        help='a constraint to enforce; may be repeated')
+    parser.add_argument('-p', '--bias', type=float, default=0.5,
+                        help='the bias used by uniform-bias (default: 0.5)')
+    parser.add_argument('--bias-mode', default='exact', choices=['exact', 'bernoulli'],
+                        help='how function biases are enforced (default: exact)')
+    parser.add_argument('--timeout', type=int, default=1000,
+                        help='the rejection testing timeout (default: 1000)')
+    parser.add_argument('-j', '--processes', type=int, default=1,
+                        help='the number of worker processes (default: 1)')
+    parser.add_argument('-s', '--seed', type=int, default=None,
+                        help='seed the random number generator (single process only)')
+    parser.add_argument('-o', '--output', default='-',
+                        help='the output file, gzipped if it ends in .gz (default: stdout)')
+    parser.add_argument('--trace', default=None, metavar='PATH',
+                        help='profile generation, writing a Chrome trace to PATH (single process only)')
+    args = parser.parse_args(argv)
+    if args.trace is not None and args.processes > 1:
+        parser.error('--trace requires a single process')
+
+    if args.seed is not None:
+        import numpy as np
+        np.random.seed(args.seed)
+
+    from .constraints import ConstraintError
+
+    network = read_network(args.network, args.format)
+    try:
+        randomizer = build_randomizer(network, args.topology, args.dynamics, args.bias,
+                                      args.bias_mode, args.constraint, args.timeout)
+    except ValueError as err:
+        parser.error(str(err))
+    except ConstraintError as err:
+        print('randomneet: {}'.format(err), file=sys.stderr)
+        return 1
+    if args.trace is not None:
+        from .profiling import HistogramProfiler
+        randomizer.profiler = HistogramProfiler(trace=True)
+
+    if args.output == '-':
+        output = sys.stdout
+    elif args.output.endswith('.gz'):
+        output = gzip.open(args.output, 'wt')
+    else:
+        output = open(args.output, 'w')
+
+    start = time.perf_counter()
+    try:
+        totals = generate(randomizer, args.num, output, args.processes)
+    except ConstraintError as err:
+        print('randomneet: {} (try increasing --timeout)'.format(err), file=sys.stderr)
+        return 1
+    finally:
+        if output is not sys.stdout:
+            output.close()
+    elapsed = time.perf_counter() - start
+
+    rate = args.num / elapsed if elapsed > 0 else float('inf')
+    print('generated {} networks in {:.3f}s ({:.1f} networks/s)'.format(args.num, elapsed, rate),
+          file=sys.stderr)
+    names = ['acceptance rate', 'topology acceptance rate']
+    for name, attempts, accepted in zip(names, totals[::2], totals[1::2]):
+        if attempts:
+            message = '{}: {:.4f} ({} of {} attempts)'
+            print(message.format(name, accepted / attempts, accepted, attempts), file=sys.stderr)
+    if args.trace is not None:
+        print(randomizer.profiler.report(), file=sys.stderr)
+        randomizer.profiler.write_chrome_trace(args.trace)
+    return 0
@@ -1,7 +1,12 @@
-import neet
 import networkx as nx
 import numpy as np
+import time
 from abc import ABCMeta, abstractmethod
+from collections import OrderedDict
+from collections.abc import Sequence
+from .attractors import attractors, fixed_points
+from .tables import is_canalizing, is_irreducible, network_tables, sensitivity
+from ._neet import is_network, is_logic_network
 
 
 class ConstraintError(Exception):
@@ -14,7 +19,21 @@ class ConstraintError(Exception):
 class AbstractConstraint(object, metaclass=ABCMeta):
     """
     An abstract class representing a constraint used for rejection testing.
+
+    A constraint may name the ``invariant`` property of a graph which fully
+    determines whether it is satisfied, e.g. ``'in_degree'`` for a constraint
+    which only depends on the in-degree sequence. A randomizer which preserves
+    that property (see ``AbstractRandomizer.preserves``) need only test the
+    constraint once, against its base graph.
+
+    Constraints can be composed with ``&``, ``|`` and ``~``; see ``AllOf``,
+    ``AnyOf`` and ``Not``.
     """
+    __slots__ = ()
+
+    #: the graph property which determines the constraint, if any
+    invariant = None
+
     @abstractmethod
     def satisfies(self, net):
         """
@@ -25,11 +44,58 @@ class AbstractConstraint(object, metaclass=ABCMeta):
         """
         return True
 
+    def compile(self):
+        """
+        Get a callable which tests networks already known to be of a valid
+        type against the constraint, skipping the type checks performed by
+        ``satisfies``.
+
+        A subclass provides this fast path by implementing ``_test`` in the
+        same class as ``satisfies``; otherwise, e.g. if a subclass overrides
+        ``satisfies`` only, ``satisfies`` itself is returned.
+
+        :returns: callable
+        """
+        for cls in type(self).__mro__:
+            if 'satisfies' in vars(cls):
+                return self._test if '_test' in vars(cls) else self.satisfies
+
+    def is_feasible(self, graph, preserves):
+        """
+        Statically determine whether the constraint could be satisfied by the
+        networks or graphs of a randomizer, given its base graph and the graph
+        properties it preserves. The check is cheap and conservative:
+        ``False`` means that the constraint can never be satisfied, while
+        ``True`` only means that it might be.
+
+        :param graph: the randomizer's base graph
+        :type graph: nx.DiGraph
+        :param preserves: the graph properties preserved by the randomizer
+        :type preserves: a collection of str
+        :returns: bool
+        """
+        return True
+
+    def __and__(self, other):
+        if not isinstance(other, AbstractConstraint):
+            return NotImplemented
+        return AllOf(*(_operands(self, AllOf) + _operands(other, AllOf)))
+
+    def __or__(self, other):
+        if not isinstance(other, AbstractConstraint):
+            return NotImplemented
+        return AnyOf(*(_operands(self, AnyOf) + _operands(other, AnyOf)))
+
+    def __invert__(self):
+        return Not(self)
+
 
 class TopologicalConstraint(AbstractConstraint):
     """
     An abstract class representing a constraint on the topology of a network.
     """
+    __slots__ = ()
+
     @abstractmethod
     def satisfies(self, graph):
         """
@@ -44,11 +110,23 @@ class TopologicalConstraint(AbstractConstraint):
             raise TypeError('only directed graphs are testable with topological constraints')
         return super().satisfies(graph)
 
+    def is_feasible(self, graph, preserves):
+        """
+        A topological constraint whose ``invariant`` is preserved, or which
+        is applied to a fixed graph, is feasible only if the base graph
+        satisfies it.
+        """
+        if 'graph' in preserves or (self.invariant is not None and self.invariant in preserves):
+            return bool(self.satisfies(graph))
+        return True
+
 
 class DynamicalConstraint(AbstractConstraint):
     """
     An abstract class representing a constraint on the dynamics of a network.
     """
+    __slots__ = ()
+
     @abstractmethod
     def satisfies(self, net):
         """
@@ -59,12 +137,91 @@ class DynamicalConstraint(AbstractConstraint):
         :returns: ``True`` if the constraint is satisfied
         :raises TypeError: if the network is not a neet.Network
         """
-        if not isinstance(net, neet.Network):
+        if not is_network(net):
             raise TypeError('only neet networks are testable with dynamical constraints')
         return super().satisfies(net)
 
 
+class IncrementalConstraint(DynamicalConstraint):
+    """
+    An abstract class representing a dynamical constraint which can be tested
+    node-by-node as a network is constructed. This allows randomizers to
+    abandon a candidate network as soon as it can no longer satisfy the
+    constraint, rather than building the entire network first.
+
+    The incremental test proceeds by calling ``begin`` once with the
+    candidate's topology, then ``update`` once for each node (in order), and
+    finally ``finish``. If every call to ``update`` and ``finish`` returns
+    ``True``, then the network satisfies the constraint.
+
+    Constraints which implement ``replace`` can also follow a network as the
+    functions of individual nodes are modified, e.g. by a Markov chain.
+    """
+    __slots__ = ()
+
+    def begin(self, topology):
+        """
+        Begin an incremental test of a network with the provided topology.
+
+        :param topology: the topology of the candidate network
+        :type topology: nx.DiGraph
+        :returns: an object storing the state of the test
+        """
+        return None
+
+    @abstractmethod
+    def update(self, state, node, predecessors, table):
+        """
+        Test the function of a single node against the constraint.
+
+        :param state: the state returned by ``begin``
+        :param node: the node
+        :type node: int
+        :param predecessors: the inputs of the node's function
+        :type predecessors: tuple
+        :param table: the node's truth table
+        :type table: numpy.ndarray of bool
+        :returns: ``False`` if the network can no longer satisfy the
+                  constraint
+        """
+        return True
+
+    def finish(self, state):
+        """
+        Complete the incremental test after every node has been provided.
+
+        :param state: the state returned by ``begin``
+        :returns: ``True`` if the constraint is satisfied
+        """
+        return True
+
+    def replace(self, state, node, predecessors, old, new):
+        """
+        Update a completed incremental test after the truth table of a single
+        node changes. The state must have been updated with every node, even
+        if ``update`` rejected the network, and replacing ``new`` with ``old``
+        must restore it.
+
+        :param state: the state of the completed test
+        :param node: the node
+        :type node: int
+        :param predecessors: the inputs of the node's function
+        :type predecessors: tuple
+        :param old: the node's previous truth table
+        :type old: numpy.ndarray of bool
+        :param new: the node's new truth table
+        :type new: numpy.ndarray of bool
+        :returns: ``True`` if the modified network satisfies the constraint,
+                  or ``NotImplemented`` if the constraint cannot be updated
+        """
+        return NotImplemented
+
+
 class HasExternalNodes(TopologicalConstraint):
+    __slots__ = ('num_external',)
+
+    invariant = 'in_degree'
+
     def __init__(self, target):
         """
         An topological constraint requiring a specific number of external
@@ -106,13 +263,36 @@ class HasExternalNodes(TopologicalConstraint):
                   nodes
         """
         if super().satisfies(graph):
-            return self.__count_external(graph) == self.num_external
+            return self._test(graph)
+
+    def _test(self, graph):
+        return self.__count_external(graph) == self.num_external
+
+    def is_feasible(self, graph, preserves):
+        """
+        Every internal node needs an incoming edge, and each node can have at
+        most one incoming edge from each node. If the out-degrees are
+        preserved, the targets of a node's edges are all internal.
+        """
+        if not super().is_feasible(graph, preserves):
+            return False
+        n, m = len(graph), graph.size()
+        internal = n - self.num_external
+        if internal < 0:
+            return False
+        if 'num_edges' in preserves and (internal > m or internal * n < m):
+            return False
+        if 'out_degree' in preserves and internal < max([d for _, d in graph.out_degree()] + [0]):
+            return False
+        return True
 
 
 class IsConnected(TopologicalConstraint):
     """
     Ensure that the resulting graph is (weakly) connected.
     """
+    __slots__ = ()
+
     def satisfies(self, graph):
         """
         This constraint is only satisfied if the provided graph as is weakly
@@ -124,16 +304,30 @@ class IsConnected(TopologicalConstraint):
                   nodes
         """
         if super().satisfies(graph):
-            try:
-                return nx.is_weakly_connected(graph)
-            except nx.exception.NetworkXException as err:
-                raise ConstraintError() from err
+            return self._test(graph)
 
+    def _test(self, graph):
+        try:
+            return nx.is_weakly_connected(graph)
+        except nx.exception.NetworkXException as err:
+            raise ConstraintError() from err
 
-class IsIrreducible(DynamicalConstraint):
+    def is_feasible(self, graph, preserves):
+        """
+        A connected graph with :math:`n` nodes has at least :math:`n - 1`
+        edges.
+        """
+        if 'num_edges' in preserves and graph.size() < len(graph) - 1:
+            return False
+        return super().is_feasible(graph, preserves)
+
+
+class IsIrreducible(IncrementalConstraint):
     """
     Ensure that all dynamical nodes have irreducible functions.
     """
+    __slots__ = ()
+
     def satisfies(self, network):
         """
         This constraint is only satisfied if every node's function logically
@@ -146,17 +340,43 @@ class IsIrreducible(DynamicalConstraint):
                                      neet.boolean.LogicNetwork
         """
         if super().satisfies(network):
-            if not isinstance(network, neet.boolean.LogicNetwork):
-                raise NotImplementedError()
+            return self._test(network)
 
-            for idx in range(network.size):
-                for neighbor_in in network.neighbors_in(idx):
-                    if not network.is_dependent(idx, neighbor_in):
-                        return False
-            return True
+    def _test(self, network):
+        if not is_logic_network(network):
+            raise NotImplementedError()
 
+        for idx in range(network.size):
+            for neighbor_in in network.neighbors_in(idx):
+                if not network.is_dependent(idx, neighbor_in):
+                    return False
+        return True
+
+    def begin(self, topology):
+        """
+        Start counting reducible nodes.
+        """
+        return [0]
+
+    def update(self, state, node, predecessors, table):
+        """
+        Reject the network as soon as any node's function is reducible.
+        """
+        if not is_irreducible(table):
+            state[0] += 1
+        return state[0] == 0
+
+    def finish(self, state):
+        return state[0] == 0
+
+    def replace(self, state, node, predecessors, old, new):
+        state[0] += int(is_irreducible(old)) - int(is_irreducible(new))
+        return state[0] == 0
+
+
+class HasCanalizingNodes(IncrementalConstraint):
+    __slots__ = ('num_canalizing',)
 
-class HasCanalizingNodes(DynamicalConstraint):
     def __init__(self, target):
         """
         A dynamical constraint requiring that a specific number of nodes be
@@ -176,7 +396,7 @@ class HasCanalizingNodes(DynamicalConstraint):
             if target < 0:
                 raise ValueError('the target number of canalizing nodes must be non-negative')
             num_canalizing = target
-        elif isinstance(target, neet.Network):
+        elif is_network(target):
             num_canalizing = self.__count_canalizing_nodes(target)
         else:
             raise TypeError('target must be either an integer or a neet.Network')
@@ -195,10 +415,243 @@ class HasCanalizingNodes(DynamicalConstraint):
         ``self.num_canalizing``-many canalizing nodes.
         """
         if super().satisfies(network):
-            return self.__count_canalizing_nodes(network) == self.num_canalizing
+            return self._test(network)
+
+    def _test(self, network):
+        return self.__count_canalizing_nodes(network) == self.num_canalizing
+
+    def is_feasible(self, graph, preserves):
+        """
+        Only nodes with at least one input can be canalizing, and every node
+        with exactly one input is canalizing.
+        """
+        n = len(graph)
+        if 'in_degree' in preserves:
+            degrees = [k for _, k in graph.in_degree()]
+            lower, upper = sum(1 for k in degrees if k == 1), sum(1 for k in degrees if k != 0)
+        elif 'num_edges' in preserves:
+            lower, upper = 0, min(n, graph.size())
+        else:
+            lower, upper = 0, n
+        return lower <= self.num_canalizing <= upper
+
+    def begin(self, topology):
+        """
+        Start counting canalizing nodes. The state is the number of canalizing
+        nodes seen so far, and the number of nodes yet to be seen which could
+        be canalizing, i.e. have at least one incoming edge.
+        """
+        return [0, sum(1 for _, k in topology.in_degree() if k != 0)]
+
+    def update(self, state, node, predecessors, table):
+        """
+        Reject the network as soon as too many nodes are canalizing, or too
+        few nodes remain for the target to be reached.
+        """
+        if len(predecessors) != 0:
+            state[1] -= 1
+            if is_canalizing(table):
+                state[0] += 1
+        return state[0] <= self.num_canalizing <= state[0] + state[1]
+
+    def finish(self, state):
+        return state[0] == self.num_canalizing
+
+    def replace(self, state, node, predecessors, old, new):
+        if len(predecessors) != 0:
+            state[0] += int(is_canalizing(new)) - int(is_canalizing(old))
+        return state[0] == self.num_canalizing
+
+
+class HasSensitivity(IncrementalConstraint):
+    __slots__ = ('target', 'tol')
+
+    def __init__(self, target, tol=0.05):
+        """
+        A dynamical constraint requiring that the average sensitivity of a
+        network, i.e. the mean over nodes of the expected number of inputs
+        which change a node's output when flipped, be within ``tol`` of a
+        target.
+
+        If ``target`` is a Neet network, this constraint will require that
+        networks have approximately the same average sensitivity as
+        ``target``. Alternatively, ``target`` can be a non-negative number.
+
+        When tested incrementally, a network is rejected as soon as the nodes
+        seen so far make the target unreachable, given that the sensitivity of
+        a node with :math:`k` inputs is between :math:`0` and :math:`k`.
+
+        :param target: the target average sensitivity
+        :type target: neet.Network or float
+        :param tol: the allowed deviation from the target
+        :type tol: float
+        """
+        if isinstance(target, (int, float)):
+            if target < 0:
+                raise ValueError('the target sensitivity must be non-negative')
+        elif is_network(target):
+            target = self.__average_sensitivity(target)
+        else:
+            raise TypeError('target must be either a number or a neet.Network')
+        if tol < 0:
+            raise ValueError('the tolerance must be non-negative')
+        self.target = float(target)
+        self.tol = tol
+
+    def __average_sensitivity(self, network):
+        """
+        Compute the average sensitivity of a network.
+        """
+        if is_logic_network(network):
+            return np.mean([sensitivity(table) for _, table in network_tables(network)])
+        return network.average_sensitivity()
+
+    def satisfies(self, network):
+        """
+        This constraint is only satisfied if the average sensitivity of the
+        provided network is within ``self.tol`` of ``self.target``.
+        """
+        if super().satisfies(network):
+            return self._test(network)
+
+    def _test(self, network):
+        return abs(self.__average_sensitivity(network) - self.target) <= self.tol + 1e-9
+
+    def begin(self, topology):
+        """
+        Start summing node sensitivities. The state is the total sensitivity
+        of the nodes seen so far, the total in-degree of the nodes yet to be
+        seen, and the number of nodes.
+        """
+        return [0.0, topology.number_of_edges(), len(topology)]
+
+    def update(self, state, node, predecessors, table):
+        """
+        Reject the network as soon as the total sensitivity is too large, or
+        too few inputs remain for it to become large enough.
+        """
+        state[0] += sensitivity(table)
+        state[1] -= len(predecessors)
+        lower = (self.target - self.tol) * state[2] - 1e-9
+        upper = (self.target + self.tol) * state[2] + 1e-9
+        return state[0] <= upper and state[0] + state[1] >= lower
+
+    def finish(self, state):
+        return abs(state[0] / state[2] - self.target) <= self.tol + 1e-9
+
+    def replace(self, state, node, predecessors, old, new):
+        state[0] += sensitivity(new) - sensitivity(old)
+        return self.finish(state)
+
+
+class AttractorConstraint(DynamicalConstraint):
+    __slots__ = ('target', 'max_exhaustive', 'samples', 'max_steps')
+
+    def __init__(self, target, max_exhaustive=16, samples=1000, max_steps=10000):
+        """
+        An abstract dynamical constraint requiring that a property of the
+        attractors of a network take a specific value.
+
+        Logic networks are analyzed with the vectorized engine in
+        ``randomneet.attractors``: exactly if they have at most
+        ``max_exhaustive`` nodes, and otherwise from ``samples`` random initial
+        states followed for at most ``max_steps`` steps. Other networks are
+        analyzed with neet's landscape.
+
+        If ``target`` is a Neet network, this constraint will require that
+        networks have the same value of the property as ``target``.
+        Alternatively, ``target`` can be a non-negative integer.
+
+        :param target: the target value
+        :type target: neet.Network or integer
+        :param max_exhaustive: the largest network to analyze exactly
+        :type max_exhaustive: int
+        :param samples: the number of initial states sampled for larger networks
+        :type samples: int
+        :param max_steps: the maximum trajectory length for larger networks
+        :type max_steps: int
+        """
+        self.max_exhaustive = max_exhaustive
+        self.samples = samples
+        self.max_steps = max_steps
+        if isinstance(target, int):
+            if target < 0:
+                raise ValueError('the target must be non-negative')
+        elif is_network(target):
+            target = self.measure(target)
+        else:
+            raise TypeError('target must be either an integer or a neet.Network')
+        self.target = target
+
+    def _lengths(self, network):
+        """
+        Get the sorted attractor lengths of a network.
+        """
+        if is_logic_network(network):
+            return attractors(network, self.max_exhaustive, self.samples, self.max_steps).lengths
+        return sorted(network.attractor_lengths)
+
+    @abstractmethod
+    def measure(self, network):
+        """
+        Compute the constrained property of a network.
+
+        :param network: the network
+        :type network: neet.Network
+        :returns: int
+        """
+        pass
+
+    def satisfies(self, network):
+        """
+        This constraint is only satisfied if the measured property of the
+        provided network equals ``self.target``.
+        """
+        if super().satisfies(network):
+            return self._test(network)
+
+    def _test(self, network):
+        return self.measure(network) == self.target
+
+
+class HasAttractors(AttractorConstraint):
+    """
+    A dynamical constraint requiring that a network have a specific number of
+    attractors under synchronous update.
+    """
+    __slots__ = ()
+
+    def measure(self, network):
+        return len(self._lengths(network))
+
+
+class HasFixedPoints(AttractorConstraint):
+    """
+    A dynamical constraint requiring that a network have a specific number of
+    fixed points under synchronous update.
+    """
+    __slots__ = ()
+
+    def measure(self, network):
+        if is_logic_network(network):
+            return fixed_points(network, self.max_exhaustive, self.samples, self.max_steps)
+        return self._lengths(network).count(1)
+
+
+class HasMaxCycleLength(AttractorConstraint):
+    """
+    A dynamical constraint requiring that the longest attractor of a network,
+    under synchronous update, have a specific length.
+    """
+    __slots__ = ()
+
+    def measure(self, network):
+        return max(self._lengths(network))
 
 
 class GenericTopological(TopologicalConstraint):
+    __slots__ = ('test',)
+
     def __init__(self, test):
         """
         A generic constraint defined in terms of a callable.
@@ -220,8 +673,13 @@ class GenericTopological(TopologicalConstraint):
         if super().satisfies(net):
             return self.test(net)
 
+    def _test(self, net):
+        return self.test(net)
+
 
 class GenericDynamical(DynamicalConstraint):
+    __slots__ = ('test',)
+
     def __init__(self, test):
         """
         A generic constraint defined in terms of a callable.
@@ -242,3 +700,566 @@ class GenericDynamical(DynamicalConstraint):
         """
         if super().satisfies(net):
             return self.test(net)
+
+    def _test(self, net):
+        return self.test(net)
+
+
+def _operands(constraint, kind):
+    """
+    Get the operands of a constraint which is an instance of a combinator
+    ``kind``, or the constraint itself, so that e.g. ``a & b & c`` is a single
+    ``AllOf``.
+    """
+    return constraint.constraints if isinstance(constraint, kind) else (constraint,)
+
+
+class LogicalConstraint(AbstractConstraint):
+    __slots__ = ('constraints', 'calibration', 'order', '_operands', '_tests', '_calls',
+                 '_costs', '_passes', '_counts')
+
+    #: the topological and dynamical variants of the combinator
+    _variants = None
+
+    def __new__(cls, *constraints, **kwargs):
+        if cls._variants is not None:
+            topological = all(isinstance(c, TopologicalConstraint) for c in constraints)
+            cls = cls._variants[topological]
+        return super().__new__(cls)
+
+    def __init__(self, *constraints, calibration=32):
+        """
+        An abstract base class for constraints which combine other
+        constraints. A combinator is a ``TopologicalConstraint`` if all of its
+        operands are topological, and otherwise a ``DynamicalConstraint``
+        which tests its topological operands against the network's graph.
+
+        The operands are tested lazily, stopping as soon as the result is
+        known. For the first ``calibration`` tests, each test starts from the
+        next operand in rotation and the operands it reaches are timed; the
+        operands are then reordered so that those which are cheap and likely
+        to decide the result are tested first. ``order`` holds the indices of
+        the operands in the order they are tested.
+
+        :param constraints: the operands
+        :type constraints: AbstractConstraint instances
+        :param calibration: the number of tests used to order the operands
+        :type calibration: int
+        :raises TypeError: if any operand is not an AbstractConstraint
+        """
+        for constraint in constraints:
+            if not isinstance(constraint, AbstractConstraint):
+                raise TypeError('operands must be instances of AbstractConstraint')
+        self.constraints = constraints
+        self.calibration = calibration if len(constraints) > 1 else 0
+        self.order = tuple(range(len(constraints)))
+        graphs = not isinstance(self, TopologicalConstraint)
+        self._operands = tuple((graphs and isinstance(c, TopologicalConstraint), c.compile())
+                               for c in constraints)
+        self._tests = self._operands
+        self._calls = 0
+        self._costs = [0.0] * len(constraints)
+        self._passes = [0] * len(constraints)
+        self._counts = [0] * len(constraints)
+
+    @property
+    def invariant(self):
+        """
+        The invariant shared by all of the operands, if any.
+        """
+        invariants = set(constraint.invariant for constraint in self.constraints)
+        return invariants.pop() if len(invariants) == 1 else None
+
+    def _results(self, net):
+        """
+        Lazily test a network against each operand in turn, calibrating the
+        order of the operands if necessary.
+        """
+        if self._calls < self.calibration:
+            return self.__calibrate(net)
+        return self.__evaluate(net)
+
+    def __evaluate(self, net):
+        """
+        Lazily test a network against each operand in turn.
+        """
+        graph = None
+        for needs_graph, test in self._tests:
+            if needs_graph:
+                if graph is None:
+                    graph = net.network_graph()
+                yield test(graph)
+            else:
+                yield test(net)
+
+    def __calibrate(self, net):
+        """
+        Lazily test a network against each operand in turn, starting from the
+        next operand in rotation, and record the time taken by each operand
+        tested and whether it passed. The operands are reordered as soon as
+        the last calibrating test has recorded each result.
+        """
+        n = len(self._operands)
+        start = self._calls % n
+        self._calls += 1
+        graph = None
+        for i in list(range(start, n)) + list(range(start)):
+            needs_graph, test = self._operands[i]
+            started = time.perf_counter()
+            if needs_graph:
+                if graph is None:
+                    graph = net.network_graph()
+                result = bool(test(graph))
+            else:
+                result = bool(test(net))
+            self._costs[i] += time.perf_counter() - started
+            self._passes[i] += result
+            self._counts[i] += 1
+            if self._calls == self.calibration:
+                self.__reorder()
+            yield result
+
+    def __reorder(self):
+        """
+        Order the operands by the priority of their mean cost and pass rate
+        over the calibrating tests which reached them.
+        """
+        priority = [self._priority(cost / count, passes / count) if count else 0.0
+                    for cost, passes, count in zip(self._costs, self._passes, self._counts)]
+        self.order = tuple(sorted(range(len(priority)), key=priority.__getitem__))
+        self._tests = tuple(self._operands[i] for i in self.order)
+
+    def _priority(self, cost, rate):
+        """
+        Get the priority of an operand with a given mean cost and pass rate;
+        operands with lower priorities are tested first.
+        """
+        return 0.0
+
+    def satisfies(self, net):
+        """
+        Test a provided network or graph against the combined constraint.
+
+        :param net: a network or graph to test
+        :returns: ``True`` if the constraint is satisfied
+        """
+        if super().satisfies(net):
+            return self._test(net)
+
+    @abstractmethod
+    def _test(self, net):
+        """
+        Combine the results of the operands, as given by ``_results``.
+
+        :param net: a network or graph known to be of a valid type
+        :returns: ``True`` if the constraint is satisfied
+        """
+        return True
+
+    def __repr__(self):
+        return '{}({})'.format(type(self).__mro__[1].__name__,
+                               ', '.join(map(repr, self.constraints)))
+
+
+class AllOf(LogicalConstraint):
+    """
+    A constraint satisfied if all of its operands are satisfied, which are
+    tested until one fails. Once calibrated, operands are tested in order of
+    their cost per failure. ``a & b`` is ``AllOf(a, b)``.
+    """
+    __slots__ = ()
+
+    def _priority(self, cost, rate):
+        return cost / max(1.0 - rate, 1e-3)
+
+    def _test(self, net):
+        return all(self._results(net))
+
+    def is_feasible(self, graph, preserves):
+        return all(constraint.is_feasible(graph, preserves) for constraint in self.constraints)
+
+
+class AnyOf(LogicalConstraint):
+    """
+    A constraint satisfied if any of its operands is satisfied, which are
+    tested until one succeeds. Once calibrated, operands are tested in order
+    of their cost per success. ``a | b`` is ``AnyOf(a, b)``.
+    """
+    __slots__ = ()
+
+    def _priority(self, cost, rate):
+        return cost / max(rate, 1e-3)
+
+    def _test(self, net):
+        return any(self._results(net))
+
+    def is_feasible(self, graph, preserves):
+        return any(constraint.is_feasible(graph, preserves) for constraint in self.constraints)
+
+
+class Not(LogicalConstraint):
+    """
+    A constraint satisfied if its operand is not. ``~a`` is ``Not(a)``.
+    """
+    __slots__ = ()
+
+    def __init__(self, constraint):
+        """
+        :param constraint: the operand
+        :type constraint: AbstractConstraint
+        """
+        super().__init__(constraint)
+
+    def _test(self, net):
+        return not next(self._results(net))
+
+    def is_feasible(self, graph, preserves):
+        return True
+
+
+class TopologicalAllOf(AllOf, TopologicalConstraint):
+    """
+    An AllOf of topological operands.
+    """
+    __slots__ = ()
+    _variants = None
+
+
+class DynamicalAllOf(AllOf, DynamicalConstraint):
+    """
+    An AllOf of mixed or dynamical operands.
+    """
+    __slots__ = ()
+    _variants = None
+
+
+class TopologicalAnyOf(AnyOf, TopologicalConstraint):
+    """
+    An AnyOf of topological operands.
+    """
+    __slots__ = ()
+    _variants = None
+
+
+class DynamicalAnyOf(AnyOf, DynamicalConstraint):
+    """
+    An AnyOf of mixed or dynamical operands.
+    """
+    __slots__ = ()
+    _variants = None
+
+
+class TopologicalNot(Not, TopologicalConstraint):
+    """
+    The negation of a topological constraint.
+    """
+    __slots__ = ()
+    _variants = None
+
+
+class DynamicalNot(Not, DynamicalConstraint):
+    """
+    The negation of a dynamical constraint.
+    """
+    __slots__ = ()
+    _variants = None
+
+
+AllOf._variants = {True: TopologicalAllOf, False: DynamicalAllOf}
+AnyOf._variants = {True: TopologicalAnyOf, False: DynamicalAnyOf}
+Not._variants = {True: TopologicalNot, False: DynamicalNot}
+
+
+def _memo_key(net):
+    """
+    Compute an exact, order-independent key for a logic network or graph in
+    a single pass over its nodes.
+
+    Logic networks are keyed by the encoded truth table which neet already
+    maintains for ``update``, and graphs by the set of successors of each
+    node. Unlike ``randomneet.ensemble.network_hash``, nothing is sorted,
+    formatted or digested.
+
+    :param net: the network or graph
+    :type net: neet.boolean.LogicNetwork or networkx.DiGraph
+    :returns: a hashable key
+    """
+    if is_logic_network(net):
+        return net.size, tuple((mask, frozenset(codes)) for mask, codes in net._encoded_table)
+    return len(net), frozenset((node, frozenset(successors)) for node, successors in net.adjacency())
+
+
+class MemoizedMixin(object):
+    __slots__ = ('constraint', 'maxsize', 'cache', '__test', 'hits', 'misses', 'evictions')
+
+    def __init__(self, constraint, maxsize=1024):
+        """
+        Cache the results of a constraint in a least-recently-used cache keyed
+        by the structure of each network or graph (see ``_memo_key``). This
+        pays off when a randomizer frequently produces the same network or
+        graph, e.g. a Markov chain which often rejects its proposals. Use
+        ``memoize`` to wrap a constraint.
+
+        :param constraint: the constraint to memoize
+        :type constraint: AbstractConstraint
+        :param maxsize: the maximum number of cached results
+        :type maxsize: int
+        """
+        if maxsize < 1:
+            raise ValueError('maxsize must be positive')
+        self.constraint = constraint
+        self.maxsize = maxsize
+        self.cache = OrderedDict()
+        self.__test = constraint.compile()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @property
+    def invariant(self):
+        """
+        The invariant of the wrapped constraint.
+        """
+        return self.constraint.invariant
+
+    @property
+    def hit_rate(self):
+        """
+        Get the fraction of tests answered from the cache.
+
+        :returns: float, or ``None`` if nothing has been tested
+        """
+        total = self.hits + self.misses
+        return self.hits / total if total else None
+
+    def clear(self):
+        """
+        Empty the cache and reset its statistics.
+        """
+        self.cache.clear()
+        self.hits = self.misses = self.evictions = 0
+
+    def satisfies(self, net):
+        """
+        Test a network against the wrapped constraint, using a cached result
+        if the same network has been tested recently.
+        """
+        if super().satisfies(net):
+            return self._test(net)
+
+    def _test(self, net):
+        key = _memo_key(net)
+        result = self.cache.get(key)
+        if result is not None:
+            self.cache.move_to_end(key)
+            self.hits += 1
+            return result
+
+        self.misses += 1
+        result = bool(self.__test(net))
+        self.cache[key] = result
+        if len(self.cache) > self.maxsize:
+            self.cache.popitem(last=False)
+            self.evictions += 1
+        return result
+
+
+class MemoizedTopological(MemoizedMixin, TopologicalConstraint):
+    """
+    A memoized topological constraint.
+    """
+    __slots__ = ()
+
+
+class MemoizedDynamical(MemoizedMixin, DynamicalConstraint):
+    """
+    A memoized dynamical constraint.
+    """
+    __slots__ = ()
+
+
+def memoize(constraint, maxsize=1024):
+    """
+    Wrap a constraint in a least-recently-used cache of its results.
+
+    .. code-block:: python
+
+        rand = UniformBias(myeloid, trand=MeanDegree,
+                           constraints=[memoize(IsConnected(), maxsize=4096)])
+
+    :param constraint: the constraint to memoize
+    :type constraint: TopologicalConstraint or DynamicalConstraint
+    :param maxsize: the maximum number of cached results
+    :type maxsize: int
+    :returns: MemoizedTopological or MemoizedDynamical
+    :raises TypeError: if the constraint is neither topological nor dynamical
+    """
+    if isinstance(constraint, TopologicalConstraint):
+        return MemoizedTopological(constraint, maxsize)
+    elif isinstance(constraint, DynamicalConstraint):
+        return MemoizedDynamical(constraint, maxsize)
+    raise TypeError('constraint must be a TopologicalConstraint or a DynamicalConstraint')
+
+
+class ConstraintSet(Sequence):
+    __slots__ = ('__constraints', '__topological', '__dynamical')
+
+    def __init__(self, constraints=None, wrap=None):
+        """
+        An immutable, ordered sequence of constraints, validated once when it
+        is created and partitioned into topological and dynamical
+        constraints. Randomizers store their constraints as a
+        ``ConstraintSet``, so their hot loops can iterate it directly without
+        revalidating it.
+
+        Callables are wrapped in ``wrap``, e.g. ``GenericTopological``, if it
+        is provided. Sets compare equal to sequences of the same constraints
+        and can be combined: ``a & b`` requires the constraints of both sets,
+        ``a | b`` those of either set, and ``~a`` that not all of ``a``'s are
+        satisfied.
+
+        :param constraints: the constraints
+        :type constraints: a sequence of AbstractConstraint instances
+        :param wrap: the class wrapping callables, if any
+        :type wrap: GenericTopological, GenericDynamical or None
+        :raises TypeError: if any of the constraints are not an
+                           AbstractConstraint and cannot be wrapped
+        """
+        if isinstance(constraints, ConstraintSet):
+            self.__constraints = constraints.__constraints
+            self.__topological = constraints.__topological
+            self.__dynamical = constraints.__dynamical
+            return
+
+        validated = []
+        for constraint in (constraints if constraints is not None else ()):
+            if isinstance(constraint, AbstractConstraint):
+                validated.append(constraint)
+            elif wrap is not None and callable(constraint):
+                validated.append(wrap(constraint))
+            elif wrap is not None:
+                raise TypeError('constraints must be callable or instances of AbstractConstraint')
+            else:
+                raise TypeError('constraints must be instances of AbstractConstraint')
+        self.__constraints = tuple(validated)
+        self.__topological = tuple(c for c in validated if isinstance(c, TopologicalConstraint))
+        self.__dynamical = tuple(c for c in validated if isinstance(c, DynamicalConstraint))
+
+    @property
+    def topological(self):
+        """
+        Get the topological constraints, in order.
+
+        :returns: ConstraintSet
+        """
+        return ConstraintSet(self.__topological)
+
+    @property
+    def dynamical(self):
+        """
+        Get the dynamical constraints, in order.
+
+        :returns: ConstraintSet
+        """
+        return ConstraintSet(self.__dynamical)
+
+    def flatten(self):
+        """
+        Replace each ``AllOf`` in the set with its operands, recursively. As a
+        set requires all of its constraints, this does not change its
+        meaning, but exposes the topological operands of mixed conjunctions
+        so that randomizers can test them as part of the topology.
+
+        :returns: ConstraintSet
+        """
+        if not any(isinstance(c, AllOf) for c in self.__constraints):
+            return self
+        flat = []
+        for constraint in self.__constraints:
+            if isinstance(constraint, AllOf):
+                flat.extend(ConstraintSet(constraint.constraints).flatten())
+            else:
+                flat.append(constraint)
+        return ConstraintSet(flat)
+
+    def is_partitioned(self):
+        """
+        Determine whether every constraint is either topological or
+        dynamical.
+
+        :returns: bool
+        """
+        return len(self.__topological) + len(self.__dynamical) == len(self.__constraints)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return ConstraintSet(self.__constraints[index])
+        return self.__constraints[index]
+
+    def __len__(self):
+        return len(self.__constraints)
+
+    def __iter__(self):
+        return iter(self.__constraints)
+
+    def __eq__(self, other):
+        if isinstance(other, ConstraintSet):
+            return self.__constraints == other.__constraints
+        elif isinstance(other, (list, tuple)):
+            return self.__constraints == tuple(other)
+        return NotImplemented
+
+    def __ne__(self, other):
+        equal = self.__eq__(other)
+        return equal if equal is NotImplemented else not equal
+
+    def __hash__(self):
+        return hash(self.__constraints)
+
+    def __repr__(self):
+        return 'ConstraintSet({!r})'.format(list(self.__constraints))
+
+    def __coerce(self, other):
+        """
+        Convert the other operand of a binary operator to a ConstraintSet.
+        """
+        if isinstance(other, AbstractConstraint):
+            return ConstraintSet([other])
+        elif isinstance(other, (ConstraintSet, list, tuple)):
+            return ConstraintSet(other)
+        return None
+
+    def __and__(self, other):
+        other = self.__coerce(other)
+        if other is None:
+            return NotImplemented
+        return ConstraintSet(self.__constraints + other.__constraints)
+
+    def __rand__(self, other):
+        other = self.__coerce(other)
+        if other is None:
+            return NotImplemented
+        return other & self
+
+    def __or__(self, other):
+        other = self.__coerce(other)
+        if other is None:
+            return NotImplemented
+        return ConstraintSet([self.__conjunction() | other.__conjunction()])
+
+    def __ror__(self, other):
+        other = self.__coerce(other)
+        if other is None:
+            return NotImplemented
+        return other | self
+
+    def __invert__(self):
+        return ConstraintSet([~self.__conjunction()])
+
+    def __conjunction(self):
+        """
+        Combine the constraints into a single constraint.
+        """
+        if len(self.__constraints) == 1:
+            return self.__constraints[0]
+        return AllOf(*self.__constraints)
@@ -1,19 +1,116 @@
-import neet
+import neet.boolean
 import numpy as np
 
 from abc import abstractmethod
 from .randomizer import AbstractRandomizer
 from .topology import TopologyRandomizer, FixedTopology, InDegree
-from .constraints import DynamicalConstraint, TopologicalConstraint, GenericDynamical, ConstraintError
+from .constraints import DynamicalConstraint, TopologicalConstraint, GenericDynamical, \
+    IncrementalConstraint, ConstraintError, ConstraintSet, AllOf, HasSensitivity
+from .encoded import EncodedLogicNetwork, encode
 from inspect import isclass
 
 
+class FunctionPlan(object):
+    def __init__(self, topology, predecessors, params):
+        """
+        A precompiled description of how each node's function should be
+        sampled for a particular topology. The per-node parameters returned by
+        ``NetworkRandomizer._function_class_parameters`` are gathered once,
+        along with compact arrays of the in-degree, bias and canalization flag
+        of each node. Nodes with a plain ``(k, p)`` function class are grouped
+        by in-degree so that their functions may be sampled together.
+
+        :param topology: the topology the plan was compiled for
+        :type topology: networkx.DiGraph
+        :param predecessors: the predecessors of each node, in node order
+        :type predecessors: list of tuples
+        :param params: the function class parameters of each node
+        :type params: list of dicts
+        """
+        self.topology = topology
+        self.nodes = np.array(sorted(topology.nodes), dtype=int)
+        self.predecessors = predecessors
+        self.fingerprint = _fingerprint(topology)
+        self.params = params
+        self.k = np.array([param['k'] for param in params], dtype=int)
+        self.p = np.array([param.get('p', np.nan) for param in params], dtype=float)
+        self.canalizing = np.array([bool(param.get('canalizing', False)) for param in params],
+                                   dtype=bool)
+
+        standard = {'topology', 'node', 'k', 'p'}
+        vectorizable = np.array([standard.issuperset(param) for param in params], dtype=bool)
+        vectorizable &= ~self.canalizing & ~np.isnan(self.p)
+        self.groups = []
+        for k in np.unique(self.k[vectorizable]):
+            indices, = np.nonzero((self.k == k) & vectorizable)
+            self.groups.append((int(k), indices))
+
+    def __len__(self):
+        return len(self.nodes)
+
+    def __iter__(self):
+        """
+        Iterate over the ``(node, predecessors, params)`` triples of the plan.
+        """
+        return zip(self.nodes.tolist(), self.predecessors, self.params)
+
+    def matches(self, topology):
+        """
+        Determine whether the plan can be reused for a topology, i.e. whether
+        each node has the same predecessors as in the topology the plan was
+        compiled for. Graphs modified in place are therefore recognized.
+
+        :param topology: the topology
+        :type topology: networkx.DiGraph
+        :returns: ``True`` if the plan applies to the topology
+        """
+        return _fingerprint(topology) == self.fingerprint
+
+
+def _fingerprint(topology):
+    """
+    Get the sorted predecessors of each node of a topology, in node order.
+    """
+    return [(node, tuple(sorted(topology.predecessors(node)))) for node in sorted(topology.nodes)]
+
+
+def _has_static_parameters(cls):
+    """
+    Determine whether the class which defines a randomizer's
+    ``_function_class_parameters`` declares that its parameters only depend
+    on the topology, so that function plans may be cached.
+    """
+    for base in cls.__mro__:
+        if '_function_class_parameters' in vars(base):
+            return bool(vars(base).get('_static_parameters', False))
+    return False
+
+
 class NetworkRandomizer(AbstractRandomizer):
-    def __init__(self, network, trand=None, constraints=None, timeout=1000, **kwargs):
+    #: whether ``_function_class_parameters`` only depends on the topology
+    _static_parameters = True
+
+    def __init__(self, network, trand=None, constraints=None, timeout=1000, bias_mode='exact',
+                 correlated=False, **kwargs):
         """
         An abstract base class for all randomizers which implement dynamical
         randomization.
 
+        Functions are drawn with a given bias :math:`p` in one of two modes. In
+        ``'exact'`` mode, each function activates on exactly :math:`p 2^k`
+        states, rounded up or down at random so that the expected number of
+        states is correct. In ``'bernoulli'`` mode, each state of the inputs
+        independently activates the node with probability :math:`p`.
+
+        If ``correlated`` is ``True``, successive networks share functions:
+        the first candidate for each network reuses the function of every
+        node whose predecessors and function class are unchanged since the
+        previous network, and only the other nodes' functions are drawn. This
+        is intended for topology randomizers which change a few edges between
+        draws, e.g. ``mcmc.EdgeSwap``; it is not allowed with a fixed
+        topology, for which every network would repeat the last. Candidates
+        rejected by a constraint are redrawn in full.
+
         :param network: a base network or graph
         :type network: neet.Network or networkx.DiGraph
         :param trand: how to randomize the topology (default: FixedTopology)
@@ -23,7 +120,15 @@ class NetworkRandomizer(AbstractRandomizer):
         :param timeout: the number of attempts before rejection testing times
                         out. If less than 1, the rejection testing will never
                         time out.
+        :param bias_mode: how the bias of each function is enforced
+        :type bias_mode: ``'exact'`` or ``'bernoulli'``
+        :param correlated: whether to reuse the functions of unchanged nodes
+        :type correlated: bool
         """
+        if bias_mode not in ('exact', 'bernoulli'):
+            raise ValueError('bias_mode must be either "exact" or "bernoulli"')
+        self.bias_mode = bias_mode
+
         if trand is None:
             trand = FixedTopology(network, timeout=timeout, **kwargs)
         elif isclass(trand) and issubclass(trand, TopologyRandomizer):
@@ -32,9 +137,34 @@ class NetworkRandomizer(AbstractRandomizer):
             pass
         else:
             raise TypeError('trand must be an instance or subclass of TopologyRandomizer')
+        if correlated and isinstance(trand, FixedTopology):
+            raise ValueError('correlated networks require a topology randomizer which changes edges')
         self.trand = trand
+        self.correlated = correlated
+        self._plan_cache = None
+        self.__static = _has_static_parameters(type(self))
+        self.__previous = None
+        self.__candidate = None
+        self.__reuse = False
         super().__init__(network, constraints, timeout, **kwargs)
 
+    @property
+    def profiler(self):
+        return super().profiler
+
+    @profiler.setter
+    def profiler(self, profiler):
+        """
+        Set the randomizer's profiler. Unless it is ``None``, the profiler is
+        also given to the topology randomizer.
+
+        :param profiler: the new profiler
+        :type profiler: Profiler or None
+        """
+        AbstractRandomizer.profiler.__set__(self, profiler)  # type: ignore
+        if profiler is not None:
+            self.trand.profiler = profiler
+
     @property
     def constraints(self):
         return super().constraints
@@ -42,32 +172,24 @@ class NetworkRandomizer(AbstractRandomizer):
     @constraints.setter
     def constraints(self, constraints):
         """
-        Set the randomizer's constraints.
+        Set the randomizer's constraints. Topological constraints, including
+        the topological operands of any ``AllOf``, are given to the topology
+        randomizer.
 
         :param constraints: the new constraints
         :type constraints: a seq of AbstractConstraint instances
         :raises TypeError: if any of the contraints are not an AbstractConstraint
         """
-        if constraints is None:
-            constraints = []
-        elif not isinstance(constraints, list):
-            constraints = list(constraints)
-
-        tconstraints, dconstraints = [], []
-
-        for i, constraint in enumerate(constraints):
-            if isinstance(constraint, DynamicalConstraint):
-                dconstraints.append(constraint)
-            elif isinstance(constraint, TopologicalConstraint):
-                tconstraints.append(constraint)
-            elif callable(constraint):
-                dconstraints.append(GenericDynamical(constraint))
-            else:
-                msg = 'constraints must be callable, a DynamicalConstraint or TopologicalConstraint'
-                raise TypeError(msg)
+        try:
+            constraints = ConstraintSet(constraints, GenericDynamical).flatten()
+        except TypeError:
+            constraints = None
+        if constraints is None or not constraints.is_partitioned():
+            msg = 'constraints must be callable, a DynamicalConstraint or TopologicalConstraint'
+            raise TypeError(msg)
 
-        self.trand.constraints = tconstraints
-        AbstractRandomizer.constraints.__set__(self, dconstraints)  # type: ignore
+        self.trand.constraints = constraints.topological
+        AbstractRandomizer.constraints.__set__(self, constraints.dynamical)  # type: ignore
 
     def add_constraint(self, constraint):
         """
@@ -77,7 +199,10 @@ class NetworkRandomizer(AbstractRandomizer):
         :type constraint: AbstractConstraint
         :raises TypeError: if the constraint is not an AbstractConstraint
         """
-        if isinstance(constraint, DynamicalConstraint):
+        if isinstance(constraint, AllOf):
+            for operand in ConstraintSet([constraint]).flatten():
+                self.add_constraint(operand)
+        elif isinstance(constraint, DynamicalConstraint):
             super().add_constraint(constraint)
         elif callable(constraint):
             super().add_constraint(GenericDynamical(constraint))
@@ -87,38 +212,359 @@ class NetworkRandomizer(AbstractRandomizer):
             msg = 'constraints must be callable, a DynamicalConstraint or TopologicalConstraint'
             raise TypeError(msg)
 
+    def _feasibility_basis(self):
+        """
+        Dynamical constraints are checked against the base graph and the
+        preserved properties of the topology randomizer.
+        """
+        return self.trand.graph, self.trand.preserves
+
+    def _compile_constraint(self, constraint):
+        """
+        Compile a constraint for the hot loop. Instances of
+        ``IncrementalConstraint`` are elided as they are tested while the
+        network is constructed by ``_randomize``.
+
+        :param constraint: the constraint
+        :type constraint: DynamicalConstraint
+        :returns: callable or None
+        """
+        if isinstance(constraint, IncrementalConstraint):
+            return None
+        return super()._compile_constraint(constraint)
+
     def random(self):
-        topology = self.trand.random()
+        with self._stage('topology'):
+            topology = self.trand.random()
 
         loop = 0
+        self.__reuse = self.correlated
         while self.timeout <= 0 or loop < self.timeout:
+            self.attempts += 1
             net = self._randomize(topology)
-            if self._check_constraints(net):
+            self.__reuse = False
+            if net is not None and self._check_constraints(net):
+                self.accepted += 1
+                if self.correlated:
+                    self.__previous = self.__candidate
                 return net
             loop += 1
         raise ConstraintError('failed to generate a network that statisfies all constraints')
 
+    def random_tables(self):
+        """
+        Draw the topology and truth tables of a random network, as ``random``
+        does. The network itself is only constructed if it must be tested
+        against a constraint which is neither elided nor an
+        ``IncrementalConstraint``.
+
+        :returns: the topology, and a list of ``(predecessors, table)`` pairs in
+                  node order
+        :raises ConstraintError: if a constraint could not be satisfied before
+                                 the randomizer's timeout.
+        """
+        with self._stage('topology'):
+            topology = self.trand.random()
+
+        chain = self._constraint_chain()
+        loop = 0
+        self.__reuse = self.correlated
+        while self.timeout <= 0 or loop < self.timeout:
+            self.attempts += 1
+            functions = self._accept(topology, self._random_rows(topology))
+            self.__reuse = False
+            if functions is not None and \
+                    (len(chain.constraints) == 0 or self._check_constraints(self._build(functions))):
+                self.accepted += 1
+                if self.correlated:
+                    self.__previous = self.__candidate
+                return topology, functions
+            loop += 1
+        raise ConstraintError('failed to generate a network that statisfies all constraints')
+
     def _randomize(self, topology):
-        table = []
+        """
+        Create a random network with the provided topology.
+
+        :param topology: the topology of the network
+        :type topology: networkx.DiGraph
+        :returns: a neet.boolean.LogicNetwork, or ``None`` if an incremental
+                  constraint rejected the network during construction
+        """
+        return self._construct(topology, self._random_rows(topology))
+
+    def _random_rows(self, topology):
+        """
+        Lazily generate the rows of a random truth table, one node at a time.
+
+        :param topology: the topology of the network
+        :type topology: networkx.DiGraph
+        :returns: a generator of ``(node, predecessors, table)`` triples
+        """
+        plan = self._plan(topology)
+
+        functions = self.__reusable(plan) if self.__reuse else [None] * len(plan)
+        for k, indices in plan.groups:
+            indices = [i for i in indices.tolist() if functions[i] is None]
+            if indices:
+                for i, function in zip(indices, self._random_functions(k, plan.p[indices])):
+                    functions[i] = function
+        self.__candidate = (plan, functions, {})
+
+        for i, (node, predecessors, params) in enumerate(plan):
+            function = functions[i]
+            if function is None:
+                function = functions[i] = self._random_function(**params)
+            yield node, predecessors, function
+
+    def __reusable(self, plan):
+        """
+        Get the functions of the previous network which can be reused with a
+        plan, i.e. those of nodes whose predecessors and function class
+        parameters (other than the topology) are unchanged, or ``None`` for
+        the nodes whose functions must be drawn.
+        """
+        functions = [None] * len(plan)
+        if self.__previous is None:
+            return functions
+        previous, previous_functions, _ = self.__previous
+        old = dict((node, i) for i, node in enumerate(previous.nodes.tolist()))
+        for i, (node, predecessors, params) in enumerate(plan):
+            j = old.get(node)
+            if j is None or previous.predecessors[j] != predecessors:
+                continue
+            before = previous.params[j]
+            if len(before) == len(params) and \
+                    all(key == 'topology' or before.get(key) == value for key, value in params.items()):
+                functions[i] = previous_functions[j]
+        return functions
+
+    def _plan(self, topology):
+        """
+        Get the function plan for a topology. If the randomizer's parameters
+        are static (see ``_function_class_parameters``), the plan is only
+        compiled if the topology differs from that of the most recently
+        compiled plan.
+
+        :param topology: the topology of the network
+        :type topology: networkx.DiGraph
+        :returns: a FunctionPlan
+        """
+        if not self.__static:
+            return self._compile_plan(topology)
+        plan = self._plan_cache
+        if plan is None or not plan.matches(topology):
+            plan = self._compile_plan(topology)
+            self._plan_cache = plan
+        return plan
+
+    def _compile_plan(self, topology):
+        """
+        Compile the function plan for a topology.
+
+        :param topology: the topology of the network
+        :type topology: networkx.DiGraph
+        :returns: a FunctionPlan
+        """
+        predecessors, params = [], []
         for node in sorted(topology.nodes):
-            predecessors = tuple(topology.predecessors(node))
-            params = self._function_class_parameters(topology, node)
-            table.append((predecessors, self._random_function(**params)))
-        return neet.boolean.LogicNetwork(table)
+            predecessors.append(tuple(topology.predecessors(node)))
+            params.append(self._function_class_parameters(topology, node))
+        return FunctionPlan(topology, predecessors, params)
 
-    def _random_function(self, k, p, **kwargs):
+    def _invalidate_plan(self):
+        """
+        Discard the cached function plan. Randomizers with static parameters
+        must call this whenever an attribute which the parameters depend on
+        changes.
+        """
+        self._plan_cache = None
+
+    def _construct(self, topology, rows):
+        """
+        Construct a network from the rows of a truth table, feeding each row to
+        the randomizer's incremental constraints as it is produced.
+        Construction stops as soon as any of those constraints rejects the
+        network.
+
+        :param topology: the topology of the network
+        :type topology: networkx.DiGraph
+        :param rows: the ``(node, predecessors, table)`` triples
+        :returns: a neet.boolean.LogicNetwork, or ``None`` if the network was
+                  rejected
+        """
+        functions = self._accept(topology, rows)
+        if functions is None:
+            return None
+        return self._build(functions)
+
+    def _accept(self, topology, rows):
+        """
+        Feed the rows of a truth table to the randomizer's incremental
+        constraints as they are produced, stopping as soon as any of them
+        rejects the network.
+
+        :param topology: the topology of the network
+        :type topology: networkx.DiGraph
+        :param rows: the ``(node, predecessors, table)`` triples
+        :returns: a list of ``(predecessors, table)`` pairs, or ``None`` if the
+                  network was rejected
+        """
+        incremental = [(constraint, constraint.begin(topology))
+                       for constraint in self.constraints
+                       if isinstance(constraint, IncrementalConstraint)]
+        if self.profiler is not None:
+            rows = self.__profiled_rows(rows, incremental)
+
+        functions = []
+        for node, predecessors, function in rows:
+            for constraint, state in incremental:
+                if not constraint.update(state, node, predecessors, function):
+                    return None
+            functions.append((predecessors, function))
+
+        for constraint, state in incremental:
+            if not constraint.finish(state):
+                return None
+        return functions
+
+    def _build(self, functions):
+        """
+        Construct a network from the predecessors and truth table of each node,
+        without converting the truth tables to conditions.
+
+        :param functions: the ``(predecessors, table)`` pairs, one per node
+        :returns: an EncodedLogicNetwork
+        """
+        with self._stage('construct'):
+            if self.correlated:
+                return EncodedLogicNetwork(functions, encoded=self.__encode(functions))
+            return EncodedLogicNetwork(functions)
+
+    def __encode(self, functions):
+        """
+        Encode truth tables, reusing the encodings of functions reused from
+        the previous network.
+        """
+        known = self.__previous[2] if self.__previous is not None else {}
+        encoded, converted = [], {}
+        for predecessors, function in functions:
+            entry = known.get(id(function))
+            if entry is None or entry[0] is not function:
+                entry = (function, encode(predecessors, function))
+            converted[id(function)] = entry
+            encoded.append(entry[1])
+        self.__candidate = self.__candidate[:2] + (converted,)
+        return encoded
+
+    def __profiled_rows(self, rows, incremental):
+        """
+        Wrap the rows of a truth table and the randomizer's incremental
+        constraints so that function sampling and constraint testing are
+        reported to the profiler.
+        """
+        for i, (constraint, state) in enumerate(incremental):
+            incremental[i] = (_ProfiledConstraint(constraint, self._stage), state)
+        rows = iter(rows)
+        while True:
+            with self._stage('functions'):
+                row = next(rows, None)
+            if row is None:
+                return
+            yield row
+
+    def _num_states(self, k, p):
+        """
+        Draw the number of activating states of functions with :math:`k`
+        inputs and bias :math:`p`, according to the randomizer's bias mode.
+
+        :param k: the number of inputs
+        :type k: int
+        :param p: the bias of each function
+        :type p: numpy.ndarray of float
+        :returns: numpy.ndarray of int
+        """
         volume = 2**k
-        integer, decimal = divmod(p * volume, 1)
-        num_states = int(integer + np.random.choice(2, p=[1 - decimal, decimal]))
-        indices = np.random.choice(volume, num_states, replace=False)
-        return set('{0:0{1}b}'.format(index, k) for index in indices)
+        if self.bias_mode == 'bernoulli':
+            return np.random.binomial(volume, p)
+        integer, decimal = np.divmod(p * volume, 1)
+        return (integer + (np.random.random_sample(np.shape(p)) < decimal)).astype(int)
+
+    def _random_functions(self, k, p):
+        """
+        Draw the truth tables of several functions with :math:`k` inputs at
+        once, one for each of the provided biases.
+
+        :param k: the number of inputs
+        :type k: int
+        :param p: the bias of each function
+        :type p: numpy.ndarray of float
+        :returns: a 2-D numpy.ndarray of bool, one row per function
+        """
+        volume = 2**k
+        if self.bias_mode == 'bernoulli':
+            return np.random.random_sample((len(p), volume)) < p[:, np.newaxis]
+
+        num_states = self._num_states(k, p)
+        order = np.argsort(np.random.random_sample((len(p), volume)), axis=1)
+        tables = np.empty((len(p), volume), dtype=bool)
+        np.put_along_axis(tables, order, np.arange(volume) < num_states[:, np.newaxis], axis=1)
+        return tables
+
+    def _random_function(self, k, p, **kwargs):
+        """
+        Draw the truth table of a single function with :math:`k` inputs and
+        bias :math:`p`.
+
+        :param k: the number of inputs
+        :type k: int
+        :param p: the bias of the function
+        :type p: float
+        :returns: numpy.ndarray of bool
+        """
+        return self._random_functions(k, np.array([p], dtype=float))[0]
 
     @abstractmethod
     def _function_class_parameters(self, topology, node, **kwargs):
+        """
+        Get the parameters of the class from which a node's function is drawn.
+        The parameters are compiled into a ``FunctionPlan``. A class which
+        overrides this method may set ``_static_parameters = True`` to declare
+        that its parameters only depend on the topology and on attributes
+        which call ``_invalidate_plan`` when they are set, in which case the
+        plan is reused for as long as the topology does not change. Otherwise
+        the plan is compiled for every network.
+
+        :param topology: the topology of the network
+        :type topology: networkx.DiGraph
+        :param node: the node
+        :type node: int
+        :returns: a dict of keyword arguments for ``_random_function``
+        """
         return {'topology': topology, 'node': node, 'k': topology.in_degree(node)}
 
 
+class _ProfiledConstraint(object):
+    """
+    An incremental constraint whose updates are reported to a profiler.
+    """
+    def __init__(self, constraint, stage):
+        self.constraint = constraint
+        self.name = 'constraint:' + type(constraint).__name__
+        self.stage = stage
+
+    def update(self, state, node, predecessors, table):
+        with self.stage(self.name):
+            return self.constraint.update(state, node, predecessors, table)
+
+    def finish(self, state):
+        with self.stage(self.name):
+            return self.constraint.finish(state)
+
+
 class UniformBias(NetworkRandomizer):
+    _static_parameters = True
+
     def __init__(self, network, p=0.5, **kwargs):
         """
         Generate random Boolean networks with the same bias on each non-external
@@ -127,6 +573,21 @@ class UniformBias(NetworkRandomizer):
         super().__init__(network, **kwargs)
         self.p = p
 
+    @property
+    def p(self):
+        """
+        Get the bias of each node's function.
+        """
+        return self.__p
+
+    @p.setter
+    def p(self, p):
+        """
+        Set the bias of each node's function.
+        """
+        self.__p = p
+        self._invalidate_plan()
+
     def _function_class_parameters(self, topology, node, **kwargs):
         params = super()._function_class_parameters(topology, node)
         params.update({'p': self.p})
@@ -150,7 +611,76 @@ class MeanBias(UniformBias):
         return np.mean([float(len(row[1]) / 2**len(row[0])) for row in network.table])
 
 
+class MeanSensitivity(UniformBias):
+    def __init__(self, network, target=None, tol=None, **kwargs):
+        """
+        Generate random Boolean networks whose expected average sensitivity is
+        ``target``, by choosing a uniform bias ``p <= 1/2`` accordingly. A
+        function with :math:`k` inputs and bias :math:`p` has expected
+        sensitivity :math:`2p(1-p)k` in ``'bernoulli'`` mode (slightly more in
+        ``'exact'`` mode), which is averaged over the in-degrees of
+        ``network``.
+
+        Individual networks still fluctuate about the target; if ``tol`` is
+        provided, a ``HasSensitivity(target, tol)`` constraint is added, which
+        is then satisfied far more often than with an arbitrary bias.
+
+        :param network: the base network
+        :type network: neet.boolean.LogicNetwork
+        :param target: the target average sensitivity, by default that of
+                       ``network``
+        :type target: float
+        :param tol: the tolerance of an added ``HasSensitivity`` constraint
+        :type tol: float
+        :raises ValueError: if no bias attains the target sensitivity
+        """
+        if not isinstance(network, neet.boolean.LogicNetwork):
+            raise NotImplementedError()
+        if target is None:
+            target = network.average_sensitivity()
+        super().__init__(network, **kwargs)
+        self.target = target
+        self.p = self._solve_bias(network, target)
+        if tol is not None:
+            self.add_constraint(HasSensitivity(target, tol))
+
+    def _expected_sensitivity(self, k, p):
+        """
+        Get the expected average sensitivity of functions with in-degrees
+        :math:`k` and bias :math:`p` under the randomizer's bias mode.
+        """
+        k = np.asarray(k, dtype=float)
+        if self.bias_mode == 'bernoulli':
+            return np.mean(2 * p * (1 - p) * k)
+        volume = 2**k
+        lower, decimal = np.divmod(p * volume, 1)
+        pairs = (1 - decimal) * lower * (volume - lower) \
+            + decimal * (lower + 1) * (volume - lower - 1)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            per_node = np.where(k > 0, 2 * k * pairs / (volume * (volume - 1)), 0.0)
+        return np.mean(per_node)
+
+    def _solve_bias(self, network, target):
+        """
+        Find the bias ``p <= 1/2`` whose expected sensitivity is the target, by
+        bisection.
+        """
+        k = [len(row[0]) for row in network.table]
+        if target > self._expected_sensitivity(k, 0.5) + 1e-9:
+            raise ValueError('no bias attains an average sensitivity of {}'.format(target))
+        lower, upper = 0.0, 0.5
+        for _ in range(50):
+            middle = (lower + upper) / 2
+            if self._expected_sensitivity(k, middle) < target:
+                lower = middle
+            else:
+                upper = middle
+        return (lower + upper) / 2
+
+
 class LocalBias(NetworkRandomizer):
+    _static_parameters = True
+
     def __init__(self, network, trand=None, **kwargs):
         """
         Generate networks with the same bias on each node. This scheme can only
@@ -168,6 +698,21 @@ class LocalBias(NetworkRandomizer):
         super().__init__(network, trand, **kwargs)
         self.local_bias = [float(len(row[1]) / 2**len(row[0])) for row in network.table]
 
+    @property
+    def local_bias(self):
+        """
+        Get the bias of each node's function.
+        """
+        return self.__local_bias
+
+    @local_bias.setter
+    def local_bias(self, local_bias):
+        """
+        Set the bias of each node's function.
+        """
+        self.__local_bias = local_bias
+        self._invalidate_plan()
+
     def _function_class_parameters(self, topology, node, **kwargs):
         params = super()._function_class_parameters(topology, node)
         params.update({'p': self.local_bias[node]})
@@ -175,23 +720,26 @@ class LocalBias(NetworkRandomizer):
 
 
 class FixCanalizingMixin(NetworkRandomizer):
-    def _randomize(self, topology):
-        table = []
+    _static_parameters = True
+
+    def _compile_plan(self, topology):
         if self.network is None:  # type: ignore
             raise NotImplementedError('Randomizer is based on a graph, cannot infer canalization')
-        canalizing = self.network.canalizing_nodes()
-        for node in sorted(topology.nodes):
-            predecessors = tuple(topology.predecessors(node))
-            params = self._function_class_parameters(topology, node)
-            if node in canalizing:
-                table.append((predecessors, self._random_canalizing_function(**params)))
-            else:
-                table.append((predecessors, self._random_function(**params)))
-        return neet.boolean.LogicNetwork(table)
+        self._canalizing_nodes = self.network.canalizing_nodes()
+        return super()._compile_plan(topology)
+
+    def _function_class_parameters(self, topology, node, **kwargs):
+        params = super()._function_class_parameters(topology, node)
+        params.update({'canalizing': node in self._canalizing_nodes})
+        return params
+
+    def _random_function(self, k, p, canalizing=False, **kwargs):
+        if canalizing:
+            return self._random_canalizing_function(k, p, **kwargs)
+        return super()._random_function(k, p, **kwargs)
 
     def _random_canalizing_function(self, k, p, **kwargs):
-        integer, decimal = divmod(2**k * p, 1)
-        num_states = int(integer + np.random.choice(2, p=[1 - decimal, decimal]))
+        num_states = int(self._num_states(k, p))
 
         canalizing_input = np.random.choice(k)
         canalizing_value = np.random.choice(2)
@@ -202,17 +750,19 @@ class FixCanalizingMixin(NetworkRandomizer):
         else:
             canalized_value = np.random.choice(2)
 
-        fixed_states = self._all_states_with_one_node_fixed(k, canalizing_input, canalizing_value)
-        other_states = np.lib.arraysetops.setxor1d(np.arange(2**k), fixed_states, assume_unique=True)
+        fixed = self._all_states_with_one_node_fixed(k, canalizing_input, canalizing_value)
+        other_states, = np.nonzero(~fixed)
 
+        table = np.zeros(2**k, dtype=bool)
         if canalized_value == 1:
-            state_idxs = np.random.choice(other_states, num_states - len(fixed_states), replace=False)
-            state_idxs = np.concatenate((state_idxs, np.array(fixed_states)))
-        elif canalized_value == 0:
-            state_idxs = np.random.choice(other_states, num_states, replace=False)
-
-        return set('{0:0{1}b}'.format(idx, k) for idx in state_idxs)
+            table[fixed] = True
+            num_states -= 2**(k - 1)
+        table[np.random.choice(other_states, num_states, replace=False)] = True
+        return table
 
     def _all_states_with_one_node_fixed(self, k, fixed_index, fixed_value):
-        return [idx for idx in range(2**k)
-                if '{0:0{1}b}'.format(idx, k)[fixed_index] == str(fixed_value)]
+        """
+        Get a mask of the states in which input ``fixed_index`` has the value
+        ``fixed_value``.
+        """
+        return ((np.arange(2**k) >> (k - 1 - fixed_index)) & 1) == fixed_value
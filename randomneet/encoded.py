@@ -0,0 +1,123 @@
+import neet.boolean
+import networkx as nx
+import numpy as np
+
+from .tables import conditions, truth_table
+
+
+def encode(predecessors, table):
+    """
+    Encode a node's truth table as a ``neet.boolean.LogicNetwork`` does: the
+    mask of its predecessors, and the set of masked network states which
+    activate it. A network state is encoded with bit :math:`i` holding the
+    state of node :math:`i`.
+
+    :param predecessors: the inputs of the function
+    :type predecessors: tuple
+    :param table: the truth table, indexed as in ``tables.truth_table``
+    :type table: numpy.ndarray of bool
+    :returns: the ``(mask, encoded conditions)`` pair
+    """
+    codes = [0]
+    for index in predecessors:
+        weight = 1 << index
+        codes = [code + bit for code in codes for bit in (0, weight)]
+    return sum(1 << index for index in set(predecessors)), set(codes[x] for x in np.flatnonzero(table))
+
+
+class EncodedLogicNetwork(neet.boolean.LogicNetwork):
+    def __init__(self, functions, names=None, metadata=None, encoded=None):
+        """
+        A ``neet.boolean.LogicNetwork`` built directly from the dense truth
+        table of each node, as sampled by the randomizers, rather than from
+        sets of condition strings.
+
+        The network is encoded for ``update`` straight from the truth tables,
+        and the string conditions of ``table`` are only computed when they
+        are first read. The truth tables are made read-only and kept, without
+        copying, as ``functions``, so they may be shared between networks but
+        must not be modified by the caller.
+
+        :param functions: the ``(predecessors, table)`` pairs, one per node
+        :type functions: a sequence of pairs
+        :param names: the names of the nodes
+        :type names: seq
+        :param metadata: metadata dictionary for the network
+        :type metadata: dict
+        :param encoded: the precomputed result of ``encode`` for each node
+        :type encoded: a sequence of pairs, or None
+        :raises IndexError: if a node depends on another which doesn't exist
+        :raises ValueError: if a truth table has the wrong number of states
+        """
+        size = len(functions)
+        neet.boolean.BooleanNetwork.__init__(self, size=size, names=names, metadata=metadata)
+        rows = []
+        for predecessors, table in functions:
+            predecessors = tuple(predecessors)
+            for index in predecessors:
+                if index >= size:
+                    raise IndexError('mask index out of range')
+            if len(table) != 2**len(predecessors):
+                raise ValueError('a truth table must have one entry per state of its inputs')
+            table = np.asarray(table, dtype=bool)
+            table.flags.writeable = False
+            rows.append((predecessors, table))
+        self.__functions = rows
+        self.__table = None
+        if encoded is None:
+            encoded = [encode(predecessors, table) for predecessors, table in rows]
+        self._encoded_table = list(encoded)
+
+    @property
+    def functions(self):
+        """
+        Get the predecessors and dense truth table of each node.
+
+        :returns: a list of ``(predecessors, table)`` pairs
+        """
+        if self.__functions is None:
+            self.__functions = [(tuple(predecessors), truth_table(conds, len(predecessors)))
+                                for predecessors, conds in self.__table]
+        return self.__functions
+
+    @property
+    def table(self):
+        """
+        Get the network's truth table, as the predecessors and activating
+        conditions of each node, computing it on first use.
+
+        :returns: a list of ``(predecessors, conditions)`` pairs
+        """
+        if self.__table is None:
+            self.__table = [(predecessors, conditions(table)) for predecessors, table in self.__functions]
+        return self.__table
+
+    @table.setter
+    def table(self, table):
+        """
+        Replace the network's truth table, e.g. by ``reduce_table``.
+        """
+        self.__table = table
+        self.__functions = None
+
+    def neighbors_in(self, index, *args, **kwargs):
+        return set(self.functions[index][0])
+
+    def neighbors_out(self, index, *args, **kwargs):
+        return set(node for node, (predecessors, _) in enumerate(self.functions)
+                   if index in predecessors)
+
+    def network_graph(self, labels='indices', **kwargs):
+        """
+        The graph of the network, as ``neet.Network.network_graph`` builds it
+        but without a pass over every node's successors for every node.
+        """
+        if labels != 'indices':
+            return super().network_graph(labels, **kwargs)
+        successors = [set() for _ in range(self.size)]
+        for target, (predecessors, _) in enumerate(self.functions):
+            for source in predecessors:
+                successors[source].add(target)
+        edges = [(source, target) for source in range(self.size) for target in sorted(successors[source])]
+        kwargs.update(self.metadata)
+        return nx.DiGraph(edges, **kwargs)
@@ -0,0 +1,161 @@
+import hashlib
+import math
+import networkx as nx
+import numpy as np
+
+from .constraints import ConstraintError
+from .tables import network_tables, canonical
+from ._neet import is_logic_network
+
+
+def network_hash(net):
+    """
+    Compute a canonical hash of a logic network or directed graph. Graphs are
+    hashed by their sorted edge list, and logic networks by the sorted
+    predecessors and bit-packed truth table of each node, so the hash does
+    not depend on the order in which a node's inputs are listed.
+
+    :param net: the network or graph
+    :type net: neet.boolean.LogicNetwork or networkx.DiGraph
+    :returns: a 16 byte digest
+    :raises TypeError: if the argument is neither a logic network nor a graph
+    """
+    digest = hashlib.sha1()
+    if is_logic_network(net):
+        digest.update(b'L%d;' % net.size)
+        for predecessors, table in network_tables(net):
+            predecessors, table = canonical(predecessors, table)
+            digest.update(repr(predecessors).encode())
+            digest.update(np.packbits(table).tobytes())
+    elif isinstance(net, nx.DiGraph):
+        digest.update(b'G%d;' % len(net))
+        digest.update(repr(sorted(net.edges)).encode())
+    else:
+        raise TypeError('net must be a neet.boolean.LogicNetwork or a networkx.DiGraph')
+    return digest.digest()[:16]
+
+
+class BloomFilter(object):
+    def __init__(self, capacity, error_rate=1e-6):
+        """
+        A fixed-size probabilistic set of digests. After ``capacity`` insertions
+        the probability of a false positive is approximately ``error_rate``,
+        and there are never false negatives.
+
+        :param capacity: the expected number of insertions
+        :type capacity: int
+        :param error_rate: the desired false positive rate
+        :type error_rate: float
+        """
+        if capacity < 1:
+            raise ValueError('capacity must be positive')
+        if not 0 < error_rate < 1:
+            raise ValueError('error_rate must be in (0, 1)')
+        self.num_bits = int(math.ceil(-capacity * math.log(error_rate) / math.log(2)**2))
+        self.num_hashes = max(1, int(round(self.num_bits / capacity * math.log(2))))
+        self.bits = np.zeros((self.num_bits + 7) // 8, dtype=np.uint8)
+
+    def __indices(self, digest):
+        """
+        Derive the bit indices of a digest by double hashing.
+        """
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:16], 'little') | 1
+        return [(h1 + i * h2) % self.num_bits for i in range(self.num_hashes)]
+
+    def __contains__(self, digest):
+        return all(self.bits[i >> 3] & (1 << (i & 7)) for i in self.__indices(digest))
+
+    def add(self, digest):
+        """
+        Add a digest to the filter.
+
+        :param digest: the digest
+        :type digest: bytes
+        :returns: ``True`` if the digest was (probably) already present
+        """
+        present = True
+        for i in self.__indices(digest):
+            if not self.bits[i >> 3] & (1 << (i & 7)):
+                present = False
+                self.bits[i >> 3] |= (1 << (i & 7))
+        return present
+
+
+class Ensemble(object):
+    def __init__(self, randomizer, size=None, unique=False, capacity=None, error_rate=1e-6):
+        """
+        An iterable ensemble of networks or graphs drawn from a randomizer.
+
+        If ``unique`` is ``True``, each accepted network is hashed with
+        ``network_hash`` and networks which have already been generated are
+        skipped. By default every hash is stored exactly; if a ``capacity``
+        is provided, a ``BloomFilter`` of fixed size is used instead, at the
+        cost of occasionally skipping a network which has not been seen. If
+        more than ``randomizer.timeout`` consecutive duplicates are drawn, a
+        ``ConstraintError`` is raised.
+
+        :param randomizer: the randomizer
+        :type randomizer: AbstractRandomizer
+        :param size: the number of networks to generate, or ``None`` to
+                     generate indefinitely
+        :type size: int or None
+        :param unique: whether to skip duplicate networks
+        :type unique: bool
+        :param capacity: the expected number of unique networks, used to size a
+                         Bloom filter
+        :type capacity: int or None
+        :param error_rate: the false positive rate of the Bloom filter
+        :type error_rate: float
+        """
+        if size is not None and size < 0:
+            raise ValueError('size must be non-negative')
+        self.randomizer = randomizer
+        self.size = size
+        self.unique = unique
+        if not unique:
+            self.seen = None
+        elif capacity is None:
+            self.seen = set()
+        else:
+            self.seen = BloomFilter(capacity, error_rate)
+        self.generated = 0
+        self.duplicates = 0
+
+    @property
+    def duplicate_rate(self):
+        """
+        Get the fraction of accepted networks which were skipped as
+        duplicates.
+
+        :returns: float
+        """
+        total = self.generated + self.duplicates
+        return self.duplicates / total if total else 0.0
+
+    def __is_duplicate(self, net):
+        """
+        Record a network, determining whether it has been seen before.
+        """
+        digest = network_hash(net)
+        if isinstance(self.seen, set):
+            if digest in self.seen:
+                return True
+            self.seen.add(digest)
+            return False
+        return self.seen.add(digest)
+
+    def __iter__(self):
+        timeout = self.randomizer.timeout
+        while self.size is None or self.generated < self.size:
+            net = self.randomizer.random()
+            if self.unique:
+                loop = 0
+                while self.__is_duplicate(net):
+                    self.duplicates += 1
+                    loop += 1
+                    if 0 < timeout <= loop:
+                        raise ConstraintError('failed to generate a unique network')
+                    net = self.randomizer.random()
+            self.generated += 1
+            yield net
@@ -0,0 +1,286 @@
+import math
+import numpy as np
+
+from .constraints import ConstraintError, HasCanalizingNodes
+from .dynamics import NetworkRandomizer
+from .tables import is_canalizing
+
+
+def _binomial(n, k):
+    """
+    The binomial coefficient :math:`\\binom{n}{k}`, or ``0`` if :math:`k` is
+    out of range.
+    """
+    if k < 0 or k > n:
+        return 0
+    k = min(k, n - k)
+    result = 1
+    for i in range(k):
+        result = result * (n - i) // (i + 1)
+    return result
+
+
+def canalizing_count(k, m):
+    """
+    Count the canalizing functions of :math:`k` inputs which activate on
+    exactly :math:`m` of the :math:`2^k` states of their inputs.
+
+    A function is canalizing if one of its inputs, taking one of its values,
+    fixes the output; i.e. if one of the :math:`2k` halves of the state space
+    in which an input is fixed is constant. The count follows from
+    inclusion-exclusion over these events: a consistent set of them either
+    fixes the same output on every half it contains, or is a pair of
+    complementary halves with different outputs.
+
+    :param k: the number of inputs
+    :type k: int
+    :param m: the number of activating states
+    :type m: int
+    :returns: int
+    """
+    volume = 2**k
+    if k == 0 or m < 0 or m > volume:
+        return 0
+    total = 0
+    for output in (0, 1):
+        for single in range(k + 1):
+            for both in range(k - single + 1):
+                if single == 0 and both == 0:
+                    continue
+                sets = _binomial(k, single) * 2**single * _binomial(k - single, both)
+                if both > 0:
+                    count = 1 if m == output * volume else 0
+                else:
+                    free = 2**(k - single)
+                    count = _binomial(free, m - output * (volume - free))
+                total += sets * count if single % 2 == 1 else -sets * count
+    if 2 * m == volume:
+        total -= 2 * k
+    return total
+
+
+class _FunctionClass(object):
+    def __init__(self, k, p, bias_mode):
+        """
+        The distribution of the number of activating states of the functions
+        drawn by a ``NetworkRandomizer`` for nodes with :math:`k` inputs and
+        bias :math:`p`, and the probability that each such number gives a
+        canalizing function.
+        """
+        self.k = k
+        self.volume = volume = 2**k
+        states = np.arange(volume + 1)
+        if bias_mode == 'bernoulli':
+            if p <= 0 or p >= 1:
+                pmf = (states == round(p * volume)).astype(float)
+            else:
+                log_binomial = [math.lgamma(volume + 1) - math.lgamma(m + 1) - math.lgamma(volume - m + 1)
+                                for m in states]
+                pmf = np.exp(np.array(log_binomial) + states * math.log(p) + (volume - states) * math.log1p(-p))
+        else:
+            lower, decimal = divmod(p * volume, 1)
+            pmf = np.zeros(volume + 1)
+            pmf[int(lower)] += 1 - decimal
+            if decimal > 0:
+                pmf[int(lower) + 1] += decimal
+        self.pmf = pmf
+        self.canalizing = np.array([canalizing_count(k, m) / _binomial(volume, m) if pmf[m] else 0.0
+                                    for m in states])
+        self.probability = float(np.dot(pmf, self.canalizing))
+
+    def sample(self, canalizing):
+        """
+        Draw a function from the class, conditioned on whether it is
+        canalizing.
+        """
+        weights = self.pmf * (self.canalizing if canalizing else 1 - self.canalizing)
+        m = int(np.random.choice(self.volume + 1, p=weights / np.sum(weights)))
+        if canalizing:
+            return self.__canalizing(m)
+        while True:
+            table = np.zeros(self.volume, dtype=bool)
+            table[np.random.choice(self.volume, m, replace=False)] = True
+            if not is_canalizing(table):
+                return table
+
+    def __canalizing(self, m):
+        """
+        Draw a canalizing function with :math:`m` activating states uniformly
+        at random, by the Karp-Luby method: pick one of the constant halves,
+        weighted by the number of functions in which it is constant, fill in
+        the rest at random and accept with probability one over the number of
+        constant halves.
+        """
+        k, volume, half = self.k, self.volume, self.volume // 2
+        states = np.arange(volume)
+        masks = [((states >> (k - 1 - i)) & 1) == value for i in range(k) for value in (0, 1)]
+        events = [(mask, output) for mask in masks for output in (0, 1)]
+        counts = np.array([_binomial(half, m - output * half) for _, output in events], dtype=float)
+        while True:
+            mask, output = events[np.random.choice(len(events), p=counts / np.sum(counts))]
+            table = np.zeros(volume, dtype=bool)
+            table[mask] = bool(output)
+            rest, = np.nonzero(~mask)
+            table[np.random.choice(rest, m - output * half, replace=False)] = True
+            constant = sum(1 for mask in masks if np.all(table[mask]) or not np.any(table[mask]))
+            if np.random.random_sample() * constant < 1:
+                return table
+
+
+def effective_sample_size(log_weights):
+    """
+    Compute Kish's effective sample size of a set of importance weights,
+    :math:`(\\sum_i w_i)^2 / \\sum_i w_i^2`.
+
+    :param log_weights: the logarithms of the weights
+    :type log_weights: a sequence of float
+    :returns: float
+    """
+    log_weights = np.asarray(log_weights, dtype=float)
+    if len(log_weights) == 0 or not np.any(np.isfinite(log_weights)):
+        return 0.0
+    w = np.exp(log_weights - np.max(log_weights))
+    return float(np.sum(w)**2 / np.sum(w**2))
+
+
+def weighted_mean(values, log_weights):
+    """
+    Estimate the mean of a statistic under the target distribution from
+    importance-weighted samples, normalizing the weights to sum to one.
+
+    :param values: the statistic of each sample
+    :type values: a sequence of float
+    :param log_weights: the logarithms of the samples' weights
+    :type log_weights: a sequence of float
+    :returns: float
+    """
+    log_weights = np.asarray(log_weights, dtype=float)
+    w = np.exp(log_weights - np.max(log_weights))
+    return float(np.dot(w, np.asarray(values, dtype=float)) / np.sum(w))
+
+
+class ImportanceSampler(object):
+    def __init__(self, randomizer, target):
+        """
+        Sample networks from a dynamics randomizer subject to a
+        ``HasCanalizingNodes`` constraint without rejection, for targets which
+        the randomizer would almost never satisfy by chance.
+
+        For each topology, the probability that each node's function is
+        canalizing is computed exactly. The set of canalizing nodes is then
+        drawn from the randomizer's distribution conditioned on there being
+        exactly ``target`` of them, and each node's function is drawn
+        conditioned on whether it is canalizing. Each network is returned with
+        the logarithm of its importance weight, the probability that the
+        randomizer draws a network with ``target`` canalizing nodes for that
+        topology; with a fixed topology every weight is equal.
+
+        The randomizer's other constraints are still enforced by rejection, in
+        which case the weights are known only up to a constant factor and
+        estimates should be normalized, as in ``weighted_mean``.
+
+        .. code-block:: python
+
+            sampler = ImportanceSampler(UniformBias(myeloid, trand=MeanDegree), 8)
+            samples = [sampler.sample() for _ in range(1000)]
+            sensitivity = weighted_mean([net.average_sensitivity() for net, _ in samples],
+                                        [w for _, w in samples])
+
+        :param randomizer: the randomizer whose distribution is targeted
+        :type randomizer: NetworkRandomizer
+        :param target: the number of canalizing nodes
+        :type target: int or HasCanalizingNodes
+        :raises TypeError: if the randomizer is not a NetworkRandomizer
+        """
+        if not isinstance(randomizer, NetworkRandomizer):
+            raise TypeError('randomizer must be a NetworkRandomizer')
+        if isinstance(target, HasCanalizingNodes):
+            target = target.num_canalizing
+        elif not isinstance(target, int) or target < 0:
+            raise ValueError('target must be a non-negative integer or HasCanalizingNodes')
+        self.randomizer = randomizer
+        self.target = target
+        self.log_weights = []
+        self.__classes = {}
+
+    def __function_class(self, k, p):
+        """
+        Get the function class of nodes with :math:`k` inputs and bias
+        :math:`p`, computing it if necessary.
+        """
+        key = (k, p, self.randomizer.bias_mode)
+        function_class = self.__classes.get(key)
+        if function_class is None:
+            function_class = self.__classes[key] = _FunctionClass(*key)
+        return function_class
+
+    def __propose(self, topology):
+        """
+        Draw the functions of a network with the target number of canalizing
+        nodes, returning the rows of its truth table and its log-weight.
+        """
+        plan = self.randomizer._plan(topology)
+        standard = {'topology', 'node', 'k', 'p'}
+        if np.any(np.isnan(plan.p)) or not all(standard.issuperset(params) for params in plan.params):
+            raise NotImplementedError('only plain (k, p) function classes can be importance sampled')
+        classes = [self.__function_class(int(k), float(p)) for k, p in zip(plan.k, plan.p)]
+
+        # remaining[i][j] is the probability that exactly j of nodes i, ...
+        # are canalizing
+        n, target = len(classes), self.target
+        remaining = np.zeros((n + 1, target + 2))
+        remaining[n, 0] = 1.0
+        for i in range(n - 1, -1, -1):
+            q = classes[i].probability
+            remaining[i, :target + 1] = (1 - q) * remaining[i + 1, :target + 1]
+            remaining[i, 1:target + 1] += q * remaining[i + 1, :target]
+        if remaining[0, target] <= 0:
+            return None, -np.inf
+
+        rows, needed = [], target
+        for i, (node, predecessors, _) in enumerate(plan):
+            q = classes[i].probability
+            chance = q * remaining[i + 1, needed - 1] / remaining[i, needed] if needed else 0.0
+            canalizing = np.random.random_sample() < chance
+            needed -= canalizing
+            rows.append((node, predecessors, classes[i].sample(canalizing)))
+        return rows, math.log(remaining[0, target])
+
+    def sample(self):
+        """
+        Draw a network and its importance weight.
+
+        :returns: a ``(network, log_weight)`` pair
+        :raises ConstraintError: if no network satisfied the randomizer's
+                                 constraints before its timeout
+        """
+        randomizer = self.randomizer
+        loop = 0
+        while randomizer.timeout <= 0 or loop < randomizer.timeout:
+            randomizer.attempts += 1
+            topology = randomizer.trand.random()
+            rows, log_weight = self.__propose(topology)
+            if rows is not None:
+                net = randomizer._construct(topology, iter(rows))
+                if net is not None and randomizer._check_constraints(net):
+                    randomizer.accepted += 1
+                    self.log_weights.append(log_weight)
+                    return net, log_weight
+            loop += 1
+        raise ConstraintError('failed to generate a network that statisfies all constraints')
+
+    def __iter__(self):
+        """
+        Generate an infinite sequence of ``(network, log_weight)`` pairs.
+        """
+        while True:
+            yield self.sample()
+
+    @property
+    def effective_sample_size(self):
+        """
+        Get the effective sample size of the networks drawn so far.
+
+        :returns: float
+        """
+        return effective_sample_size(self.log_weights)
@@ -0,0 +1,660 @@
+import networkx as nx
+import numpy as np
+
+from inspect import isclass
+from .constraints import IncrementalConstraint, ConstraintError
+from .dynamics import LocalBias
+from .randomizer import AbstractRandomizer
+from .encoded import EncodedLogicNetwork, encode
+from .tables import network_tables
+from .topology import TopologyRandomizer, FixedTopology
+
+
+def autocorrelation(series, max_lag=None):
+    """
+    Estimate the autocorrelation function of a series.
+
+    :param series: the series
+    :type series: a sequence of float
+    :param max_lag: the largest lag, by default half the series length
+    :type max_lag: int
+    :returns: numpy.ndarray of the autocorrelations at lags ``0, ..., max_lag``,
+              or ``None`` if the series is constant
+    """
+    x = np.asarray(series, dtype=float)
+    x = x - np.mean(x)
+    variance = np.dot(x, x)
+    if variance <= 1e-12 * len(x):
+        return None
+    if max_lag is None:
+        max_lag = len(x) // 2
+    return np.array([np.dot(x[:len(x) - k], x[k:]) / variance for k in range(max_lag + 1)])
+
+
+def decorrelation_lag(series, threshold=0.1):
+    """
+    Find the smallest lag at which the autocorrelation of a series falls below
+    a threshold.
+
+    :param series: the series
+    :type series: a sequence of float
+    :param threshold: the autocorrelation threshold
+    :type threshold: float
+    :returns: int, ``1`` for a constant series, or ``None`` if the
+              autocorrelation stays above the threshold
+    """
+    acf = autocorrelation(series)
+    if acf is None:
+        return 1
+    below = np.flatnonzero(acf < threshold)
+    return int(below[0]) if len(below) else None
+
+
+def potential_scale_reduction(chains):
+    """
+    Compute the Gelman-Rubin potential scale reduction factor of a statistic
+    recorded by several chains. Values close to 1 indicate that the chains
+    have mixed.
+
+    :param chains: one series per chain, all of the same length
+    :type chains: a sequence of sequences of float
+    :returns: float, or ``nan`` if it is undefined
+    """
+    x = np.asarray(chains, dtype=float)
+    m, n = x.shape
+    if m < 2 or n < 2:
+        return float('nan')
+    within = np.mean(np.var(x, axis=1, ddof=1))
+    between = n * np.var(np.mean(x, axis=1), ddof=1)
+    if within <= 0:
+        return 1.0 if between <= 0 else float('inf')
+    return float(np.sqrt(((n - 1) / n * within + between / n) / within))
+
+
+class EdgeSwap(TopologyRandomizer):
+    preserves = frozenset(['in_degree', 'out_degree', 'num_edges'])
+
+    def __init__(self, network, constraints=None, timeout=1000, thin=None, burn_in=None,
+                 self_loops=True, threshold=0.1, **kwargs):
+        """
+        Generate topologies with the same in- and out-degree of every node as
+        the initial network with a Markov chain of degree-preserving edge
+        swaps. Each step picks two edges :math:`(a,b)` and :math:`(c,d)` and
+        rewires them to :math:`(a,d)` and :math:`(c,b)`, unless that would
+        create a multi-edge (or a self-loop, if they are not allowed).
+
+        Each call to ``random`` advances the chain by ``thin`` steps. Unless
+        ``thin`` is provided, the chain tunes itself the first time it is
+        used; see ``tune``. Otherwise, unless ``burn_in`` is provided, the
+        chain runs until it has forgotten its initial graph before the first
+        sample; see ``burn``. Two cheap statistics track the
+        chain's progress: the fraction of the original edges still present
+        (``overlap``) and the correlation between the out-degree of each
+        edge's source and the in-degree of its target (``assortativity``).
+
+        :param network: a base network or graph
+        :type network: neet.Network or networkx.DiGraph
+        :param constraints: constraints used for rejection testing
+        :type constraints: a sequence of TopologicalConstraint instances
+        :param timeout: the number of attempts before rejection testing times
+                        out. If less than 1, the rejection testing will never
+                        time out.
+        :param thin: the number of steps between samples
+        :type thin: int or None
+        :param burn_in: the number of steps before the first sample
+        :type burn_in: int or None
+        :param self_loops: whether to allow self-loops
+        :type self_loops: bool
+        :param threshold: the autocorrelation below which samples are
+                          considered independent when tuning
+        :type threshold: float
+        """
+        self.thin = thin
+        self.burn_in = burn_in
+        self.self_loops = self_loops
+        self.threshold = threshold
+        self.diagnostics = {}
+        super().__init__(network, constraints, timeout, **kwargs)
+        self.reset()
+
+    def reset(self):
+        """
+        Restart the chain from the randomizer's graph.
+        """
+        graph = self.graph
+        n = len(graph)
+        if sorted(graph.nodes) != list(range(n)):
+            raise ValueError('graph nodes must be labeled 0, ..., n-1')
+        edges = sorted(graph.edges)
+        self.__sources = [a for a, _ in edges]
+        self.__targets = [b for _, b in edges]
+        self.__n = n
+        self.__original = set(a * n + b for a, b in edges)
+        self.__edges = set(self.__original)
+        self.__overlap = len(self.__original)
+        self.__out_degree = np.bincount(self.__sources, minlength=n)
+        self.__in_degree = np.bincount(self.__targets, minlength=n)
+        self.steps = 0
+        self.swaps = 0
+        self.__burnt = False
+
+    @property
+    def sources(self):
+        """
+        Get the sources of the current graph's edges.
+
+        :returns: numpy.ndarray of int
+        """
+        return np.array(self.__sources, dtype=np.int64)
+
+    @property
+    def targets(self):
+        """
+        Get the targets of the current graph's edges.
+
+        :returns: numpy.ndarray of int
+        """
+        return np.array(self.__targets, dtype=np.int64)
+
+    @property
+    def swap_rate(self):
+        """
+        Get the fraction of proposed swaps which were accepted.
+
+        :returns: float, or ``None`` if no swaps have been proposed
+        """
+        return self.swaps / self.steps if self.steps else None
+
+    def overlap(self):
+        """
+        Get the fraction of the original graph's edges in the current graph.
+
+        :returns: float
+        """
+        m = len(self.__sources)
+        return self.__overlap / m if m else 1.0
+
+    def expected_overlap(self):
+        """
+        Estimate the overlap expected once the chain has mixed, i.e. the
+        probability that a random graph with the same degrees contains each
+        original edge, :math:`k^{out}_a k^{in}_b / m`, averaged over the
+        original edges.
+
+        :returns: float
+        """
+        m = len(self.__sources)
+        if m == 0:
+            return 1.0
+        n = self.__n
+        original = np.array(sorted(self.__original), dtype=np.int64)
+        a, b = np.divmod(original, n)
+        return float(np.mean(np.minimum(1.0, self.__out_degree[a] * self.__in_degree[b] / m)))
+
+    def assortativity(self):
+        """
+        Get the Pearson correlation between the out-degree of the source and
+        the in-degree of the target of each edge in the current graph.
+
+        :returns: float, or ``0.0`` if either degree is constant
+        """
+        x = self.__out_degree[self.sources].astype(float)
+        y = self.__in_degree[self.targets].astype(float)
+        if len(x) < 2 or np.std(x) == 0 or np.std(y) == 0:
+            return 0.0
+        return float(np.corrcoef(x, y)[0, 1])
+
+    def step(self, steps=1):
+        """
+        Advance the chain by a number of proposed swaps.
+
+        :param steps: the number of proposals
+        :type steps: int
+        """
+        m = len(self.__sources)
+        if m < 2 or steps <= 0:
+            self.steps += max(steps, 0)
+            return
+        n = self.__n
+        sources, targets = self.__sources, self.__targets
+        edges, original = self.__edges, self.__original
+        pairs = np.random.randint(0, m, size=(steps, 2)).tolist()
+        swaps, overlap = 0, self.__overlap
+        for i, j in pairs:
+            a, b, c, d = sources[i], targets[i], sources[j], targets[j]
+            if a == c or b == d:
+                continue
+            if not self.self_loops and (a == d or c == b):
+                continue
+            ad, cb = a * n + d, c * n + b
+            if ad in edges or cb in edges:
+                continue
+            ab, cd = a * n + b, c * n + d
+            edges.remove(ab)
+            edges.remove(cd)
+            edges.add(ad)
+            edges.add(cb)
+            overlap += (ad in original) + (cb in original) - (ab in original) - (cd in original)
+            targets[i], targets[j] = d, b
+            swaps += 1
+        self.__overlap = overlap
+        self.steps += steps
+        self.swaps += swaps
+
+    def burn(self, max_burn_in=100):
+        """
+        Run the chain until it has forgotten its initial graph.
+
+        The chain records the overlap with the original graph every tenth of
+        a sweep (:math:`m/10` proposals for :math:`m` edges). Burn-in ends
+        once the overlap stops decreasing, i.e. the mean of the last ten
+        records is no smaller than that of the ten before, or after
+        ``max_burn_in`` sweeps.
+
+        The result is stored in ``burn_in`` and ``diagnostics``.
+
+        :param max_burn_in: the maximum burn-in, in sweeps
+        :type max_burn_in: int
+        :returns: the burn-in, in steps
+        """
+        interval = max(1, len(self.__sources) // 10)
+
+        overlap = [self.overlap()]
+        while len(overlap) < 10 * max_burn_in:
+            self.step(interval)
+            overlap.append(self.overlap())
+            if len(overlap) >= 20 and np.mean(overlap[-10:]) >= np.mean(overlap[-20:-10]) - 1e-3:
+                break
+        self.burn_in = (len(overlap) - 1) * interval
+        self.__burnt = True
+        self.diagnostics['burn_in'] = self.burn_in
+        return self.burn_in
+
+    def tune(self, records=200, max_burn_in=100):
+        """
+        Choose the burn-in and thinning interval of the chain from a pilot run.
+
+        The chain is first burnt in with ``burn``. It then records its
+        statistics every tenth of a sweep ``records`` more times, and the
+        thinning interval is the smallest lag at which the autocorrelation of
+        both the overlap and the assortativity falls below ``threshold``.
+
+        The results are stored in ``burn_in``, ``thin`` and ``diagnostics``.
+
+        :param records: the number of records used to estimate the thinning
+        :type records: int
+        :param max_burn_in: the maximum burn-in, in sweeps
+        :type max_burn_in: int
+        :returns: the thinning interval
+        """
+        interval = max(1, len(self.__sources) // 10)
+        self.burn(max_burn_in)
+
+        series = {'overlap': [], 'assortativity': []}
+        for _ in range(records):
+            self.step(interval)
+            series['overlap'].append(self.overlap())
+            series['assortativity'].append(self.assortativity())
+
+        lags = [decorrelation_lag(values, self.threshold) for values in series.values()]
+        lag = records // 2 if None in lags else max(lags)
+        self.thin = max(1, lag) * interval
+        self.diagnostics = {
+            'burn_in': self.burn_in,
+            'thin': self.thin,
+            'swap_rate': self.swap_rate,
+            'overlap': float(np.mean(series['overlap'])),
+            'expected_overlap': self.expected_overlap(),
+            'assortativity': float(np.mean(series['assortativity'])),
+            'converged': None not in lags,
+        }
+        return self.thin
+
+    def current(self):
+        """
+        Get the chain's current graph.
+
+        :returns: networkx.DiGraph
+        """
+        G = nx.DiGraph()
+        G.add_nodes_from(range(self.__n))
+        G.add_edges_from(zip(self.__sources, self.__targets))
+        return G
+
+    def _randomize(self):
+        if self.thin is None:
+            self.tune()
+        elif not self.__burnt:
+            if self.burn_in is None:
+                self.burn()
+            else:
+                self.step(self.burn_in)
+                self.__burnt = True
+        self.step(self.thin)
+        return self.current()
+
+
+def _run_chain(args):
+    """
+    Run one chain in a worker process.
+    """
+    chain, n, seed = args
+    np.random.seed(seed)
+    chain.reset()
+    graphs, assortativity = [], []
+    for _ in range(n):
+        graphs.append(chain.random())
+        assortativity.append(chain.assortativity())
+    return graphs, assortativity, chain.diagnostics, chain.thin
+
+
+def run_chains(chain, n, chains=4, processes=None):
+    """
+    Draw ``n`` graphs from several independent copies of a chain, run in
+    parallel worker processes. Each copy tunes itself unless the chain's
+    ``thin`` is set.
+
+    The diagnostics of each chain are returned, along with the potential
+    scale reduction factor of the assortativity of the samples across chains
+    (``'rhat'``), which is close to 1 if the chains have mixed.
+
+    :param chain: the chain to copy
+    :type chain: EdgeSwap
+    :param n: the total number of graphs
+    :type n: int
+    :param chains: the number of chains
+    :type chains: int
+    :param processes: the number of worker processes, by default one per
+                      chain; ``0`` runs the chains in this process
+    :type processes: int or None
+    :returns: the graphs and a dict of diagnostics
+    """
+    if not isinstance(chain, EdgeSwap):
+        raise TypeError('chain must be an instance of EdgeSwap')
+    if chains < 1:
+        raise ValueError('chains must be positive')
+    sizes = [n // chains + (1 if i < n % chains else 0) for i in range(chains)]
+    seeds = np.random.randint(0, 2**31 - 1, size=chains).tolist()
+    tasks = list(zip([chain] * chains, sizes, seeds))
+
+    if processes == 0:
+        results = [_run_chain(task) for task in tasks]
+    else:
+        import multiprocessing
+        pool = multiprocessing.Pool(processes or chains)
+        try:
+            results = pool.map(_run_chain, tasks)
+        finally:
+            pool.terminate()
+
+    graphs = [graph for result in results for graph in result[0]]
+    length = min(sizes)
+    rhat = potential_scale_reduction([result[1][:length] for result in results])
+    return graphs, {'chains': [result[2] for result in results], 'rhat': rhat}
+
+
+def _is_replaceable(constraint):
+    """
+    Determine whether a constraint can follow a network through changes to
+    individual nodes' functions; see ``IncrementalConstraint.replace``.
+    """
+    return isinstance(constraint, IncrementalConstraint) and \
+        type(constraint).replace is not IncrementalConstraint.replace
+
+
+class TableSwap(LocalBias):
+    def __init__(self, network, trand=None, swaps=1, restart=False, **kwargs):
+        """
+        Generate networks with the same topology and the same bias on each
+        node as the base network with a Markov chain which swaps an active and
+        an inactive row of a node's truth table at each step. The truth tables
+        are stored in a single array which persists between samples, and a
+        step only writes the two rows it swaps. Each sample copies and
+        encodes only the truth tables of the nodes which changed since the
+        previous sample, sharing the rest with the previous network, though
+        assembling the network still takes time linear in its size.
+
+        Each call to ``random`` proposes ``swaps`` steps. If ``restart`` is
+        ``True``, each sample starts again from the base network, so that it
+        differs from the base network in at most ``2 * swaps`` rows;
+        otherwise the chain continues from the previous sample.
+
+        Steps which violate an ``IncrementalConstraint`` that implements
+        ``replace`` are rejected as they are proposed, at the cost of updating
+        the constraint with the modified node. Other constraints are tested
+        against each sample, and a rejected sample's steps are undone. Until
+        the chain first satisfies all constraints, every step is accepted.
+
+        :param network: the base network
+        :type network: neet.boolean.LogicNetwork
+        :param trand: the topology randomizer (default: FixedTopology)
+        :type trand: instance or subclass of FixedTopology, or None
+        :param swaps: the number of proposed steps per sample
+        :type swaps: int
+        :param restart: whether each sample starts from the base network
+        :type restart: bool
+        """
+        if trand is not None:
+            if isclass(trand) and not issubclass(trand, FixedTopology):
+                raise NotImplementedError(trand)
+            elif not isclass(trand) and not isinstance(trand, FixedTopology):
+                raise NotImplementedError(type(trand))
+        if swaps < 1:
+            raise ValueError('swaps must be positive')
+        super().__init__(network, trand, **kwargs)
+        self.swaps = swaps
+        self.restart = restart
+        self.reset()
+
+    def reset(self):
+        """
+        Restart the chain from the base network.
+        """
+        self.__topology = self.trand.random()
+        rows = network_tables(self.network)
+        self.__predecessors = [tuple(predecessors) for predecessors, _ in rows]
+        volumes = [len(table) for _, table in rows]
+        self.__offsets = np.concatenate([[0], np.cumsum(volumes)]).astype(int).tolist()
+
+        # The truth tables, with a view of each node's table. While any
+        # constraints are tracked, ``previous`` trails ``table`` by one swap,
+        # so that they can be given a node's old table without copying it. Each node's active
+        # rows are listed before its inactive rows in ``order``, and
+        # ``where`` is the inverse of ``order``.
+        self.__table = np.concatenate([table for _, table in rows] + [np.zeros(0, dtype=bool)])
+        self.__original = self.__table.copy()
+        self.__previous = self.__table.copy()
+        self.__views = [self.__table[a:b] for a, b in zip(self.__offsets, self.__offsets[1:])]
+        self.__previous_views = [self.__previous[a:b] for a, b in zip(self.__offsets, self.__offsets[1:])]
+        self.__active = [int(np.count_nonzero(view)) for view in self.__views]
+        self.__order, self.__where = [], []
+        for offset, view in zip(self.__offsets, self.__views):
+            order = (np.argsort(~view, kind='stable') + offset).tolist()
+            self.__order.extend(order)
+            self.__where.extend([0] * len(order))
+        for i, row in enumerate(self.__order):
+            self.__where[row] = i
+
+        self.__movable = [node for node, (predecessors, active, volume)
+                          in enumerate(zip(self.__predecessors, self.__active, volumes))
+                          if predecessors and 0 < active < volume]
+        self.__functions = [None] * len(self.__views)
+        self.__encoded = [None] * len(self.__views)
+        self.__stale = set(range(len(self.__views)))
+        self.__log = []
+        self.__feasible = False
+        self.__tracked = None
+        self.distance = 0
+        self.steps = 0
+        self.moves = 0
+
+    def _compile_constraint(self, constraint):
+        """
+        Compile a constraint for the hot loop. Constraints which the chain
+        follows step by step are elided.
+
+        :param constraint: the constraint
+        :type constraint: DynamicalConstraint
+        :returns: callable or None
+        """
+        if _is_replaceable(constraint):
+            return None
+        return AbstractRandomizer._compile_constraint(self, constraint)
+
+    def __track(self):
+        """
+        Get the constraints followed step by step, with the state of each and
+        whether it is satisfied, testing the current network against any
+        constraints which were added since the last call.
+        """
+        constraints = [c for c in self.constraints if _is_replaceable(c)]
+        tracked = self.__tracked
+        if tracked is None or len(tracked) != len(constraints) or \
+                any(entry[0] is not c for entry, c in zip(tracked, constraints)):
+            tracked = []
+            self.__previous[:] = self.__table
+            for constraint in constraints:
+                state = constraint.begin(self.__topology)
+                for node, view in enumerate(self.__views):
+                    constraint.update(state, node, self.__predecessors[node], view)
+                tracked.append([constraint, state, constraint.finish(state)])
+            self.__tracked = tracked
+        return tracked
+
+    def __swap(self, node, a, b, tracked):
+        """
+        Deactivate row ``a`` and activate row ``b`` of the packed table, where
+        ``a`` is active and ``b`` is inactive, and update the tracked
+        constraints.
+        """
+        view, old = self.__views[node], self.__previous_views[node]
+        table, order, where = self.__table, self.__order, self.__where
+        table[a], table[b] = False, True
+        i, j = where[a], where[b]
+        order[i], order[j] = b, a
+        where[a], where[b] = j, i
+        original = self.__original
+        self.distance += (1 if table[a] != original[a] else -1) + (1 if table[b] != original[b] else -1)
+        self.__stale.add(node)
+        if tracked:
+            for entry in tracked:
+                entry[2] = entry[0].replace(entry[1], node, self.__predecessors[node], old, view)
+            previous = self.__previous
+            previous[a], previous[b] = False, True
+
+    def __undo(self, log, tracked):
+        """
+        Undo logged steps, most recent first.
+        """
+        for node, a, b in reversed(log):
+            self.__swap(node, b, a, tracked)
+
+    def step(self, steps=1):
+        """
+        Propose a number of steps of the chain.
+
+        :param steps: the number of proposals
+        :type steps: int
+        :returns: the accepted ``(node, deactivated, activated)`` steps
+        """
+        log = []
+        movable = self.__movable
+        if not movable:
+            self.steps += steps
+            return log
+        tracked = self.__track()
+        offsets, order, active = self.__offsets, self.__order, self.__active
+        for node, x, y in np.random.random_sample((steps, 3)).tolist():
+            node = movable[int(node * len(movable))]
+            start, count = offsets[node], active[node]
+            volume = offsets[node + 1] - start
+            a = order[start + int(x * count)]
+            b = order[start + count + int(y * (volume - count))]
+            feasible = all(entry[2] for entry in tracked)
+            self.__swap(node, a, b, tracked)
+            if feasible and not all(entry[2] for entry in tracked):
+                self.__swap(node, b, a, tracked)
+            else:
+                log.append((node, a, b))
+        self.steps += steps
+        self.moves += len(log)
+        return log
+
+    def current(self):
+        """
+        Get the chain's current network. The truth tables and encodings of
+        nodes which have not changed since the last call are shared with the
+        previous network, so only the changed nodes are copied and encoded.
+
+        :returns: EncodedLogicNetwork
+        """
+        self.__refresh()
+        encoded = self.__encoded
+        for node, entry in enumerate(encoded):
+            if entry is None:
+                encoded[node] = encode(*self.__functions[node])
+        return EncodedLogicNetwork(self.__functions, encoded=self.__encoded)
+
+    def __refresh(self):
+        """
+        Copy the truth tables of the nodes which have changed since the last
+        copy, discarding their encodings.
+        """
+        for node in self.__stale:
+            table = self.__views[node].copy()
+            table.flags.writeable = False
+            self.__functions[node] = (self.__predecessors[node], table)
+            self.__encoded[node] = None
+        self.__stale = set()
+
+    def random(self):
+        return self.__sample(True)
+
+    def random_tables(self):
+        """
+        Advance the chain as ``random`` does, returning the topology and
+        read-only copies of the truth tables rather than a network. The network is only
+        constructed if it must be tested against a constraint.
+
+        :returns: the topology, and a list of ``(predecessors, table)`` pairs in
+                  node order
+        :raises ConstraintError: if a constraint could not be satisfied before
+                                 the randomizer's timeout.
+        """
+        self.__sample(False)
+        self.__refresh()
+        return self.__topology, list(self.__functions)
+
+    def __sample(self, construct):
+        """
+        Advance the chain until its network satisfies every constraint,
+        returning the network if ``construct`` is ``True`` or a constraint had
+        to test it, and ``None`` otherwise.
+        """
+        loop = 0
+        while self.timeout <= 0 or loop < self.timeout:
+            self.attempts += 1
+            tracked = self.__track()
+            if self.restart:
+                self.__undo(self.__log, tracked)
+                self.__log = []
+            with self._stage('randomize'):
+                log = self.step(self.swaps)
+            accepted, net = False, None
+            if all(entry[2] for entry in tracked):
+                if construct or len(self._constraint_chain().constraints) != 0:
+                    with self._stage('construct'):
+                        net = self.current()
+                    accepted = self._check_constraints(net)
+                else:
+                    accepted = True
+            if accepted:
+                self.__feasible = True
+                if self.restart:
+                    self.__log = log
+                self.accepted += 1
+                return net
+            if self.__feasible or self.restart:
+                self.__undo(log, tracked)
+            loop += 1
+        raise ConstraintError('failed to generate a network that statisfies all constraints')
@@ -0,0 +1,220 @@
+import json
+import math
+import os
+import threading
+import time
+
+try:
+    _clock = time.perf_counter_ns
+except AttributeError:  # Python < 3.7
+    def _clock():
+        return int(time.perf_counter() * 1e9)
+
+
+class Profiler(object):
+    """
+    The interface for profiling hooks. A randomizer with a profiler calls
+    ``start`` when it enters each stage of generating a network and ``stop``
+    when it leaves it. Stages nest, e.g. a ``'constraint:IsConnected'`` stage
+    within the ``'topology'`` stage. The stages are
+
+    * ``'topology'``: drawing the topology of a network
+    * ``'randomize'``: drawing an unconstrained network or graph
+    * ``'functions'``: sampling the functions of a network's nodes
+    * ``'construct'``: constructing a ``LogicNetwork`` from truth tables
+    * ``'constraint:<name>'``: testing the constraint of class ``<name>``
+
+    This base class ignores all stages.
+    """
+    def start(self, stage):
+        """
+        Called when a stage is entered.
+
+        :param stage: the name of the stage
+        :type stage: str
+        """
+        pass
+
+    def stop(self, stage):
+        """
+        Called when a stage is exited.
+
+        :param stage: the name of the stage
+        :type stage: str
+        """
+        pass
+
+
+class StageStats(object):
+    def __init__(self):
+        """
+        The number, total, extremes and distribution of the durations of a
+        stage. Durations are in nanoseconds and binned by powers of two, i.e.
+        bin :math:`i` counts durations in :math:`[2^i, 2^{i+1})`.
+        """
+        self.count = 0
+        self.total = 0
+        self.min = None
+        self.max = None
+        self.histogram = [0] * 64
+
+    def add(self, duration):
+        """
+        Add a duration.
+
+        :param duration: the duration in nanoseconds
+        :type duration: int
+        """
+        self.count += 1
+        self.total += duration
+        self.min = duration if self.min is None else min(self.min, duration)
+        self.max = duration if self.max is None else max(self.max, duration)
+        self.histogram[max(0, int(duration).bit_length() - 1)] += 1
+
+    @property
+    def mean(self):
+        """
+        The mean duration in nanoseconds.
+
+        :returns: float
+        """
+        return self.total / self.count if self.count else float('nan')
+
+    def quantile(self, q):
+        """
+        Estimate a quantile of the durations from the histogram, as the upper
+        edge of the bin containing it.
+
+        :param q: the quantile, in :math:`[0, 1]`
+        :type q: float
+        :returns: int
+        """
+        target = max(1, int(math.ceil(q * self.count)))
+        seen = 0
+        for i, count in enumerate(self.histogram):
+            seen += count
+            if seen >= target:
+                return min(2**(i + 1), self.max)
+        return self.max
+
+
+class HistogramProfiler(Profiler):
+    def __init__(self, trace=False, max_events=1000000):
+        """
+        A profiler which aggregates the durations of each stage into
+        ``StageStats``. If ``trace`` is ``True``, the first ``max_events``
+        stage executions are also recorded so that they can be exported as a
+        Chrome trace and inspected in ``chrome://tracing`` or Perfetto.
+
+        .. code-block:: python
+
+            profiler = HistogramProfiler(trace=True)
+            rand = UniformBias(myeloid, constraints=[IsIrreducible()], profiler=profiler)
+            for _ in range(100):
+                rand.random()
+            print(profiler.report())
+            profiler.write_chrome_trace('randomneet.json')
+
+        :param trace: whether to record individual stage executions
+        :type trace: bool
+        :param max_events: the maximum number of recorded executions
+        :type max_events: int
+        """
+        self.trace = trace
+        self.max_events = max_events
+        self.stats = {}
+        self.events = []
+        self.__stacks = {}
+
+    def start(self, stage):
+        self.__stacks.setdefault(threading.get_ident(), []).append((stage, _clock()))
+
+    def stop(self, stage):
+        end = _clock()
+        thread = threading.get_ident()
+        name, begin = self.__stacks[thread].pop()
+        if name != stage:
+            raise ValueError('stage {!r} stopped while {!r} is running'.format(stage, name))
+        stats = self.stats.get(stage)
+        if stats is None:
+            stats = self.stats[stage] = StageStats()
+        stats.add(end - begin)
+        if self.trace and len(self.events) < self.max_events:
+            self.events.append((stage, begin, end - begin, thread))
+
+    def clear(self):
+        """
+        Discard all statistics and recorded executions.
+        """
+        self.stats = {}
+        self.events = []
+
+    def report(self):
+        """
+        Summarize the durations of each stage as a table, in microseconds,
+        ordered by total time.
+
+        :returns: str
+        """
+        lines = ['{:<32} {:>10} {:>12} {:>10} {:>10} {:>10}'.format(
+            'stage', 'count', 'total (us)', 'mean', 'p50', 'p99')]
+        for stage, stats in sorted(self.stats.items(), key=lambda item: -item[1].total):
+            lines.append('{:<32} {:>10} {:>12.1f} {:>10.2f} {:>10.2f} {:>10.2f}'.format(
+                stage, stats.count, stats.total / 1e3, stats.mean / 1e3,
+                stats.quantile(0.5) / 1e3, stats.quantile(0.99) / 1e3))
+        return '\n'.join(lines)
+
+    def chrome_trace(self):
+        """
+        Convert the recorded executions to the Chrome trace event format.
+
+        :returns: a JSON-serializable dict
+        """
+        pid = os.getpid()
+        events = [{'name': stage, 'cat': 'randomneet', 'ph': 'X', 'ts': begin / 1e3,
+                   'dur': duration / 1e3, 'pid': pid, 'tid': thread}
+                  for stage, begin, duration, thread in self.events]
+        return {'traceEvents': events, 'displayTimeUnit': 'ms'}
+
+    def write_chrome_trace(self, path):
+        """
+        Write the recorded executions to a Chrome trace JSON file.
+
+        :param path: the path of the file
+        :type path: str
+        """
+        with open(path, 'w') as f:
+            json.dump(self.chrome_trace(), f)
+
+
+class Stage(object):
+    """
+    A context manager which reports a stage to a profiler.
+    """
+    __slots__ = ('profiler', 'name')
+
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        self.profiler.start(self.name)
+
+    def __exit__(self, *args):
+        self.profiler.stop(self.name)
+
+
+class _NullStage(object):
+    """
+    A context manager used in place of ``Stage`` when profiling is disabled.
+    """
+    __slots__ = ()
+
+    def __enter__(self):
+        pass
+
+    def __exit__(self, *args):
+        pass
+
+
+NULL_STAGE = _NullStage()
@@ -1,11 +1,63 @@
-import neet
+import math
 import networkx as nx
 from abc import ABCMeta, abstractmethod
-from .constraints import AbstractConstraint, ConstraintError
+from collections import namedtuple
+from .constraints import AbstractConstraint, ConstraintError, ConstraintSet
+from .ensemble import Ensemble
+from .profiling import Profiler, Stage, NULL_STAGE
+from ._neet import is_network
+
+#: the result of ``AbstractRandomizer.estimate_acceptance``
+Acceptance = namedtuple('Acceptance', ['rate', 'trials', 'timeout'])
+
+
+class ConstraintChain(object):
+    def __init__(self, constraints, compiler):
+        """
+        The constraints of a randomizer compiled for rejection testing: a
+        sequence of ``(stage name, test)`` pairs, omitting elided constraints.
+
+        The first network tested by a randomizer after compiling its chain is
+        tested via each constraint's ``satisfies``, which validates its type;
+        ``validated`` records whether this has happened. Later networks are
+        tested with the compiled fast paths.
+
+        :param constraints: the randomizer's constraints
+        :type constraints: ConstraintSet
+        :param compiler: compiles a constraint, returning ``None`` to elide it
+        :type compiler: callable
+        """
+        self.snapshot = constraints
+        self.validated = False
+        compiled = [(constraint, compiler(constraint)) for constraint in constraints]
+        self.constraints = tuple(constraint for constraint, test in compiled if test is not None)
+        self.tests = tuple(('constraint:' + type(constraint).__name__, test)
+                           for constraint, test in compiled if test is not None)
+
+    def matches(self, constraints):
+        """
+        Determine whether the chain was compiled from the given constraints.
+        As constraint sets are immutable, this is an identity test.
+
+        :param constraints: a randomizer's current constraints
+        :type constraints: ConstraintSet
+        :returns: bool
+        """
+        return constraints is self.snapshot
+
+    def __len__(self):
+        return len(self.tests)
+
+    def __iter__(self):
+        return iter(self.tests)
 
 
 class AbstractRandomizer(object, metaclass=ABCMeta):
-    def __init__(self, network, constraints=None, timeout=1000, **kwargs):
+    #: the graph properties shared by every graph the randomizer generates
+    #: and its base graph; see ``AbstractConstraint.invariant``
+    preserves = frozenset()
+
+    def __init__(self, network, constraints=None, timeout=1000, profiler=None, **kwargs):
         """
         An abstract interface for all randomizers based on randomly modifying a
         base network or graph. Rejection testing is used to enforce
@@ -22,17 +74,24 @@ class AbstractRandomizer(object, metaclass=ABCMeta):
         :param timeout: the number of attempts before rejection testing times
                         out. If less than 1, the rejection testing will never
                         time out.
+        :param profiler: hooks called as each stage of generation starts and
+                         stops
+        :type profiler: Profiler or None
         """
-        if isinstance(network, neet.Network):
+        if is_network(network):
             self.network = network
         elif isinstance(network, nx.DiGraph):
             self.__network = None
             self.__graph = network
+            self.__chain = None
         else:
             raise TypeError('network must be a neet.Network or a networkx.DiGraph')
 
         self.timeout = timeout
         self.constraints = constraints
+        self.profiler = profiler
+        self.attempts = 0
+        self.accepted = 0
 
     @property
     def network(self):
@@ -53,10 +112,11 @@ class AbstractRandomizer(object, metaclass=ABCMeta):
         :type network: neet.Network
         :raises TypeError: if the argument is not a neet.Network
         """
-        if not isinstance(network, neet.Network):
+        if not is_network(network):
             raise TypeError('network must be an instance of neet.Network')
         self.__network = network
         self.__graph = self.__network.network_graph()
+        self.__chain = None
 
     @property
     def graph(self):
@@ -80,13 +140,47 @@ class AbstractRandomizer(object, metaclass=ABCMeta):
             raise TypeError('graph must be an instance of networkx.DiGraph')
         self.__network = None
         self.__graph = graph
+        self.__chain = None
+
+    @property
+    def profiler(self):
+        """
+        Get the randomizer's profiler.
+
+        :returns: Profiler or None
+        """
+        return self.__profiler
+
+    @profiler.setter
+    def profiler(self, profiler):
+        """
+        Set the randomizer's profiler, or disable profiling with ``None``.
+
+        :param profiler: the new profiler
+        :type profiler: Profiler or None
+        :raises TypeError: if the argument is neither a Profiler nor None
+        """
+        if profiler is not None and not isinstance(profiler, Profiler):
+            raise TypeError('profiler must be an instance of Profiler')
+        self.__profiler = profiler
+
+    def _stage(self, name):
+        """
+        Get a context manager reporting a stage to the randomizer's profiler.
+
+        :param name: the name of the stage
+        :type name: str
+        """
+        if self.__profiler is None:
+            return NULL_STAGE
+        return Stage(self.__profiler, name)
 
     @property
     def constraints(self):
         """
         Get the randomizer's constraints.
 
-        :returns: a list of AbstractConstraint instances
+        :returns: a ConstraintSet
         """
         return self.__constraints
 
@@ -98,17 +192,13 @@ class AbstractRandomizer(object, metaclass=ABCMeta):
         :param constraints: the new constraints
         :type constraints: a seq of AbstractConstraint instances
         :raises TypeError: if any of the contraints are not an AbstractConstraint
+        :raises ConstraintError: if a constraint can never be satisfied; see
+                                 ``check_feasible``
         """
-        if constraints is None:
-            constraints = []
-        elif not isinstance(constraints, list):
-            constraints = list(constraints)
-
-        for i, constraint in enumerate(constraints):
-            if not isinstance(constraint, AbstractConstraint):
-                raise TypeError('constraints must be instances of AbstractConstraint')
-
+        constraints = ConstraintSet(constraints)
+        self.check_feasible(constraints)
         self.__constraints = constraints
+        self.__chain = None
 
     def add_constraint(self, constraint):
         """
@@ -120,7 +210,95 @@ class AbstractRandomizer(object, metaclass=ABCMeta):
         """
         if not isinstance(constraint, AbstractConstraint):
             raise TypeError('constraints must be instances of AbstractConstraint')
-        self.__constraints.append(constraint)
+        self.check_feasible([constraint])
+        self.__constraints = self.__constraints & constraint
+        self.__chain = None
+
+    def _feasibility_basis(self):
+        """
+        Get the base graph and preserved graph properties against which the
+        feasibility of the randomizer's constraints is checked.
+
+        :returns: a ``(graph, preserves)`` pair
+        """
+        return self.graph, self.preserves
+
+    def check_feasible(self, constraints):
+        """
+        Statically check that constraints could be satisfied by the
+        randomizer, comparing the base graph, e.g. its degree sequences,
+        against each constraint; see ``AbstractConstraint.is_feasible``. This
+        is done whenever constraints are set or added, so that an infeasible
+        configuration fails immediately rather than after ``timeout`` wasted
+        attempts.
+
+        :param constraints: the constraints
+        :type constraints: a sequence of AbstractConstraint instances
+        :raises ConstraintError: if a constraint can never be satisfied
+        """
+        graph, preserves = self._feasibility_basis()
+        for constraint in constraints:
+            if not constraint.is_feasible(graph, preserves):
+                msg = 'the constraint {} can never be satisfied by this randomizer'
+                raise ConstraintError(msg.format(type(constraint).__name__))
+
+    def _nested(self):
+        """
+        Generate the randomizer and the randomizers it draws from.
+        """
+        randomizer = self
+        while isinstance(randomizer, AbstractRandomizer):
+            yield randomizer
+            randomizer = getattr(randomizer, 'trand', None)
+
+    def estimate_acceptance(self, trials=100, failure=1e-3):
+        """
+        Estimate the probability that a single attempt satisfies all of the
+        randomizer's constraints from a pilot run of ``trials`` attempts, and
+        recommend a ``timeout`` for which ``random`` fails with probability
+        at most ``failure``.
+
+        The attempts of the pilot run are not counted in ``attempts`` or
+        ``accepted``, but otherwise have the side effects of drawing networks:
+        Markov chains are advanced, and ``NonIsomorphic`` remembers the graphs
+        it accepts.
+
+        :param trials: the number of attempts in the pilot run
+        :type trials: int
+        :param failure: the acceptable probability of a timeout
+        :type failure: float
+        :returns: an ``Acceptance`` of the estimated rate, the number of
+                  trials, and the recommended timeout, which is ``None`` if
+                  no attempt was accepted
+        """
+        if trials < 1:
+            raise ValueError('trials must be positive')
+        if not 0 < failure < 1:
+            raise ValueError('failure must be between 0 and 1')
+        nested = list(self._nested())
+        saved = [(r.timeout, r.attempts, r.accepted) for r in nested]
+        accepted = 0
+        try:
+            for randomizer in nested:
+                randomizer.timeout = 1
+            for _ in range(trials):
+                try:
+                    self.random()
+                    accepted += 1
+                except ConstraintError:
+                    pass
+        finally:
+            for randomizer, (timeout, attempts, count) in zip(nested, saved):
+                randomizer.timeout, randomizer.attempts, randomizer.accepted = timeout, attempts, count
+
+        rate = accepted / trials
+        if rate == 0:
+            timeout = None
+        elif rate == 1:
+            timeout = 1
+        else:
+            timeout = max(1, int(math.ceil(math.log(failure) / math.log1p(-rate))))
+        return Acceptance(rate, trials, timeout)
 
     def _check_constraints(self, net):
         """
@@ -130,11 +308,58 @@ class AbstractRandomizer(object, metaclass=ABCMeta):
         :type net: neet.Network or networkx.DiGraph
         :returns: ``True`` if the network/graph satisfies all constraints
         """
-        for constraint in self.constraints:
-            if not constraint.satisfies(net):
-                return False
+        chain = self._constraint_chain()
+        if not chain.validated:
+            chain.validated = True
+            return self._check_constraints_slowly(chain.constraints, net)
+        for name, test in chain:
+            with self._stage(name):
+                if not test(net):
+                    return False
         return True
 
+    def _check_constraints_slowly(self, constraints, net):
+        """
+        Check a network or graph against constraints via ``satisfies``,
+        including its type checks.
+        """
+        for constraint in constraints:
+            with self._stage('constraint:' + type(constraint).__name__):
+                if not constraint.satisfies(net):
+                    return False
+        return True
+
+    def _constraint_chain(self):
+        """
+        Get the compiled chain of constraints tested by ``_check_constraints``,
+        recompiling it if the constraints, network or graph have changed.
+
+        :returns: ConstraintChain
+        """
+        chain = self.__chain
+        if chain is None or not chain.matches(self.constraints):
+            chain = self.__chain = ConstraintChain(self.constraints, self._compile_constraint)
+        return chain
+
+    def _compile_constraint(self, constraint):
+        """
+        Compile a constraint for the hot loop.
+
+        A constraint is elided, i.e. ``None`` is returned, if it is statically
+        proven: its ``invariant`` is preserved by the randomizer and its base
+        graph satisfies it. Otherwise the constraint's fast path is returned;
+        see ``AbstractConstraint.compile``.
+
+        :param constraint: the constraint
+        :type constraint: AbstractConstraint
+        :returns: callable or None
+        """
+        invariant = constraint.invariant
+        if invariant is not None and invariant in self.preserves:
+            if constraint.satisfies(self.graph):
+                return None
+        return constraint.compile()
+
     def __iter__(self):
         """
         Generate an infinite sequence of random networks or graphs.
@@ -142,6 +367,30 @@ class AbstractRandomizer(object, metaclass=ABCMeta):
         while True:
             yield self.random()
 
+    @property
+    def acceptance_rate(self):
+        """
+        Get the fraction of candidate networks or graphs which satisfied the
+        randomizer's constraints.
+
+        :returns: float, or ``None`` if no candidates have been generated
+        """
+        return self.accepted / self.attempts if self.attempts else None
+
+    def ensemble(self, size=None, unique=False, **kwargs):
+        """
+        Create an ensemble of random networks or graphs. If ``unique`` is
+        ``True``, duplicate networks are skipped; see ``Ensemble`` for
+        details.
+
+        :param size: the number of networks, or ``None`` for an infinite ensemble
+        :type size: int or None
+        :param unique: whether to skip duplicate networks
+        :type unique: bool
+        :returns: an iterable Ensemble
+        """
+        return Ensemble(self, size=size, unique=unique, **kwargs)
+
     def random(self):
         """
         Create a random network variant.
@@ -152,8 +401,11 @@ class AbstractRandomizer(object, metaclass=ABCMeta):
         """
         loop = 0
         while self.timeout <= 0 or loop < self.timeout:
-            net = self._randomize()
+            self.attempts += 1
+            with self._stage('randomize'):
+                net = self._randomize()
             if self._check_constraints(net):
+                self.accepted += 1
                 return net
             loop += 1
         raise ConstraintError('failed to generate a network that statisfies all constraints')
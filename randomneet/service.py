@@ -0,0 +1,187 @@
+import asyncio
+import copy
+import numpy as np
+
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from .randomizer import AbstractRandomizer
+
+_RANDOMIZER = None
+
+
+def _initialize_worker(randomizer, reseed=True):
+    """
+    Store a randomizer in a worker process and reseed the process's random
+    number generator so that workers do not produce identical streams.
+    """
+    global _RANDOMIZER
+    _RANDOMIZER = randomizer
+    if reseed:
+        np.random.seed()
+
+
+def _worker_random():
+    """
+    Draw a network from the worker process's randomizer.
+    """
+    return _RANDOMIZER.random()
+
+
+class _Failure(object):
+    """
+    An exception raised by a producer, to be re-raised by the consumer.
+    """
+    def __init__(self, error):
+        self.error = error
+
+
+class AsyncRandomizer(object):
+    def __init__(self, randomizer, maxsize=16, workers=1, processes=False):
+        """
+        Generate networks from a randomizer in the background for consumption
+        by an ``asyncio`` event loop.
+
+        Networks are generated by ``workers`` producers, running either in a
+        thread pool or a process pool, and placed on a queue holding at most
+        ``maxsize`` networks. Producers block when the queue is full, so at
+        most ``maxsize + workers`` networks are generated ahead of the
+        consumer. Process workers receive a copy of the randomizer when they
+        start (which requires Python 3.7 or later) and are reseeded so their
+        streams are independent. As randomizers are not thread-safe, each of
+        several thread workers draws from its own deep copy of the
+        randomizer; a single thread worker uses the randomizer itself.
+
+        If the randomizer raises an exception, e.g. a ``ConstraintError``, it
+        is re-raised by the consumer in place of the next network, and by
+        every later request until the service is closed.
+
+        .. code-block:: python
+
+            async with AsyncRandomizer(UniformBias(s_pombe), workers=4) as rand:
+                net = await rand.next_network()
+                async for net in rand:
+                    ...
+
+        :param randomizer: the randomizer
+        :type randomizer: AbstractRandomizer
+        :param maxsize: the maximum number of prefetched networks
+        :type maxsize: int
+        :param workers: the number of producers
+        :type workers: int
+        :param processes: use processes rather than threads
+        :type processes: bool
+        """
+        if not isinstance(randomizer, AbstractRandomizer):
+            raise TypeError('randomizer must be an instance of AbstractRandomizer')
+        if maxsize < 1:
+            raise ValueError('maxsize must be positive')
+        if workers < 1:
+            raise ValueError('workers must be positive')
+        self.randomizer = randomizer
+        self.maxsize = maxsize
+        self.workers = workers
+        self.processes = processes
+        self.__queue = None
+        self.__executor = None
+        self.__tasks = []
+        self.__failure = None
+
+    @property
+    def started(self):
+        """
+        Whether the producers have been started.
+
+        :returns: bool
+        """
+        return self.__queue is not None
+
+    def qsize(self):
+        """
+        Get the number of networks ready to be consumed.
+
+        :returns: int
+        """
+        return 0 if self.__queue is None else self.__queue.qsize()
+
+    async def start(self):
+        """
+        Start the background producers. This is called automatically by the
+        first request for a network.
+        """
+        if self.started:
+            return
+        loop = asyncio.get_event_loop()
+        self.__queue = asyncio.Queue(self.maxsize)
+        if self.processes:
+            self.__executor = ProcessPoolExecutor(self.workers,
+                                                  initializer=_initialize_worker,
+                                                  initargs=(self.randomizer,))
+            draws = [_worker_random] * self.workers
+        else:
+            self.__executor = ThreadPoolExecutor(self.workers)
+            if self.workers == 1:
+                draws = [self.randomizer.random]
+            else:
+                draws = [copy.deepcopy(self.randomizer).random for _ in range(self.workers)]
+        self.__tasks = [loop.create_task(self.__produce(loop, draw)) for draw in draws]
+
+    async def __produce(self, loop, draw):
+        """
+        Repeatedly generate networks and place them on the queue.
+        """
+        while True:
+            try:
+                net = await loop.run_in_executor(self.__executor, draw)
+            except asyncio.CancelledError:
+                raise
+            except Exception as err:
+                await self.__queue.put(_Failure(err))
+                return
+            await self.__queue.put(net)
+
+    async def next_network(self):
+        """
+        Get the next network, waiting for one to be generated if necessary.
+
+        :returns: a random network or graph
+        :raises Exception: the exception raised by the randomizer, if any
+        """
+        if self.__failure is not None:
+            raise self.__failure
+        if not self.started:
+            await self.start()
+        item = await self.__queue.get()
+        if isinstance(item, _Failure):
+            self.__failure = item.error
+            raise item.error
+        return item
+
+    async def close(self):
+        """
+        Stop the producers and release the worker pool.
+        """
+        for task in self.__tasks:
+            task.cancel()
+        for task in self.__tasks:
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        if self.__executor is not None:
+            self.__executor.shutdown(wait=False)
+        self.__tasks = []
+        self.__executor = None
+        self.__queue = None
+        self.__failure = None
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        return await self.next_network()
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, *args):
+        await self.close()
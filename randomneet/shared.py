@@ -0,0 +1,232 @@
+import numpy as np
+import sys
+
+from .tables import network_tables
+from ._neet import is_logic_network
+
+try:
+    from multiprocessing import shared_memory
+except ImportError:  # Python < 3.8
+    shared_memory = None
+
+FIELDS = ('indptr', 'indices', 'table_offsets', 'tables')
+
+
+class SharedNetworkHandle(object):
+    def __init__(self, name, kind, layout, names=None):
+        """
+        A small, picklable description of a ``SharedNetwork`` which can be sent
+        to worker processes so that they may attach to the shared memory.
+
+        :param name: the name of the shared memory block
+        :type name: str
+        :param kind: ``'logic'`` or ``'graph'``
+        :type kind: str
+        :param layout: the ``(field, dtype, offset, count)`` of each array
+        :type layout: tuple
+        :param names: the names of the network's nodes
+        :type names: list or None
+        """
+        self.name = name
+        self.kind = kind
+        self.layout = layout
+        self.names = names
+
+    def __getstate__(self):
+        return (self.name, self.kind, self.layout, self.names)
+
+    def __setstate__(self, state):
+        self.name, self.kind, self.layout, self.names = state
+
+
+class SharedNetwork(object):
+    def __init__(self, block, handle, owner=False):
+        """
+        A base network or graph stored in a ``multiprocessing.shared_memory``
+        block. Use ``SharedNetwork.create`` to export a network and
+        ``SharedNetwork.attach`` to access it from another process.
+
+        The topology is stored in compressed sparse row form: the predecessors
+        of node ``i`` are ``indices[indptr[i]:indptr[i+1]]``, in the order used
+        by the node's truth table. The bit-packed truth table of node ``i`` is
+        ``tables[table_offsets[i]:table_offsets[i+1]]``. These arrays are
+        zero-copy views of the shared memory.
+
+        Pickling a SharedNetwork only pickles its handle, so it can be passed
+        cheaply to worker processes, where it is reattached.
+
+        :param block: the shared memory block
+        :type block: multiprocessing.shared_memory.SharedMemory
+        :param handle: the description of the block's contents
+        :type handle: SharedNetworkHandle
+        :param owner: whether this object created (and should unlink) the block
+        :type owner: bool
+        """
+        self.block = block
+        self.handle = handle
+        self.owner = owner
+        for field, dtype, offset, count in handle.layout:
+            setattr(self, field, np.ndarray((count,), dtype=dtype, buffer=block.buf, offset=offset))
+
+    @classmethod
+    def create(cls, network):
+        """
+        Export a logic network, or a graph whose nodes are ``0, ..., n-1``, to
+        a new shared memory block.
+
+        :param network: the network or graph
+        :type network: neet.boolean.LogicNetwork or networkx.DiGraph
+        :returns: the owning SharedNetwork
+        :raises NotImplementedError: if shared memory is unavailable
+        :raises TypeError: if the network is neither a logic network nor a graph
+        """
+        if shared_memory is None:
+            raise NotImplementedError('shared memory requires Python 3.8 or later')
+
+        if is_logic_network(network):
+            kind, names = 'logic', network.names
+            rows = network_tables(network)
+        elif hasattr(network, 'predecessors'):
+            kind, names = 'graph', None
+            if sorted(network.nodes) != list(range(len(network))):
+                raise ValueError('graph nodes must be labeled 0, ..., n-1')
+            rows = [(tuple(network.predecessors(node)), np.zeros(0, dtype=bool))
+                    for node in range(len(network))]
+        else:
+            raise TypeError('network must be a neet.boolean.LogicNetwork or a networkx.DiGraph')
+
+        packed = [np.packbits(table) for _, table in rows]
+        arrays = {
+            'indptr': np.cumsum([0] + [len(p) for p, _ in rows], dtype=np.int64),
+            'indices': np.array([i for p, _ in rows for i in p], dtype=np.int64),
+            'table_offsets': np.cumsum([0] + [len(t) for t in packed], dtype=np.int64),
+            'tables': np.concatenate(packed + [np.zeros(0, dtype=np.uint8)]).astype(np.uint8),
+        }
+
+        layout, offset = [], 0
+        for field in FIELDS:
+            array = arrays[field]
+            offset = -(-offset // array.itemsize) * array.itemsize
+            layout.append((field, array.dtype.str, offset, len(array)))
+            offset += array.nbytes
+
+        block = shared_memory.SharedMemory(create=True, size=max(offset, 1))
+        handle = SharedNetworkHandle(block.name, kind, tuple(layout), names)
+        shared = cls(block, handle, owner=True)
+        for field in FIELDS:
+            getattr(shared, field)[:] = arrays[field]
+        return shared
+
+    @classmethod
+    def attach(cls, handle):
+        """
+        Attach to a network previously exported with ``create``.
+
+        :param handle: the handle of the exported network
+        :type handle: SharedNetworkHandle
+        :returns: a SharedNetwork
+        :raises NotImplementedError: if shared memory is unavailable
+        """
+        if shared_memory is None:
+            raise NotImplementedError('shared memory requires Python 3.8 or later')
+        if sys.version_info >= (3, 13):
+            # Only the creator should unlink the block
+            block = shared_memory.SharedMemory(name=handle.name, track=False)
+        else:
+            block = shared_memory.SharedMemory(name=handle.name)
+        return cls(block, handle)
+
+    def __reduce__(self):
+        return (self.attach, (self.handle,))
+
+    @property
+    def size(self):
+        """
+        Get the number of nodes.
+
+        :returns: int
+        """
+        return len(self.indptr) - 1
+
+    def predecessors(self, node):
+        """
+        Get the predecessors of a node as a view of the shared memory.
+
+        :param node: the node
+        :type node: int
+        :returns: numpy.ndarray of int
+        """
+        return self.indices[self.indptr[node]:self.indptr[node + 1]]
+
+    def table(self, node):
+        """
+        Get the truth table of a node.
+
+        :param node: the node
+        :type node: int
+        :returns: numpy.ndarray of bool
+        """
+        packed = self.tables[self.table_offsets[node]:self.table_offsets[node + 1]]
+        k = self.indptr[node + 1] - self.indptr[node]
+        return np.unpackbits(packed)[:2**k].astype(bool)
+
+    def graph(self):
+        """
+        Reconstruct the network's graph.
+
+        :returns: networkx.DiGraph
+        """
+        import networkx as nx
+
+        graph = nx.DiGraph()
+        graph.add_nodes_from(range(self.size))
+        for node in range(self.size):
+            graph.add_edges_from((int(i), node) for i in self.predecessors(node))
+        return graph
+
+    def network(self):
+        """
+        Reconstruct the logic network, or the graph if a graph was exported.
+        The network is encoded directly from the shared truth tables, as the
+        randomizers build their networks, rather than from condition strings.
+
+        :returns: EncodedLogicNetwork or networkx.DiGraph
+        """
+        if self.handle.kind == 'graph':
+            return self.graph()
+
+        from .encoded import EncodedLogicNetwork
+        indptr, indices = self.indptr.tolist(), self.indices.tolist()
+        offsets, tables = self.table_offsets.tolist(), np.unpackbits(self.tables).astype(bool)
+        functions = [(tuple(indices[indptr[node]:indptr[node + 1]]),
+                      tables[8 * offsets[node]:8 * offsets[node] + 2**(indptr[node + 1] - indptr[node])])
+                     for node in range(self.size)]
+        return EncodedLogicNetwork(functions, names=self.handle.names)
+
+    def randomizer(self, cls, *args, **kwargs):
+        """
+        Construct a randomizer from the shared network.
+
+        :param cls: the randomizer class
+        :type cls: a subclass of AbstractRandomizer
+        :returns: an instance of ``cls``
+        """
+        return cls(self.network(), *args, **kwargs)
+
+    def close(self):
+        """
+        Detach from the shared memory, unlinking it if this object created it.
+        """
+        for field in FIELDS:
+            if hasattr(self, field):
+                delattr(self, field)
+        self.block.close()
+        if self.owner:
+            self.block.unlink()
+            self.owner = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
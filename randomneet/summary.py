@@ -0,0 +1,304 @@
+import math
+import numpy as np
+
+from .tables import network_tables, is_canalizing, sensitivity
+from ._neet import is_logic_network
+
+
+class Moments(object):
+    def __init__(self):
+        """
+        A streaming accumulator of the count, mean and variance of a sequence
+        of values. Batches of values are combined with Chan et al.'s parallel
+        update, so accumulators from different workers can be merged exactly.
+        """
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+
+    def __combine(self, count, mean, m2):
+        """
+        Combine the moments of another sample into this accumulator.
+        """
+        if count == 0:
+            return
+        total = self.count + count
+        delta = mean - self.mean
+        self.mean += delta * count / total
+        self.m2 += m2 + delta**2 * self.count * count / total
+        self.count = total
+
+    def update(self, values):
+        """
+        Add a value, or an array of values, to the accumulator.
+
+        :param values: the values
+        :type values: float or numpy.ndarray
+        """
+        values = np.asarray(values, dtype=float).ravel()
+        if len(values) != 0:
+            mean = np.mean(values)
+            self.__combine(len(values), mean, float(np.sum((values - mean)**2)))
+
+    def merge(self, other):
+        """
+        Merge another accumulator into this one.
+
+        :param other: the other accumulator
+        :type other: Moments
+        :returns: this accumulator
+        """
+        self.__combine(other.count, other.mean, other.m2)
+        return self
+
+    @property
+    def variance(self):
+        """
+        The unbiased sample variance, or ``nan`` if fewer than two values have
+        been added.
+
+        :returns: float
+        """
+        return self.m2 / (self.count - 1) if self.count > 1 else float('nan')
+
+    @property
+    def std(self):
+        """
+        The sample standard deviation.
+
+        :returns: float
+        """
+        return math.sqrt(self.variance)
+
+
+class Histogram(object):
+    def __init__(self, width=1.0):
+        """
+        A streaming histogram of non-negative values with bins of a fixed
+        width, ``[i * width, (i + 1) * width)``. The bins grow as needed, so the
+        range of the values need not be known in advance.
+
+        :param width: the width of each bin
+        :type width: float
+        """
+        if width <= 0:
+            raise ValueError('width must be positive')
+        self.width = width
+        self.counts = np.zeros(0, dtype=np.int64)
+
+    def update(self, values):
+        """
+        Add a value, or an array of values, to the histogram.
+
+        :param values: the values
+        :type values: float or numpy.ndarray
+        :raises ValueError: if any value is negative
+        """
+        values = np.asarray(values, dtype=float).ravel()
+        if len(values) == 0:
+            return
+        if np.any(values < 0):
+            raise ValueError('histogram values must be non-negative')
+        # Guard against values such as 0.3 / 0.1 landing just below a bin edge
+        bins = np.floor(values / self.width + 1e-9).astype(np.int64)
+        self.__add(np.bincount(bins))
+
+    def __add(self, counts):
+        """
+        Add bin counts to the histogram, growing it if necessary.
+        """
+        if len(counts) > len(self.counts):
+            self.counts = np.pad(self.counts, (0, len(counts) - len(self.counts)), 'constant')
+        self.counts[:len(counts)] += counts
+
+    def merge(self, other):
+        """
+        Merge another histogram with the same bin width into this one.
+
+        :param other: the other histogram
+        :type other: Histogram
+        :returns: this histogram
+        :raises ValueError: if the bin widths differ
+        """
+        if other.width != self.width:
+            raise ValueError('cannot merge histograms with different bin widths')
+        self.__add(other.counts)
+        return self
+
+    @property
+    def edges(self):
+        """
+        The edges of the bins, one more than the number of bins.
+
+        :returns: numpy.ndarray
+        """
+        return np.arange(len(self.counts) + 1) * self.width
+
+
+class Statistic(object):
+    def __init__(self, width=1.0):
+        """
+        The moments and histogram of a single statistic.
+
+        :param width: the histogram bin width
+        :type width: float
+        """
+        self.moments = Moments()
+        self.histogram = Histogram(width)
+
+    def update(self, values):
+        """
+        Add a value, or an array of values.
+        """
+        self.moments.update(values)
+        self.histogram.update(values)
+
+    def merge(self, other):
+        """
+        Merge another statistic into this one.
+
+        :param other: the other statistic
+        :type other: Statistic
+        :returns: this statistic
+        """
+        self.moments.merge(other.moments)
+        self.histogram.merge(other.histogram)
+        return self
+
+
+class Summary(object):
+    #: The statistics accumulated and their histogram bin widths. Per-node
+    #: statistics accumulate one value per node of each network.
+    STATISTICS = {
+        'bias': 0.05,
+        'canalizing': 1,
+        'in_degree': 1,
+        'out_degree': 1,
+        'sensitivity': 0.05,
+    }
+
+    def __init__(self):
+        """
+        Accumulate summary distributions of a stream of networks without
+        retaining the networks.
+
+        For each network the following statistics are accumulated:
+
+        * ``bias``: the bias of each node's function (per node)
+        * ``canalizing``: the number of canalizing nodes (per network)
+        * ``in_degree`` and ``out_degree``: the degree of each node (per node)
+        * ``sensitivity``: the average sensitivity of the network (per network)
+
+        Graphs, e.g. from topology randomizers, contribute only to the degree
+        statistics. Summaries are picklable and can be merged, so workers may
+        summarize disjoint parts of an ensemble in parallel; see ``summarize``.
+
+        .. code-block:: python
+
+            summary = Summary().consume(UniformBias(myeloid), 1000)
+            summary['sensitivity'].moments.mean
+        """
+        self.count = 0
+        self.statistics = dict((name, Statistic(width)) for name, width in self.STATISTICS.items())
+
+    def __getitem__(self, name):
+        return self.statistics[name]
+
+    def update(self, net):
+        """
+        Add a network or graph to the summary.
+
+        :param net: the network or graph
+        :type net: neet.boolean.LogicNetwork or networkx.DiGraph
+        """
+        if is_logic_network(net):
+            rows = network_tables(net)
+            size = net.size
+            predecessors = [p for p, _ in rows]
+            tables = [t for _, t in rows]
+            self['bias'].update([np.mean(t) for t in tables])
+            self['canalizing'].update(sum(is_canalizing(t) for t in tables))
+            self['sensitivity'].update(np.mean([sensitivity(t) for t in tables]) if size else 0.0)
+        else:
+            size = len(net)
+            predecessors = [tuple(net.predecessors(node)) for node in range(size)]
+
+        sources = np.fromiter((i for p in predecessors for i in p), dtype=np.int64)
+        self['in_degree'].update([len(p) for p in predecessors])
+        self['out_degree'].update(np.bincount(sources, minlength=size))
+        self.count += 1
+
+    def consume(self, source, n=None):
+        """
+        Add networks from a randomizer or an iterable to the summary.
+
+        :param source: a randomizer, or an iterable of networks
+        :param n: the number of networks to draw from a randomizer, or the
+                  maximum number to take from an iterable
+        :type n: int or None
+        :returns: this summary
+        """
+        if hasattr(source, 'random'):
+            if n is None:
+                raise ValueError('n is required when consuming from a randomizer')
+            for _ in range(n):
+                self.update(source.random())
+        else:
+            for i, net in enumerate(source):
+                if n is not None and i >= n:
+                    break
+                self.update(net)
+        return self
+
+    def merge(self, other):
+        """
+        Merge another summary into this one.
+
+        :param other: the other summary
+        :type other: Summary
+        :returns: this summary
+        """
+        self.count += other.count
+        for name, statistic in other.statistics.items():
+            self.statistics[name].merge(statistic)
+        return self
+
+
+def _summarize(n):
+    """
+    Summarize ``n`` networks drawn from a worker process's randomizer.
+    """
+    from . import service
+    return Summary().consume(service._RANDOMIZER, n)
+
+
+def summarize(randomizer, n, processes=1):
+    """
+    Summarize ``n`` networks drawn from a randomizer, optionally splitting the
+    work across worker processes whose summaries are merged.
+
+    :param randomizer: the randomizer
+    :type randomizer: AbstractRandomizer
+    :param n: the number of networks
+    :type n: int
+    :param processes: the number of worker processes
+    :type processes: int
+    :returns: Summary
+    """
+    if processes <= 1:
+        return Summary().consume(randomizer, n)
+
+    import multiprocessing
+    from .service import _initialize_worker
+
+    chunks = [n // processes + (1 if i < n % processes else 0) for i in range(processes)]
+    pool = multiprocessing.Pool(processes, _initialize_worker, (randomizer,))
+    try:
+        summaries = pool.map(_summarize, chunks)
+    finally:
+        pool.terminate()
+
+    summary = Summary()
+    for part in summaries:
+        summary.merge(part)
+    return summary
@@ -0,0 +1,144 @@
+import numpy as np
+
+
+def truth_table(conditions, k):
+    """
+    Convert a set of activating conditions, as stored in the rows of a
+    ``neet.boolean.LogicNetwork`` table, into a dense truth table.
+
+    The truth table is a boolean array of length :math:`2^k`. The entry at
+    index :math:`i` is ``True`` if the binary representation of :math:`i`
+    (most significant bit first) activates the node, i.e. the first bit is
+    the state of the first predecessor, and so on.
+
+    :param conditions: the activating conditions
+    :type conditions: a collection of str
+    :param k: the number of inputs to the function
+    :type k: int
+    :returns: numpy.ndarray of bool
+    """
+    table = np.zeros(2**k, dtype=bool)
+    for condition in conditions:
+        table[int(condition, 2) if condition else 0] = True
+    return table
+
+
+def conditions(table):
+    """
+    Convert a dense truth table into a set of activating conditions suitable
+    for constructing a ``neet.boolean.LogicNetwork``.
+
+    :param table: the truth table
+    :type table: numpy.ndarray of bool
+    :returns: a set of str
+    """
+    k = int(len(table)).bit_length() - 1
+    return set('{0:0{1}b}'.format(index, k) for index in np.flatnonzero(table))
+
+
+def _halves(table, k, i):
+    """
+    Split a truth table into the halves for which input ``i`` is off and on.
+    """
+    cube = np.reshape(table, (2,) * k)
+    return np.take(cube, 0, axis=i), np.take(cube, 1, axis=i)
+
+
+def dependencies(table):
+    """
+    Determine which inputs of a truth table the function logically depends
+    on.
+
+    :param table: the truth table
+    :type table: numpy.ndarray of bool
+    :returns: a list of bool, one for each input
+    """
+    k = int(len(table)).bit_length() - 1
+    dependent = []
+    for i in range(k):
+        off, on = _halves(table, k, i)
+        dependent.append(bool(np.any(off != on)))
+    return dependent
+
+
+def is_irreducible(table):
+    """
+    Determine whether a function logically depends on each of its inputs.
+
+    :param table: the truth table
+    :type table: numpy.ndarray of bool
+    :returns: ``True`` if the function depends on every input
+    """
+    return all(dependencies(table))
+
+
+def is_canalizing(table):
+    """
+    Determine whether a function is canalizing, i.e. whether there is at least
+    one input which fixes the output of the function when it takes one
+    particular value. A function with no inputs is not canalizing.
+
+    :param table: the truth table
+    :type table: numpy.ndarray of bool
+    :returns: ``True`` if the function is canalizing on at least one input
+    """
+    k = int(len(table)).bit_length() - 1
+    for i in range(k):
+        for half in _halves(table, k, i):
+            if np.all(half) or not np.any(half):
+                return True
+    return False
+
+
+def network_tables(network):
+    """
+    Get the predecessors and dense truth table of each node of a logic
+    network. The tables of an ``encoded.EncodedLogicNetwork`` are returned
+    as they are stored, read-only, without reading its conditions.
+
+    :param network: the network
+    :type network: neet.boolean.LogicNetwork
+    :returns: a list of ``(predecessors, table)`` pairs, one per node
+    """
+    functions = getattr(network, 'functions', None)
+    if functions is not None:
+        return list(functions)
+    return [(tuple(predecessors), truth_table(conds, len(predecessors)))
+            for predecessors, conds in network.table]
+
+
+def canonical(predecessors, table):
+    """
+    Reorder the inputs of a truth table so that the predecessors are sorted.
+    Two rows which describe the same function with differently ordered inputs
+    have the same canonical form.
+
+    :param predecessors: the inputs of the function
+    :type predecessors: tuple
+    :param table: the truth table
+    :type table: numpy.ndarray of bool
+    :returns: the sorted predecessors and the correspondingly permuted table
+    """
+    k = len(predecessors)
+    order = np.argsort(predecessors, kind='stable')
+    if k > 1 and np.any(order != np.arange(k)):
+        table = np.transpose(np.reshape(table, (2,) * k), order).ravel()
+    return tuple(predecessors[i] for i in order), table
+
+
+def sensitivity(table):
+    """
+    Compute the average sensitivity of a function, i.e. the expected number
+    of inputs which, when flipped, change the output of the function over
+    uniformly random input states.
+
+    :param table: the truth table
+    :type table: numpy.ndarray of bool
+    :returns: float
+    """
+    k = int(len(table)).bit_length() - 1
+    total = 0.0
+    for i in range(k):
+        off, on = _halves(table, k, i)
+        total += np.mean(off != on)
+    return float(total)
@@ -2,7 +2,7 @@ import networkx as nx
 import numpy as np
 
 from .randomizer import AbstractRandomizer
-from .constraints import TopologicalConstraint, GenericTopological, ConstraintError
+from .constraints import TopologicalConstraint, GenericTopological, ConstraintError, ConstraintSet
 
 
 class TopologyRandomizer(AbstractRandomizer):
@@ -23,18 +23,9 @@ class TopologyRandomizer(AbstractRandomizer):
         :type constraints: a seq of AbstractConstraint instances
         :raises TypeError: if any of the contraints are not an AbstractConstraint
         """
-        if constraints is None:
-            constraints = []
-        elif not isinstance(constraints, list):
-            constraints = list(constraints)
-
-        for i, constraint in enumerate(constraints):
-            if isinstance(constraint, TopologicalConstraint):
-                pass
-            elif callable(constraint):
-                constraints[i] = GenericTopological(constraint)
-            else:
-                raise TypeError('constraints must be callable or type TopologicalConstraint')
+        constraints = ConstraintSet(constraints, GenericTopological)
+        if len(constraints.topological) != len(constraints):
+            raise TypeError('constraints must be callable or type TopologicalConstraint')
 
         AbstractRandomizer.constraints.__set__(self, constraints)  # type: ignore
 
@@ -57,6 +48,8 @@ class TopologyRandomizer(AbstractRandomizer):
 
 
 class FixedTopology(TopologyRandomizer):
+    preserves = frozenset(['graph', 'in_degree', 'out_degree', 'num_edges'])
+
     @property
     def constraints(self):
         return super().constraints
@@ -70,19 +63,11 @@ class FixedTopology(TopologyRandomizer):
         :type constraints: a seq of AbstractConstraint instances
         :raises TypeError: if any of the contraints are not an AbstractConstraint
         """
-        if constraints is None:
-            constraints = []
-        elif not isinstance(constraints, list):
-            constraints = list(constraints)
-
-        for i, constraint in enumerate(constraints):
-            if isinstance(constraint, TopologicalConstraint):
-                pass
-            elif callable(constraint):
-                constraints[i] = GenericTopological(constraint)
-            else:
-                raise TypeError('constraints must be callable or type TopologicalConstraint')
-            if not constraints[i].satisfies(self.graph):
+        constraints = ConstraintSet(constraints, GenericTopological)
+        if len(constraints.topological) != len(constraints):
+            raise TypeError('constraints must be callable or type TopologicalConstraint')
+        for constraint in constraints:
+            if not constraint.satisfies(self.graph):
                 msg = 'the provided network is inconsistent with the provided constraints'
                 raise ConstraintError(msg)
 
@@ -118,6 +103,8 @@ class FixedTopology(TopologyRandomizer):
 
         :returns: a random network or graph
         """
+        self.attempts += 1
+        self.accepted += 1
         return self._randomize()
 
     def _randomize(self):
@@ -137,6 +124,8 @@ class MeanDegree(TopologyRandomizer):
 
     :returns: networkx.DiGraph
     """
+    preserves = frozenset(['num_edges'])
+
     def _randomize(self):
         n = len(self.graph)
         edgeindices = np.random.choice(n * n, self.graph.size(), replace=False)
@@ -156,6 +145,8 @@ class InDegree(TopologyRandomizer):
 
     :returns: networkx.DiGraph
     """
+    preserves = frozenset(['in_degree', 'num_edges'])
+
     def _randomize(self):
         n = len(self.graph)
         edges = []
@@ -179,6 +170,8 @@ class OutDegree(TopologyRandomizer):
 
     :returns: networkx.DiGraph
     """
+    preserves = frozenset(['out_degree', 'num_edges'])
+
     def _randomize(self):
         n = len(self.graph)
         edges = []
@@ -191,3 +184,173 @@ class OutDegree(TopologyRandomizer):
         G.add_edges_from(edges)
 
         return G
+
+
+class ConfigurationModel(TopologyRandomizer):
+    preserves = frozenset(['in_degree', 'out_degree', 'num_edges'])
+
+    def __init__(self, network, constraints=None, timeout=1000, self_loops=True, max_repairs=100,
+                 **kwargs):
+        """
+        Generate a topology with the same in- and out-degree sequences as the
+        initial network, using the directed configuration model.
+
+        Each node has one out-stub per outgoing edge and one in-stub per
+        incoming edge, and the out-stubs are paired with a single random
+        permutation of the in-stubs. Rather than rejecting the whole graph
+        when this creates multi-edges (or self-loops, if they are not
+        allowed), each offending edge exchanges its target with that of a
+        random edge, which preserves both degree sequences. This is repeated
+        for at most ``max_repairs`` rounds, each of which only touches the
+        offending edges, so graphs with :math:`m` edges are generated in
+        near-linear time. The result is an approximately uniform sample of the
+        graphs with the given degree sequences.
+
+        :param network: a base network or graph
+        :type network: neet.Network or networkx.DiGraph
+        :param constraints: constraints used for rejection testing
+        :type constraints: a sequence of TopologicalConstraint instances
+        :param timeout: the number of attempts before rejection testing times
+                        out. If less than 1, the rejection testing will never
+                        time out.
+        :param self_loops: whether to allow self-loops
+        :type self_loops: bool
+        :param max_repairs: the maximum number of rounds of re-pairing
+        :type max_repairs: int
+        """
+        self.self_loops = self_loops
+        self.max_repairs = max_repairs
+        super().__init__(network, constraints, timeout, **kwargs)
+
+    def __invalid(self, sources, targets, n):
+        """
+        Find the indices of the edges which duplicate an earlier edge or, if
+        self-loops are not allowed, are self-loops.
+        """
+        keys = sources * n + targets
+        _, first = np.unique(keys, return_index=True)
+        invalid = np.ones(len(keys), dtype=bool)
+        invalid[first] = False
+        if not self.self_loops:
+            invalid |= sources == targets
+        return np.flatnonzero(invalid)
+
+    def random_edges(self):
+        """
+        Generate the edges of a random graph as arrays of sources and targets.
+
+        :returns: a pair of numpy.ndarray of int
+        :raises ConstraintError: if the edges could not be repaired within
+                                 ``max_repairs`` rounds
+        """
+        n = len(self.graph)
+        nodes = np.arange(n)
+        sources = np.repeat(nodes, [self.graph.out_degree(i) for i in range(n)])
+        targets = np.random.permutation(np.repeat(nodes, [self.graph.in_degree(j) for j in range(n)]))
+
+        m = len(targets)
+        for _ in range(self.max_repairs):
+            invalid = self.__invalid(sources, targets, n)
+            if len(invalid) == 0:
+                return sources, targets
+            partners = np.random.randint(0, m, size=len(invalid))
+            for i, j in zip(invalid.tolist(), partners.tolist()):
+                targets[i], targets[j] = targets[j], targets[i]
+
+        if len(self.__invalid(sources, targets, n)) == 0:
+            return sources, targets
+        raise ConstraintError('failed to remove multi-edges from the configuration model')
+
+    def _randomize(self):
+        sources, targets = self.random_edges()
+        G = nx.DiGraph()
+        G.add_nodes_from(range(len(self.graph)))
+        G.add_edges_from(zip(sources.tolist(), targets.tolist()))
+        return G
+
+
+class NonIsomorphic(TopologyRandomizer):
+    def __init__(self, trand, constraints=None, timeout=1000, iterations=3, **kwargs):
+        """
+        Filter the graphs generated by another topology randomizer so that no
+        two graphs are isomorphic.
+
+        Each accepted graph is kept, until ``clear`` is called, in a bucket
+        keyed by a cheap invariant: its sorted sequence of (in-degree,
+        out-degree) pairs and its Weisfeiler-Lehman hash. Exact isomorphism
+        tests are only run against the graphs in the same bucket. A graph
+        isomorphic to a previous graph is rejected as though it failed a
+        constraint, so if ``timeout`` consecutive graphs are rejected for
+        either reason, a ``ConstraintError`` is raised.
+
+        :param trand: the topology randomizer to filter
+        :type trand: TopologyRandomizer
+        :param constraints: constraints used for rejection testing
+        :type constraints: a sequence of TopologicalConstraint instances
+        :param timeout: the number of attempts before rejection testing times
+                        out. If less than 1, the rejection testing will never
+                        time out.
+        :param iterations: the number of Weisfeiler-Lehman iterations
+        :type iterations: int
+        """
+        if not isinstance(trand, TopologyRandomizer):
+            raise TypeError('trand must be an instance of TopologyRandomizer')
+        self.trand = trand
+        self.iterations = iterations
+        self.buckets = {}
+        self.duplicates = 0
+        network = trand.graph if trand.network is None else trand.network
+        super().__init__(network, constraints, timeout, **kwargs)
+
+    @property
+    def preserves(self):
+        """
+        The graph properties preserved by the underlying topology randomizer.
+        """
+        return self.trand.preserves
+
+    def invariant(self, graph):
+        """
+        Compute an isomorphism invariant of a graph.
+
+        :param graph: the graph
+        :type graph: networkx.DiGraph
+        :returns: a hashable invariant
+        """
+        degrees = tuple(sorted(zip(dict(graph.in_degree).values(),
+                                   dict(graph.out_degree).values())))
+        return degrees, nx.weisfeiler_lehman_graph_hash(graph, iterations=self.iterations)
+
+    def clear(self):
+        """
+        Forget all previously generated graphs.
+        """
+        self.buckets = {}
+        self.duplicates = 0
+
+    def _check_constraints(self, graph):
+        """
+        Check a graph against the randomizer's constraints and reject it if it
+        is isomorphic to a previously accepted graph, remembering it
+        otherwise.
+
+        :param graph: the graph
+        :type graph: networkx.DiGraph
+        :returns: ``True`` if the graph is novel and satisfies all constraints
+        """
+        if not super()._check_constraints(graph):
+            return False
+        bucket = self.buckets.setdefault(self.invariant(graph), [])
+        if any(nx.is_isomorphic(graph, other) for other in bucket):
+            self.duplicates += 1
+            return False
+        bucket.append(graph)
+        return True
+
+    def _randomize(self):
+        """
+        Draw a graph from the underlying topology randomizer.
+
+        :returns: networkx.DiGraph
+        """
+        return self.trand.random()
@@ -17,6 +17,9 @@ setup(
     install_requires=['neet>=1.0.0'],
     setup_requires=['flake8', 'green'],
     packages=['randomneet'],
+    entry_points={
+        'console_scripts': ['randomneet=randomneet.cli:main'],
+    },
     test_suite='test',
     platforms=['Windows', 'OS X', 'Linux']
 )
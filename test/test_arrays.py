@@ -0,0 +1,113 @@
+import networkx as nx
+import numpy as np
+import randomneet
+import unittest
+
+from neet.boolean.examples import myeloid
+from randomneet.arrays import to_arrays
+from randomneet.constraints import HasCanalizingNodes, IsConnected, GenericDynamical
+from randomneet.dynamics import UniformBias, LocalBias
+from randomneet.mcmc import TableSwap
+from randomneet.tables import network_tables, canonical
+from randomneet.topology import MeanDegree, InDegree
+
+
+class TestArrays(unittest.TestCase):
+    """
+    Unit tests for exporting ensembles as arrays
+    """
+
+    def assertMatches(self, nets, adjacency, tables, packed=False):
+        """
+        Assert that the arrays encode the networks
+        """
+        if packed:
+            tables = np.unpackbits(tables, axis=2)
+        for net, a, t in zip(nets, adjacency, tables):
+            self.assertTrue(np.array_equal(nx.to_numpy_array(net.network_graph(), nodelist=range(net.size)), a))
+            for node, (predecessors, table) in enumerate(network_tables(net)):
+                _, table = canonical(predecessors, table)
+                self.assertTrue(np.array_equal(table, t[node, :len(table)]))
+                self.assertFalse(np.any(t[node, len(table):]))
+
+    def test_arrays_module(self):
+        """
+        Ensure that arrays is exported from randomneet
+        """
+        self.assertIn('arrays', randomneet.__all__)
+
+    def test_to_arrays(self):
+        """
+        Ensure that the arrays encode the networks the randomizer would have
+        generated
+        """
+        kmax = max(len(row[0]) for row in myeloid.table)
+        for packed in [False, True]:
+            rand = UniformBias(myeloid, trand=InDegree)
+            np.random.seed(2024)
+            nets = [rand.random() for _ in range(5)]
+            np.random.seed(2024)
+            adjacency, tables = to_arrays(rand, 5, packed=packed)
+            self.assertEqual((5, myeloid.size, myeloid.size), adjacency.shape)
+            self.assertEqual(np.uint8, adjacency.dtype)
+            self.assertEqual(np.uint8, tables.dtype)
+            width = 2**kmax // 8 if packed else 2**kmax
+            self.assertEqual((5, myeloid.size, width), tables.shape)
+            self.assertMatches(nets, adjacency, tables, packed)
+
+    def test_to_arrays_grows(self):
+        """
+        Ensure that the tables grow when the in-degrees are not preserved
+        """
+        rand = UniformBias(myeloid, trand=MeanDegree)
+        np.random.seed(2024)
+        nets = [rand.random() for _ in range(5)]
+        np.random.seed(2024)
+        adjacency, tables = to_arrays(rand, 5)
+        kmax = max(max(len(row[0]) for row in net.table) for net in nets)
+        self.assertEqual(2**kmax, tables.shape[2])
+        self.assertMatches(nets, adjacency, tables)
+
+    def test_to_arrays_constrained(self):
+        """
+        Ensure that constraints are respected by the arrays
+        """
+        tested = []
+        rand = LocalBias(myeloid, constraints=[IsConnected(), GenericDynamical(lambda net: tested.append(net) is None)])
+        to_arrays(rand, 5)
+        self.assertEqual(rand.attempts, len(tested))
+        self.assertEqual(5, rand.accepted)
+
+        rand = TableSwap(myeloid, constraints=[HasCanalizingNodes(myeloid)])
+        np.random.seed(2024)
+        nets = [rand.random() for _ in range(5)]
+        rand.reset()
+        np.random.seed(2024)
+        adjacency, tables = to_arrays(rand, 5)
+        self.assertMatches(nets, adjacency, tables)
+
+    def test_to_arrays_out(self):
+        """
+        Ensure that preallocated buffers are filled and validated
+        """
+        adjacency = np.ones((3, myeloid.size, myeloid.size), dtype=np.uint8)
+        tables = np.ones((3, myeloid.size, 32), dtype=np.uint8)
+        result = to_arrays(UniformBias(myeloid), 3, out=(adjacency, tables))
+        self.assertIs(adjacency, result[0])
+        self.assertIs(tables, result[1])
+        self.assertFalse(np.any(tables[:, :, 16:]))
+
+        with self.assertRaises(ValueError):
+            to_arrays(UniformBias(myeloid), 2, out=(adjacency, tables))
+        with self.assertRaises(ValueError):
+            to_arrays(UniformBias(myeloid), 3, out=(adjacency, tables[:, :, :2]))
+
+    def test_to_arrays_topology(self):
+        """
+        Ensure that topology randomizers only export adjacency tensors
+        """
+        rand = MeanDegree(myeloid)
+        adjacency, tables = to_arrays(rand, 4)
+        self.assertIsNone(tables)
+        self.assertEqual((4, myeloid.size, myeloid.size), adjacency.shape)
+        self.assertTrue(np.all(np.sum(adjacency, axis=(1, 2)) == myeloid.network_graph().size()))
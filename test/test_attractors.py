@@ -0,0 +1,71 @@
+import numpy as np
+import randomneet
+import unittest
+
+from neet.boolean import LogicNetwork
+from neet.boolean.examples import myeloid, s_pombe
+from randomneet.attractors import Attractors, attractors, compile_network, fixed_points, \
+    step, transitions
+from randomneet.dynamics import UniformBias
+
+
+class TestAttractors(unittest.TestCase):
+    """
+    Unit tests for the vectorized attractor engine
+    """
+
+    def test_attractors_module(self):
+        """
+        Ensure that attractors is exported from randomneet
+        """
+        self.assertIn('attractors', randomneet.__all__)
+
+    def test_compile_network_raises(self):
+        """
+        Only logic networks can be compiled
+        """
+        with self.assertRaises(TypeError):
+            compile_network(s_pombe)
+
+    def test_transitions(self):
+        """
+        The transition table agrees with neet
+        """
+        rows = compile_network(myeloid)
+        self.assertEqual(transitions(rows).tolist(), list(myeloid.transitions))
+
+    def test_step(self):
+        """
+        Stepping a batch of states agrees with the transition table
+        """
+        rows = compile_network(myeloid)
+        successors = transitions(rows)
+        codes = np.random.randint(0, 2**myeloid.size, size=20)
+        states = ((codes[:, np.newaxis] >> np.arange(myeloid.size)) & 1).astype(bool)
+        got = step(rows, states).dot(1 << np.arange(myeloid.size))
+        self.assertEqual(got.tolist(), successors[codes].tolist())
+
+    def test_attractors(self):
+        """
+        The attractors found agree with neet
+        """
+        rand = UniformBias(myeloid)
+        for net in [myeloid] + [rand.random() for _ in range(5)]:
+            expected = sorted(net.attractor_lengths)
+            self.assertEqual(attractors(net), Attractors(expected, True))
+            self.assertEqual(fixed_points(net), expected.count(1))
+
+    def test_attractors_sampled(self):
+        """
+        Sampling finds a subset of the attractors of a network
+        """
+        net = LogicNetwork([((1,), {'1'}), ((0,), {'1'}), ((2,), {'0'})])
+        self.assertEqual(attractors(net).lengths, [2, 2, 2, 2])
+        got = attractors(net, max_exhaustive=0, samples=200)
+        self.assertEqual(got, Attractors([2, 2, 2, 2], False))
+        self.assertEqual(fixed_points(net, max_exhaustive=0), 0)
+
+        got = attractors(myeloid, max_exhaustive=0, samples=100)
+        self.assertFalse(got.exhaustive)
+        self.assertLessEqual(len(got.lengths), 8)
+        self.assertTrue(set(got.lengths) <= {1, 2})
@@ -0,0 +1,189 @@
+import contextlib
+import gzip
+import io
+import json
+import networkx as nx
+import os
+import randomneet
+import shutil
+import subprocess
+import sys
+import tempfile
+import unittest
+
+from neet.boolean import LogicNetwork
+from neet.boolean.examples import MYELOID_LOGIC_EXPRESSIONS, myeloid
+from randomneet.cli import main, read_network, read_bnet, encode, decode, build_randomizer, \
+    generate
+from randomneet.constraints import IsConnected, HasCanalizingNodes
+from randomneet.dynamics import LocalBias, UniformBias
+from randomneet.topology import ConfigurationModel, InDegree, MeanDegree
+
+
+class TestCLI(unittest.TestCase):
+    """
+    Unit tests for the command-line ensemble generator
+    """
+
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+
+    def path(self, name):
+        return os.path.join(self.dir, name)
+
+    def test_cli_module(self):
+        """
+        Ensure that cli is exported from randomneet
+        """
+        self.assertTrue('cli' in dir(randomneet))
+
+    def test_read_network(self):
+        """
+        Base networks can be read from logic, BNet and edge list files
+        """
+        net = read_network(MYELOID_LOGIC_EXPRESSIONS)
+        self.assertIsInstance(net, LogicNetwork)
+        self.assertEqual(net.table, myeloid.table)
+
+        with open(self.path('net.bnet'), 'w') as f:
+            f.write('targets, factors\n')
+            f.write('A, A & !(B | C)\n')
+            f.write('B, A\n')
+            f.write('C, !B\n')
+        net = read_bnet(self.path('net.bnet'))
+        self.assertEqual(net.names, ['A', 'B', 'C'])
+        self.assertEqual(net.table, read_network(self.path('net.bnet')).table)
+        self.assertEqual(net.table[0], ((0, 1, 2), {'100'}))
+
+        nx.write_edgelist(nx.DiGraph([(0, 1), (1, 2)]), self.path('net.edges'), data=False)
+        graph = read_network(self.path('net.edges'))
+        self.assertEqual(sorted(graph.edges), [(0, 1), (1, 2)])
+
+        with self.assertRaises(ValueError):
+            read_network(MYELOID_LOGIC_EXPRESSIONS, 'xml')
+
+    def test_encode_decode(self):
+        """
+        Encoding and decoding networks is lossless
+        """
+        self.assertEqual(decode(json.loads(json.dumps(encode(myeloid)))).table, myeloid.table)
+        graph = nx.DiGraph([(0, 1), (1, 2), (2, 2)])
+        self.assertEqual(sorted(decode(encode(graph)).edges), sorted(graph.edges))
+
+    def test_build_randomizer(self):
+        """
+        Randomizers are constructed by name
+        """
+        rand = build_randomizer(myeloid, 'in-degree', 'local-bias',
+                                constraints=['connected', 'canalizing-nodes'])
+        self.assertIsInstance(rand, LocalBias)
+        self.assertIsInstance(rand.trand, InDegree)
+        self.assertIsInstance(rand.trand.constraints[0], IsConnected)
+        self.assertIsInstance(rand.constraints[0], HasCanalizingNodes)
+
+        rand = build_randomizer(myeloid, 'mean-degree', 'uniform-bias', p=0.3,
+                                bias_mode='bernoulli')
+        self.assertEqual((rand.p, rand.bias_mode), (0.3, 'bernoulli'))
+
+        rand = build_randomizer(myeloid, 'mean-degree', 'none')
+        self.assertIsInstance(rand, MeanDegree)
+
+        rand = build_randomizer(myeloid, 'configuration', 'none')
+        self.assertIsInstance(rand, ConfigurationModel)
+
+        rand = build_randomizer(myeloid, constraints=['fixed-points', 'max-cycle-length'])
+        self.assertEqual([c.target for c in rand.constraints], [6, 2])
+
+        rand = build_randomizer(myeloid, dynamics='mean-sensitivity', constraints=['sensitivity'])
+        self.assertAlmostEqual(rand.target, rand.constraints[0].target)
+
+        with self.assertRaises(ValueError):
+            build_randomizer(myeloid, constraints=['acyclic'])
+
+    def test_generate(self):
+        """
+        Networks are generated in parallel with acceptance counts
+        """
+        for processes in (1, 2):
+            path = self.path('out{}.jsonl'.format(processes))
+            with open(path, 'w') as f:
+                totals = generate(UniformBias(myeloid, trand=InDegree), 6, f, processes)
+            with open(path) as f:
+                nets = [decode(json.loads(line)) for line in f]
+            self.assertEqual(len(nets), 6)
+            self.assertEqual(totals, [6, 6, 6, 6])
+
+    def test_main(self):
+        """
+        The command line interface writes the requested number of networks
+        """
+        path = self.path('out.jsonl.gz')
+        code = main([MYELOID_LOGIC_EXPRESSIONS, '-n', '5', '-t', 'in-degree', '-c', 'connected',
+                     '-s', '1', '-o', path])
+        self.assertEqual(code, 0)
+        with gzip.open(path, 'rt') as f:
+            nets = [decode(json.loads(line)) for line in f]
+        self.assertEqual(len(nets), 5)
+        for net in nets:
+            self.assertTrue(nx.is_weakly_connected(net.network_graph()))
+
+    def test_main_edgelist(self):
+        """
+        The command line interface randomizes the dynamics of an edge list,
+        including in a fresh interpreter which has not imported neet.boolean
+        """
+        nx.write_edgelist(myeloid.network_graph(), self.path('net.edges'), data=False)
+        path = self.path('out.jsonl')
+        self.assertEqual(main([self.path('net.edges'), '-n', '3', '-o', path]), 0)
+        with open(path) as f:
+            nets = [decode(json.loads(line)) for line in f]
+        self.assertEqual(len(nets), 3)
+        for net in nets:
+            self.assertIsInstance(net, LogicNetwork)
+
+        subprocess.run([sys.executable, '-m', 'randomneet', self.path('net.edges'), '-n', '2',
+                        '-o', path], stdout=subprocess.PIPE, stderr=subprocess.PIPE, check=True)
+        with open(path) as f:
+            self.assertEqual(len(f.readlines()), 2)
+
+    def test_main_invalid_combinations(self):
+        """
+        The command line interface reports names which cannot be combined as
+        usage errors
+        """
+        nx.write_edgelist(myeloid.network_graph(), self.path('net.edges'), data=False)
+        invalid = [[MYELOID_LOGIC_EXPRESSIONS, '-d', 'local-bias', '-t', 'mean-degree'],
+                   [MYELOID_LOGIC_EXPRESSIONS, '-d', 'local-bias', '-t', 'configuration'],
+                   [MYELOID_LOGIC_EXPRESSIONS, '-d', 'none', '-c', 'irreducible'],
+                   [self.path('net.edges'), '-c', 'canalizing-nodes'],
+                   [self.path('net.edges'), '-d', 'mean-bias']]
+        for argv in invalid:
+            with self.assertRaises(SystemExit) as context:
+                with contextlib.redirect_stderr(io.StringIO()):
+                    main(argv + ['-o', self.path('out.jsonl')])
+            self.assertEqual(context.exception.code, 2)
+        with self.assertRaises(ValueError):
+            build_randomizer(myeloid, 'out-degree', 'local-bias')
+
+    def test_main_trace(self):
+        """
+        The command line interface can write a Chrome trace
+        """
+        trace = self.path('trace.json')
+        code = main([MYELOID_LOGIC_EXPRESSIONS, '-n', '3', '-t', 'mean-degree', '-c', 'connected',
+                     '-o', self.path('out.jsonl'), '--trace', trace])
+        self.assertEqual(code, 0)
+        with open(trace) as f:
+            names = set(event['name'] for event in json.load(f)['traceEvents'])
+        self.assertTrue({'topology', 'functions', 'construct', 'constraint:IsConnected'} <= names)
+
+    def test_main_timeout(self):
+        """
+        The command line interface reports constraint timeouts
+        """
+        code = main([MYELOID_LOGIC_EXPRESSIONS, '-n', '5', '-c', 'irreducible',
+                     '-p', '0.0', '--timeout', '2', '-o', self.path('out.jsonl')])
+        self.assertEqual(code, 1)
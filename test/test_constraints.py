@@ -6,8 +6,11 @@ from neet.boolean import LogicNetwork
 from neet.boolean.examples import s_pombe, myeloid
 from randomneet.constraints import AbstractConstraint, TopologicalConstraint, DynamicalConstraint, \
     HasExternalNodes, IsConnected, IsIrreducible, \
-    HasCanalizingNodes, GenericTopological, GenericDynamical, \
-    ConstraintError
+    HasCanalizingNodes, GenericTopological, GenericDynamical, IncrementalConstraint, \
+    ConstraintError, AttractorConstraint, HasAttractors, HasFixedPoints, HasMaxCycleLength, \
+    HasSensitivity, MemoizedTopological, MemoizedDynamical, memoize, ConstraintSet, AllOf, AnyOf, \
+    Not, LogicalConstraint
+from randomneet.tables import truth_table
 
 
 class TestConstraints(unittest.TestCase):
@@ -23,6 +26,18 @@ class TestConstraints(unittest.TestCase):
         g.add_nodes_from(range(n))
         return g
 
+    def incremental(self, constraint, network):
+        """
+        Incrementally test a logic network against a constraint, returning the
+        number of nodes consumed and the verdict.
+        """
+        state = constraint.begin(network.network_graph())
+        for node, (predecessors, conditions) in enumerate(network.table):
+            table = truth_table(conditions, len(predecessors))
+            if not constraint.update(state, node, predecessors, table):
+                return node + 1, False
+        return network.size, constraint.finish(state)
+
     def test_constraints_module(self):
         """
         Ensure that constraints is exported from randomneet
@@ -264,6 +279,165 @@ class TestConstraints(unittest.TestCase):
         self.assertTrue(constraint.satisfies(myeloid))
         self.assertFalse(constraint.satisfies(s_pombe))
 
+    def test_incremental_constraints(self):
+        """
+        IsIrreducible and HasCanalizingNodes can be tested incrementally
+        """
+        self.assertTrue(issubclass(IncrementalConstraint, DynamicalConstraint))
+        self.assertTrue(issubclass(IsIrreducible, IncrementalConstraint))
+        self.assertTrue(issubclass(HasCanalizingNodes, IncrementalConstraint))
+        with self.assertRaises(TypeError):
+            IncrementalConstraint()  # type: ignore
+
+    def test_is_irreducible_incremental(self):
+        """
+        IsIrreducible rejects a network at the first reducible node
+        """
+        constraint = IsIrreducible()
+        reducible = LogicNetwork([((0, 1), {'01'}), ((0, 1), {'00', '01'}),
+                                  ((0,), {'0'})])
+        self.assertEqual(self.incremental(constraint, reducible), (2, False))
+
+        irreducible = LogicNetwork([((0, 1), {'01'}), ((0, 1), {'00', '01', '11'})])
+        self.assertEqual(self.incremental(constraint, irreducible), (2, True))
+
+    def test_has_canalizing_nodes_incremental(self):
+        """
+        HasCanalizingNodes rejects a network as soon as the target is exceeded
+        or can no longer be reached, and otherwise agrees with ``satisfies``
+        """
+        self.assertEqual(self.incremental(HasCanalizingNodes(11), myeloid), (11, True))
+        self.assertEqual(self.incremental(HasCanalizingNodes(1), myeloid), (2, False))
+        self.assertEqual(self.incremental(HasCanalizingNodes(12), myeloid), (1, False))
+
+        net = LogicNetwork([((0, 1), {'01', '10'}), ((0, 1), {'11'}), ((0, 1), {'00', '11'})])
+        for target in range(4):
+            constraint = HasCanalizingNodes(target)
+            _, verdict = self.incremental(constraint, net)
+            self.assertEqual(verdict, constraint.satisfies(net))
+
+    def test_has_sensitivity_is_incremental(self):
+        """
+        The HasSensitivity constraint is an IncrementalConstraint
+        """
+        self.assertTrue(issubclass(HasSensitivity, IncrementalConstraint))
+
+    def test_has_sensitivity_invalid_init(self):
+        """
+        HasSensitivity raises a ValueError or TypeError for invalid
+        initialization parameters
+        """
+        with self.assertRaises(ValueError):
+            HasSensitivity(-1)
+        with self.assertRaises(ValueError):
+            HasSensitivity(1, tol=-0.1)
+        with self.assertRaises(TypeError):
+            HasSensitivity(nx.DiGraph())
+
+    def test_has_sensitivity_target(self):
+        """
+        HasSensitivity computes the average sensitivity of a target network
+        """
+        self.assertAlmostEqual(HasSensitivity(myeloid).target, myeloid.average_sensitivity())
+        self.assertAlmostEqual(HasSensitivity(s_pombe).target, s_pombe.average_sensitivity())
+        self.assertEqual(HasSensitivity(2, 0.1).target, 2.0)
+
+    def test_has_sensitivity_satisfies(self):
+        """
+        HasSensitivity.satisfies identifies networks within the tolerance of
+        the target
+        """
+        s = myeloid.average_sensitivity()
+        self.assertTrue(HasSensitivity(myeloid).satisfies(myeloid))
+        self.assertTrue(HasSensitivity(s + 0.1, tol=0.1).satisfies(myeloid))
+        self.assertFalse(HasSensitivity(s + 0.2, tol=0.1).satisfies(myeloid))
+        with self.assertRaises(TypeError):
+            HasSensitivity(1).satisfies(nx.DiGraph())
+
+    def test_has_sensitivity_incremental(self):
+        """
+        HasSensitivity rejects a network as soon as the target is exceeded or
+        can no longer be reached, and otherwise agrees with ``satisfies``
+        """
+        net = LogicNetwork([((0, 1), {'01', '10'}), ((0, 1), {'11'}), ((0,), {'1'})])
+        # node sensitivities are 2, 1 and 1
+        self.assertEqual(self.incremental(HasSensitivity(4 / 3, 0.01), net), (3, True))
+        self.assertEqual(self.incremental(HasSensitivity(0.5, 0.1), net), (1, False))
+        self.assertEqual(self.incremental(HasSensitivity(1.5, 0.1), net), (2, False))
+        for target in (0.5, 1.0, 4 / 3, 1.5, 2.0):
+            constraint = HasSensitivity(target, 0.1)
+            _, verdict = self.incremental(constraint, net)
+            self.assertEqual(verdict, constraint.satisfies(net))
+
+    def test_incremental_replace(self):
+        """
+        Incremental constraints follow a network as a node's function is
+        replaced, and replacing it back restores their state
+        """
+        net = LogicNetwork([((0, 1), {'01', '10'}), ((0, 1), {'11'}), ((0,), {'1'})])
+        old = truth_table({'11'}, 2)
+        new = truth_table({'00', '01'}, 2)  # reducible, canalizing, sensitivity 1
+        changed = LogicNetwork([((0, 1), {'01', '10'}), ((0, 1), {'00', '01'}), ((0,), {'1'})])
+        for constraint in [IsIrreducible(), HasCanalizingNodes(2), HasSensitivity(4 / 3, 0.01)]:
+            state = constraint.begin(net.network_graph())
+            for node, (predecessors, conditions) in enumerate(net.table):
+                constraint.update(state, node, predecessors, truth_table(conditions, len(predecessors)))
+            before = list(state)
+            self.assertEqual(constraint.replace(state, 1, (0, 1), old, new),
+                             bool(constraint.satisfies(changed)))
+            self.assertTrue(constraint.replace(state, 1, (0, 1), new, old))
+            self.assertEqual(state, before)
+
+    def test_attractor_constraints_are_dynamical(self):
+        """
+        The attractor constraints are DynamicalConstraints
+        """
+        self.assertTrue(issubclass(AttractorConstraint, DynamicalConstraint))
+        for cls in (HasAttractors, HasFixedPoints, HasMaxCycleLength):
+            self.assertTrue(issubclass(cls, AttractorConstraint))
+        with self.assertRaises(TypeError):
+            AttractorConstraint(1)  # type: ignore
+
+    def test_attractor_constraints_invalid_init(self):
+        """
+        The attractor constraints raise a ValueError or TypeError for invalid
+        targets
+        """
+        with self.assertRaises(ValueError):
+            HasAttractors(-1)
+        with self.assertRaises(TypeError):
+            HasFixedPoints(nx.DiGraph())
+        with self.assertRaises(TypeError):
+            HasMaxCycleLength(2).satisfies(nx.DiGraph())
+
+    def test_attractor_constraints_measure(self):
+        """
+        The attractor constraints agree with neet's landscape for logic and
+        non-logic networks
+        """
+        for net in (myeloid, s_pombe):
+            lengths = sorted(net.attractor_lengths)
+            self.assertEqual(HasAttractors(net).target, len(lengths))
+            self.assertEqual(HasFixedPoints(net).target, lengths.count(1))
+            self.assertEqual(HasMaxCycleLength(net).target, max(lengths))
+
+    def test_attractor_constraints_satisfies(self):
+        """
+        The attractor constraints identify networks with the desired attractors
+        """
+        self.assertTrue(HasAttractors(8).satisfies(myeloid))
+        self.assertFalse(HasAttractors(7).satisfies(myeloid))
+        self.assertTrue(HasFixedPoints(6).satisfies(myeloid))
+        self.assertTrue(HasMaxCycleLength(2).satisfies(myeloid))
+        self.assertFalse(HasMaxCycleLength(1).satisfies(myeloid))
+
+    def test_attractor_constraints_sampled(self):
+        """
+        The attractor constraints can sample the state space of large networks
+        """
+        self.assertTrue(HasFixedPoints(6, max_exhaustive=0, samples=5000).satisfies(myeloid))
+        self.assertTrue(HasMaxCycleLength(2, max_exhaustive=0, samples=5000).satisfies(myeloid))
+
     def test_generic_topological_is_topological(self):
         """
         Ensure that GenericTopological is a subclass of TopologicalConstraint.
@@ -349,3 +523,251 @@ class TestConstraints(unittest.TestCase):
         ninenodes = GenericDynamical(lambda g: g.size == 9)
         self.assertTrue(ninenodes.satisfies(s_pombe))
         self.assertFalse(ninenodes.satisfies(myeloid))
+
+    def test_memoize(self):
+        """
+        memoize wraps constraints according to their type
+        """
+        self.assertIsInstance(memoize(IsConnected()), MemoizedTopological)
+        self.assertIsInstance(memoize(IsConnected()), TopologicalConstraint)
+        self.assertIsInstance(memoize(IsIrreducible()), MemoizedDynamical)
+        self.assertIsInstance(memoize(IsIrreducible()), DynamicalConstraint)
+        with self.assertRaises(TypeError):
+            memoize(lambda g: True)
+        with self.assertRaises(ValueError):
+            memoize(IsConnected(), maxsize=0)
+
+    def test_memoize_caches(self):
+        """
+        Memoized constraints only test each distinct network once
+        """
+        calls = []
+        constraint = memoize(GenericTopological(lambda g: calls.append(g) or len(g) > 2))
+        path = nx.DiGraph([(0, 1), (1, 2)])
+        self.assertTrue(constraint.satisfies(path))
+        self.assertTrue(constraint.satisfies(nx.DiGraph([(1, 2), (0, 1)])))
+        self.assertFalse(constraint.satisfies(nx.DiGraph([(0, 1)])))
+        self.assertFalse(constraint.satisfies(nx.DiGraph([(0, 1)])))
+        self.assertEqual(len(calls), 2)
+        self.assertEqual((constraint.hits, constraint.misses), (2, 2))
+        self.assertEqual(constraint.hit_rate, 0.5)
+
+        with self.assertRaises(TypeError):
+            constraint.satisfies(myeloid)
+
+        constraint.clear()
+        self.assertIsNone(constraint.hit_rate)
+        self.assertEqual(len(constraint.cache), 0)
+
+    def test_memoize_evicts(self):
+        """
+        Memoized constraints evict the least recently used results
+        """
+        constraint = memoize(IsConnected(), maxsize=2)
+        a, b, c = nx.DiGraph([(0, 1)]), nx.DiGraph([(0, 2)]), nx.DiGraph([(1, 2)])
+        constraint.satisfies(a)
+        constraint.satisfies(b)
+        constraint.satisfies(a)
+        constraint.satisfies(c)
+        self.assertEqual(constraint.evictions, 1)
+        self.assertEqual(len(constraint.cache), 2)
+        constraint.satisfies(a)
+        self.assertEqual(constraint.hits, 2)
+        constraint.satisfies(b)
+        self.assertEqual(constraint.misses, 4)
+
+    def test_memoize_dynamical(self):
+        """
+        Memoized dynamical constraints agree with the wrapped constraint
+        """
+        constraint = memoize(HasCanalizingNodes(myeloid))
+        self.assertTrue(constraint.satisfies(myeloid))
+        self.assertTrue(constraint.satisfies(myeloid))
+        self.assertEqual(constraint.hits, 1)
+        with self.assertRaises(TypeError):
+            constraint.satisfies(nx.DiGraph())
+
+    def test_memoize_keys(self):
+        """
+        Memoized constraints don't retest equal networks or graphs, but do
+        test those which differ
+        """
+        calls = []
+        constraint = memoize(GenericTopological(lambda g: calls.append(g) or nx.is_weakly_connected(g)))
+        graph = nx.DiGraph(nx.cycle_graph(100))
+        self.assertTrue(constraint.satisfies(graph))
+        self.assertTrue(constraint.satisfies(nx.DiGraph(reversed(list(graph.edges)))))
+        self.assertEqual(len(calls), 1)
+
+        calls = []
+        constraint = memoize(GenericDynamical(lambda net: calls.append(net) or True))
+        self.assertTrue(constraint.satisfies(myeloid))
+        self.assertTrue(constraint.satisfies(LogicNetwork(myeloid.table)))
+        self.assertEqual(len(calls), 1)
+
+        constraint = memoize(IsConnected())
+        self.assertTrue(constraint.satisfies(graph))
+        graph.remove_edges_from([(0, 1), (1, 0), (1, 2), (2, 1)])
+        self.assertFalse(constraint.satisfies(graph))
+        self.assertEqual(constraint.misses, 2)
+        self.assertEqual(len(constraint.cache), 2)
+
+        constraint = memoize(HasCanalizingNodes(2))
+        table = [((0,), {'1'}), ((0, 1), {'11'})]
+        self.assertTrue(constraint.satisfies(LogicNetwork(table)))
+        table[1] = ((0, 1), {'11', '00'})
+        self.assertFalse(constraint.satisfies(LogicNetwork(table)))
+        self.assertEqual(constraint.misses, 2)
+
+    def test_constraints_have_slots(self):
+        """
+        Built-in constraints do not have per-instance dictionaries
+        """
+        for constraint in [HasExternalNodes(1), IsConnected(), IsIrreducible(),
+                           HasCanalizingNodes(1), HasSensitivity(1.0), HasAttractors(1),
+                           GenericDynamical(lambda net: True), memoize(IsConnected()),
+                           IsConnected() & IsConnected()]:
+            self.assertFalse(hasattr(constraint, '__dict__'), type(constraint).__name__)
+            with self.assertRaises(AttributeError):
+                constraint.unknown = 1
+
+    def test_combinators(self):
+        """
+        Constraints can be combined with ``&``, ``|`` and ``~``, which are
+        topological only if all of their operands are
+        """
+        connected, external = IsConnected(), HasExternalNodes(s_pombe.network_graph())
+        both = connected & external
+        self.assertIsInstance(both, AllOf)
+        self.assertIsInstance(both, TopologicalConstraint)
+        self.assertEqual(both.constraints, (connected, external))
+        self.assertEqual((both & connected).constraints, (connected, external, connected))
+        self.assertIsInstance(connected | external, AnyOf)
+        self.assertIsInstance(~connected, Not)
+        self.assertIsInstance(~connected, TopologicalConstraint)
+
+        graph = s_pombe.network_graph()
+        self.assertTrue(both.satisfies(graph))
+        self.assertFalse((~connected).satisfies(graph))
+        self.assertTrue((~connected | external).satisfies(graph))
+        self.assertFalse((connected & ~external).satisfies(graph))
+        self.assertEqual(both.invariant, None)
+        self.assertEqual((external | ~external).invariant, 'in_degree')
+
+        mixed = connected & HasCanalizingNodes(myeloid)
+        self.assertIsInstance(mixed, DynamicalConstraint)
+        self.assertTrue(mixed.satisfies(myeloid))
+        self.assertFalse((connected & ~HasCanalizingNodes(myeloid)).satisfies(myeloid))
+        with self.assertRaises(TypeError):
+            mixed.satisfies(graph)
+        with self.assertRaises(TypeError):
+            AllOf(connected, 5)
+
+    def test_constraint_set(self):
+        """
+        Constraint sets are validated, partitioned, immutable sequences
+        """
+        connected, canalizing = IsConnected(), HasCanalizingNodes(myeloid)
+        constraints = ConstraintSet([connected, canalizing])
+        self.assertEqual(constraints, [connected, canalizing])
+        self.assertEqual(constraints, ConstraintSet((connected, canalizing)))
+        self.assertNotEqual(constraints, [canalizing, connected])
+        self.assertEqual(constraints.topological, [connected])
+        self.assertEqual(constraints.dynamical, [canalizing])
+        self.assertTrue(constraints.is_partitioned())
+        self.assertEqual(constraints[1:], [canalizing])
+        self.assertEqual(ConstraintSet(), [])
+        with self.assertRaises(AttributeError):
+            constraints.append(connected)
+
+        with self.assertRaises(TypeError):
+            ConstraintSet([lambda net: True])
+        wrapped = ConstraintSet([lambda net: True], GenericDynamical)
+        self.assertIsInstance(wrapped[0], GenericDynamical)
+
+        self.assertEqual(constraints & connected, [connected, canalizing, connected])
+        self.assertEqual([canalizing] & ConstraintSet([connected]), [canalizing, connected])
+        either = ConstraintSet([connected]) | [canalizing]
+        self.assertEqual(len(either), 1)
+        self.assertIsInstance(either[0], AnyOf)
+        self.assertTrue(either[0].satisfies(myeloid))
+        self.assertFalse((~constraints)[0].satisfies(myeloid))
+
+    def test_logical_constraint_is_abstract(self):
+        """
+        The base class of the combinators cannot be instantiated, while each
+        combinator compiles to its own test
+        """
+        with self.assertRaises(TypeError):
+            LogicalConstraint(IsConnected(), IsConnected())
+        with self.assertRaises(TypeError):
+            LogicalConstraint(IsConnected(), HasCanalizingNodes(myeloid))
+        graph = s_pombe.network_graph()
+        for constraint, expected in [(AllOf(IsConnected(), ~IsConnected()), False),
+                                     (AnyOf(IsConnected(), ~IsConnected()), True),
+                                     (Not(IsConnected()), False)]:
+            self.assertEqual(expected, constraint.compile()(graph))
+
+    def test_combinators_order_by_cost(self):
+        """
+        Combinators short-circuit, even while calibrating, and test cheap
+        operands which decide the result first once calibrated
+        """
+        calls = {'slow': 0, 'fast': 0}
+
+        def slow(graph):
+            calls['slow'] += 1
+            sum(range(20000))
+            return True
+
+        def fast(graph):
+            calls['fast'] += 1
+            return False
+
+        both = AllOf(GenericTopological(slow), GenericTopological(fast), calibration=4)
+        self.assertEqual(both.order, (0, 1))
+        graph = self.empty_graph(1)
+        self.assertFalse(both.satisfies(graph))
+        self.assertEqual(calls, {'slow': 1, 'fast': 1})
+        self.assertFalse(both.satisfies(graph))
+        self.assertEqual(calls, {'slow': 1, 'fast': 2})
+        for _ in range(2):
+            self.assertFalse(both.satisfies(graph))
+        self.assertEqual(calls, {'slow': 2, 'fast': 4})
+        self.assertEqual(both.order, (1, 0))
+        for _ in range(10):
+            self.assertFalse(both.satisfies(graph))
+        self.assertEqual(calls, {'slow': 2, 'fast': 14})
+
+        either = AnyOf(GenericTopological(fast), GenericTopological(slow), calibration=0)
+        self.assertTrue(either.satisfies(graph))
+        self.assertEqual(calls, {'slow': 3, 'fast': 15})
+
+    def test_is_feasible(self):
+        """
+        Ensure that constraints statically reject impossible targets
+        """
+        graph = myeloid.network_graph()
+        in_degree = {'in_degree', 'num_edges'}
+        edges = {'num_edges'}
+        out_degree = {'out_degree', 'num_edges'}
+
+        self.assertTrue(HasExternalNodes(graph).is_feasible(graph, in_degree))
+        self.assertFalse(HasExternalNodes(5).is_feasible(graph, in_degree))
+        self.assertTrue(HasExternalNodes(5).is_feasible(graph, edges))
+        self.assertFalse(HasExternalNodes(len(graph) + 1).is_feasible(graph, set()))
+        self.assertFalse(HasExternalNodes(len(graph)).is_feasible(graph, edges))
+        self.assertFalse(HasExternalNodes(9).is_feasible(graph, out_degree))
+
+        self.assertTrue(IsConnected().is_feasible(graph, edges))
+        self.assertFalse(IsConnected().is_feasible(nx.DiGraph([(0, 1), (2, 3)]), edges))
+
+        self.assertTrue(HasCanalizingNodes(1).is_feasible(graph, in_degree))
+        self.assertFalse(HasCanalizingNodes(0).is_feasible(graph, in_degree))
+        self.assertFalse(HasCanalizingNodes(len(graph) + 1).is_feasible(graph, in_degree))
+        self.assertTrue(HasCanalizingNodes(0).is_feasible(graph, edges))
+        self.assertFalse(HasCanalizingNodes(3).is_feasible(nx.DiGraph([(0, 1), (1, 2)]), edges))
+
+        self.assertFalse((HasExternalNodes(5) & IsConnected()).is_feasible(graph, in_degree))
+        self.assertTrue((HasExternalNodes(5) | IsConnected()).is_feasible(graph, in_degree))
+        self.assertTrue((~HasExternalNodes(graph)).is_feasible(graph, in_degree))
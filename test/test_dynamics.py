@@ -1,4 +1,5 @@
 import math
+import numpy as np
 import networkx as nx
 import randomneet
 import statistics
@@ -6,11 +7,13 @@ import unittest
 
 from neet.boolean.examples import s_pombe, myeloid
 from randomneet.dynamics import NetworkRandomizer, UniformBias, MeanBias, LocalBias, \
-    FixCanalizingMixin
+    FixCanalizingMixin, FunctionPlan, MeanSensitivity
 from randomneet.constraints import GenericDynamical, GenericTopological, ConstraintError
 from randomneet.randomizer import AbstractRandomizer
 from randomneet.topology import TopologyRandomizer, FixedTopology, MeanDegree, InDegree
-from randomneet.constraints import IsConnected, IsIrreducible
+from randomneet.constraints import IsConnected, IsIrreducible, HasCanalizingNodes, \
+    IncrementalConstraint, HasSensitivity
+from randomneet.tables import network_tables
 from itertools import islice
 
 
@@ -28,6 +31,24 @@ class MockTopologyRandomizer(TopologyRandomizer):
         return nx.DiGraph([(i, j) for i in range(self.counter) for j in range(self.counter)])
 
 
+class RewiringTopologyRandomizer(TopologyRandomizer):
+    """
+    A mock topology randomizer which rewires one edge of the same graph in
+    place on every draw
+    """
+    def _randomize(self):
+        """
+        Move the target of a random edge to a node it isn't connected to
+        """
+        graph = self.graph
+        edges = list(graph.edges)
+        source, target = edges[np.random.randint(len(edges))]
+        others = [node for node in graph if not graph.has_edge(source, node)]
+        graph.remove_edge(source, target)
+        graph.add_edge(source, others[np.random.randint(len(others))])
+        return graph
+
+
 class MockNetworkRandomizer(NetworkRandomizer):
     p = 0.0
 
@@ -45,6 +66,40 @@ class MockNetworkRandomizer(NetworkRandomizer):
         return d
 
 
+class RejectAfter(IncrementalConstraint):
+    """
+    An incremental constraint which rejects every network after a fixed number
+    of nodes
+    """
+    calls = 0
+
+    def __init__(self, n):
+        self.n = n
+
+    def satisfies(self, net):
+        return False
+
+    def update(self, state, node, predecessors, table):
+        self.calls += 1
+        return node + 1 < self.n
+
+
+class RewiringTopology(TopologyRandomizer):
+    """
+    A topology randomizer which alternately moves one of myeloid's edges
+    between two targets
+    """
+    counter = 0
+
+    def _randomize(self):
+        self.counter += 1
+        graph = myeloid.network_graph()
+        if self.counter % 2 == 0:
+            graph.remove_edge(0, 1)
+            graph.add_edge(0, 2)
+        return graph
+
+
 class TestNetworkRandomizer(unittest.TestCase):
     """
     Unit tests for the dynamics randomizers
@@ -227,6 +282,150 @@ class TestNetworkRandomizer(unittest.TestCase):
         network = rand.random()
         self.assertEqual(len(network.network_graph()), 10)
 
+    def test_function_plan(self):
+        """
+        Function plans are compiled once per topology and invalidated when the
+        parameters change
+        """
+        rand = UniformBias(s_pombe, 0.25)
+        topology = rand.trand.random()
+        plan = rand._plan(topology)
+        self.assertIsInstance(plan, FunctionPlan)
+        self.assertIs(rand._plan(topology), plan)
+        self.assertEqual(len(plan), len(topology))
+        self.assertEqual(plan.k.tolist(), [topology.in_degree(n) for n in sorted(topology)])
+        self.assertTrue(all(plan.p == 0.25))
+        self.assertFalse(any(plan.canalizing))
+
+        rand.p = 0.75
+        self.assertIsNot(rand._plan(topology), plan)
+        self.assertTrue(all(rand._plan(topology).p == 0.75))
+
+        plan = rand._plan(topology)
+        topology = topology.copy()
+        self.assertIs(rand._plan(topology), plan)
+        source, target = next((a, b) for a, b in topology.edges if a != b and not topology.has_edge(b, a))
+        topology.remove_edge(source, target)
+        topology.add_edge(target, source)
+        self.assertIsNot(rand._plan(topology), plan)
+        self.assertEqual(rand._plan(topology).predecessors,
+                         [tuple(topology.predecessors(n)) for n in sorted(topology)])
+
+        rand = MockNetworkRandomizer(s_pombe)
+        topology = rand.trand.random()
+        self.assertIsNot(rand._plan(topology), rand._plan(topology))
+
+        rand = LocalBias(myeloid)
+        topology = rand.trand.random()
+        self.assertEqual(rand._plan(topology).p.tolist(), rand.local_bias)
+
+        rand = CanalizingUniformBias(s_pombe)
+        plan = rand._plan(rand.trand.random())
+        self.assertEqual(set(plan.nodes[plan.canalizing].tolist()), s_pombe.canalizing_nodes())
+
+    def test_bias_mode(self):
+        """
+        The bias mode must be either exact or bernoulli
+        """
+        self.assertEqual(UniformBias(s_pombe).bias_mode, 'exact')
+        self.assertEqual(UniformBias(s_pombe, bias_mode='bernoulli').bias_mode, 'bernoulli')
+        with self.assertRaises(ValueError):
+            UniformBias(s_pombe, bias_mode='binomial')
+
+    def test_random_functions(self):
+        """
+        Functions drawn together have the correct shape and bias
+        """
+        rand = UniformBias(s_pombe)
+        p = np.array([0.0, 0.25, 0.3, 1.0])
+        tables = rand._random_functions(3, p)
+        self.assertEqual(tables.shape, (4, 8))
+        self.assertEqual(tables.sum(axis=1)[[0, 1, 3]].tolist(), [0, 2, 8])
+        self.assertIn(tables.sum(axis=1)[2], (2, 3))
+
+        rand = UniformBias(s_pombe, bias_mode='bernoulli')
+        tables = rand._random_functions(4, np.full(2000, 0.3))
+        self.assertEqual(tables.shape, (2000, 16))
+        self.assertAlmostEqual(tables.mean(), 0.3, delta=0.01)
+        self.assertGreater(len(set(tables.sum(axis=1).tolist())), 3)
+
+    def test_function_plan_follows_rewired_graph(self):
+        """
+        Networks match their topology even if the topology randomizer
+        modifies the same graph in place without changing its size
+        """
+        rand = UniformBias(s_pombe, trand=RewiringTopologyRandomizer)
+        for _ in range(10):
+            net = rand.random()
+            self.assertEqual(set(rand.trand.graph.edges), set(net.network_graph().edges))
+
+    def test_random_early_exit(self):
+        """
+        Network construction stops as soon as an incremental constraint
+        rejects the network
+        """
+        constraint = RejectAfter(2)
+        rand = UniformBias(s_pombe, constraints=[constraint], timeout=10)
+        with self.assertRaises(ConstraintError):
+            rand.random()
+        self.assertEqual(constraint.calls, 20)
+        self.assertIsNone(rand._randomize(s_pombe.network_graph()))
+
+    def test_correlated(self):
+        """
+        Correlated networks only redraw the functions of nodes whose
+        predecessors changed
+        """
+        with self.assertRaises(ValueError):
+            UniformBias(myeloid, correlated=True)
+
+        rand = UniformBias(myeloid, trand=RewiringTopology(myeloid), correlated=True)
+        for _ in range(3):
+            before, after = network_tables(rand.random()), network_tables(rand.random())
+            for node, ((p, old), (q, new)) in enumerate(zip(before, after)):
+                if node in (1, 2):
+                    self.assertNotEqual(p, q)
+                else:
+                    self.assertEqual(p, q)
+                    self.assertTrue(np.array_equal(old, new))
+
+        rand = UniformBias(myeloid, trand=RewiringTopology(myeloid))
+        before, after = network_tables(rand.random()), network_tables(rand.random())
+        self.assertFalse(all(np.array_equal(old, new)
+                             for (_, old), (_, new) in zip(before, after)))
+
+    def test_constraint_pushdown(self):
+        """
+        The topological operands of conjunctions are given to the topology
+        randomizer
+        """
+        connected = IsConnected()
+        sized = GenericDynamical(lambda net: net.size == myeloid.size)
+        rand = UniformBias(myeloid, trand=MeanDegree, constraints=[connected & sized])
+        self.assertEqual(rand.trand.constraints, [connected])
+        self.assertEqual(rand.constraints, [sized])
+
+        either = connected | sized
+        rand.add_constraint(IsConnected() & either)
+        self.assertEqual(len(rand.trand.constraints), 2)
+        self.assertEqual(rand.constraints, [sized, either])
+        for net in islice(rand, 3):
+            self.assertTrue(connected.satisfies(net.network_graph()))
+
+    def test_random_incremental(self):
+        """
+        Networks accepted via incremental constraints satisfy them
+        """
+        canalizing = HasCanalizingNodes(3)
+        rand = UniformBias(s_pombe, constraints=[canalizing])
+        for net in islice(rand, 10):
+            self.assertTrue(canalizing.satisfies(net))
+
+        irreducible = IsIrreducible()
+        rand = UniformBias(myeloid, constraints=[irreducible], timeout=0)
+        for net in islice(rand, 5):
+            self.assertTrue(irreducible.satisfies(net))
+
 
 class TestUniformBias(unittest.TestCase):
     """
@@ -301,6 +500,65 @@ class TestMeanBias(unittest.TestCase):
         self.assertAlmostEqual(got, rand.p, delta=0.01)
 
 
+class TestMeanSensitivity(unittest.TestCase):
+    """
+    Unit tests for the MeanSensitivity randomizer
+    """
+
+    def test_mean_sensitivity(self):
+        """
+        Ensure that MeanSensitivity is a UniformBias
+        """
+        self.assertIsInstance(MeanSensitivity(myeloid), UniformBias)
+
+    def test_unimplemented(self):
+        """
+        MeanSensitivity is currently only implemented for logic network
+        """
+        with self.assertRaises(NotImplementedError):
+            MeanSensitivity(s_pombe)
+
+    def test_unattainable(self):
+        """
+        MeanSensitivity raises a ValueError if no bias attains the target
+        """
+        with self.assertRaises(ValueError):
+            MeanSensitivity(myeloid, target=3.0)
+
+    def test_solve_bias(self):
+        """
+        In bernoulli mode the bias solves 2p(1-p)<k> = target
+        """
+        rand = MeanSensitivity(myeloid, bias_mode='bernoulli')
+        mean_k = np.mean([len(row[0]) for row in myeloid.table])
+        self.assertAlmostEqual(2 * rand.p * (1 - rand.p) * mean_k, rand.target)
+        self.assertLessEqual(rand.p, 0.5)
+
+        rand = MeanSensitivity(myeloid, target=0.0)
+        self.assertAlmostEqual(rand.p, 0.0)
+
+    def test_sensitivity(self):
+        """
+        Ensure the generated networks have the target average sensitivity (on
+        average)
+        """
+        rand = MeanSensitivity(myeloid, target=0.8)
+        got = statistics.mean(net.average_sensitivity() for net in islice(rand, 200))
+        self.assertAlmostEqual(got, 0.8, delta=0.05)
+
+    def test_tolerance(self):
+        """
+        Providing a tolerance adds a HasSensitivity constraint
+        """
+        self.assertEqual(MeanSensitivity(myeloid).constraints, [])
+        rand = MeanSensitivity(myeloid, tol=0.1)
+        constraint, = rand.constraints
+        self.assertIsInstance(constraint, HasSensitivity)
+        self.assertEqual((constraint.target, constraint.tol), (rand.target, 0.1))
+        for net in islice(rand, 5):
+            self.assertAlmostEqual(net.average_sensitivity(), rand.target, delta=0.1 + 1e-9)
+
+
 class TestLocalBias(unittest.TestCase):
     """
     Unit tests for the LocalBias randomizer
@@ -0,0 +1,96 @@
+import neet
+import numpy as np
+import pickle
+import randomneet
+import unittest
+
+from neet.boolean.examples import myeloid
+from randomneet.constraints import HasCanalizingNodes
+from randomneet.dynamics import LocalBias
+from randomneet.encoded import EncodedLogicNetwork, encode
+from randomneet.mcmc import TableSwap
+from randomneet.tables import network_tables
+
+
+class TestEncoded(unittest.TestCase):
+    """
+    Unit tests for logic networks built from encoded truth tables
+    """
+
+    def test_encoded_module(self):
+        """
+        Ensure that encoded is exported from randomneet
+        """
+        self.assertIn('encoded', randomneet.__all__)
+
+    def test_encode(self):
+        """
+        Ensure that truth tables are encoded as neet encodes conditions
+        """
+        for node, (predecessors, table) in enumerate(network_tables(myeloid)):
+            self.assertEqual(myeloid._encoded_table[node], encode(predecessors, table))
+
+    def test_network(self):
+        """
+        Ensure that encoded networks behave as the equivalent logic networks
+        """
+        net = EncodedLogicNetwork(network_tables(myeloid))
+        self.assertIsInstance(net, neet.boolean.LogicNetwork)
+        self.assertEqual(myeloid.size, net.size)
+        self.assertEqual(myeloid.table, net.table)
+        for state in myeloid:
+            self.assertEqual(myeloid.update(list(state)), net.update(list(state)))
+        self.assertEqual(sorted(myeloid.network_graph().edges), sorted(net.network_graph().edges))
+        self.assertEqual(myeloid.canalizing_nodes(), net.canalizing_nodes())
+        for node in range(myeloid.size):
+            self.assertEqual(myeloid.neighbors_in(node), net.neighbors_in(node))
+            self.assertEqual(myeloid.neighbors_out(node), net.neighbors_out(node))
+
+    def test_network_tables_are_shared(self):
+        """
+        Ensure that the truth tables are kept read-only and returned without
+        reading the conditions
+        """
+        functions = network_tables(myeloid)
+        net = EncodedLogicNetwork(functions)
+        for (_, table), (_, original) in zip(network_tables(net), functions):
+            self.assertIs(original, table)
+            self.assertFalse(table.flags.writeable)
+        self.assertIsNone(net._EncodedLogicNetwork__table)
+
+    def test_reduce_and_pickle(self):
+        """
+        Ensure that encoded networks can be reduced and pickled
+        """
+        functions = [((0, 1), np.array([False, False, True, True])), ((1,), np.array([True, False]))]
+        net = EncodedLogicNetwork(functions)
+        net.reduce_table()
+        self.assertEqual([((0,), {'1'}), ((1,), {'0'})], net.table)
+        self.assertEqual([1, 0], net.update([1, 1]))
+        self.assertEqual((0,), net.functions[0][0])
+
+        copy = pickle.loads(pickle.dumps(EncodedLogicNetwork(network_tables(myeloid))))
+        self.assertEqual(myeloid.table, copy.table)
+
+    def test_invalid_tables(self):
+        """
+        Ensure that invalid tables are rejected
+        """
+        with self.assertRaises(IndexError):
+            EncodedLogicNetwork([((1,), np.array([False, True]))])
+        with self.assertRaises(ValueError):
+            EncodedLogicNetwork([((0,), np.array([False, True, True]))])
+
+    def test_randomizers_build_encoded_networks(self):
+        """
+        Ensure that randomizers construct encoded networks which satisfy the
+        existing constraints
+        """
+        constraint = HasCanalizingNodes(10)
+        for rand in [LocalBias(myeloid, constraints=[constraint]), TableSwap(myeloid, swaps=5)]:
+            rand.add_constraint(constraint)
+            for _ in range(3):
+                net = rand.random()
+                self.assertIsInstance(net, EncodedLogicNetwork)
+                self.assertIsInstance(net, neet.boolean.LogicNetwork)
+                self.assertTrue(constraint.satisfies(net))
@@ -0,0 +1,98 @@
+import networkx as nx
+import numpy as np
+import randomneet
+import unittest
+
+from itertools import islice
+from neet.boolean import LogicNetwork
+from neet.boolean.examples import s_pombe, myeloid
+from randomneet.constraints import ConstraintError
+from randomneet.dynamics import UniformBias
+from randomneet.ensemble import network_hash, BloomFilter, Ensemble
+from randomneet.topology import FixedTopology, MeanDegree
+
+
+class TestEnsemble(unittest.TestCase):
+    """
+    Unit tests for ensemble generation
+    """
+
+    def test_ensemble_module(self):
+        """
+        Ensure that ensemble is exported from randomneet
+        """
+        self.assertTrue('ensemble' in dir(randomneet))
+
+    def test_network_hash(self):
+        """
+        Network hashes are canonical with respect to input order
+        """
+        a = LogicNetwork([((0, 1), {'01', '11'}), ((1,), {'0'})])
+        b = LogicNetwork([((1, 0), {'10', '11'}), ((1,), {'0'})])
+        c = LogicNetwork([((1, 0), {'01', '11'}), ((1,), {'0'})])
+        self.assertEqual(len(network_hash(a)), 16)
+        self.assertEqual(network_hash(a), network_hash(b))
+        self.assertNotEqual(network_hash(a), network_hash(c))
+
+        g = nx.DiGraph([(0, 1), (1, 2)])
+        h = nx.DiGraph([(1, 2), (0, 1)])
+        self.assertEqual(network_hash(g), network_hash(h))
+        self.assertNotEqual(network_hash(g), network_hash(nx.DiGraph([(0, 1), (2, 1)])))
+        self.assertEqual(network_hash(myeloid), network_hash(myeloid))
+
+        with self.assertRaises(TypeError):
+            network_hash(s_pombe)
+
+    def test_bloom_filter(self):
+        """
+        Bloom filters never report false negatives
+        """
+        bloom = BloomFilter(100, 1e-3)
+        digests = [network_hash(nx.DiGraph([(0, i)])) for i in range(100)]
+        for digest in digests:
+            self.assertNotIn(digest, bloom)
+            self.assertFalse(bloom.add(digest))
+        for digest in digests:
+            self.assertIn(digest, bloom)
+            self.assertTrue(bloom.add(digest))
+        with self.assertRaises(ValueError):
+            BloomFilter(0)
+        with self.assertRaises(ValueError):
+            BloomFilter(10, 1.5)
+
+    def test_ensemble(self):
+        """
+        Ensembles generate the requested number of networks
+        """
+        rand = MeanDegree(s_pombe)
+        ensemble = rand.ensemble(5)
+        self.assertIsInstance(ensemble, Ensemble)
+        self.assertEqual(len(list(ensemble)), 5)
+        self.assertEqual(ensemble.duplicates, 0)
+        self.assertEqual(len(list(islice(rand.ensemble(), 3))), 3)
+        with self.assertRaises(ValueError):
+            rand.ensemble(-1)
+
+    def test_unique_ensemble(self):
+        """
+        Unique ensembles skip duplicates and report the duplicate rate
+        """
+        g = nx.DiGraph([(0, 1), (1, 0)])
+        rand = UniformBias(g)
+        ensemble = rand.ensemble(size=4, unique=True)
+        nets = list(ensemble)
+        self.assertEqual(len(set(map(network_hash, nets))), 4)
+        self.assertEqual(ensemble.generated, 4)
+        self.assertGreaterEqual(ensemble.duplicate_rate, 0.0)
+        self.assertLess(ensemble.duplicate_rate, 1.0)
+
+        ensemble = Ensemble(UniformBias(g), size=4, unique=True, capacity=10)
+        self.assertEqual(len(list(ensemble)), 4)
+
+        rand = FixedTopology(g, timeout=10)
+        ensemble = rand.ensemble(unique=True)
+        with self.assertRaises(ConstraintError):
+            list(ensemble)
+        self.assertEqual(ensemble.generated, 1)
+        self.assertEqual(ensemble.duplicates, 10)
+        self.assertTrue(np.isclose(ensemble.duplicate_rate, 10 / 11))
@@ -0,0 +1,83 @@
+import itertools
+import numpy as np
+import randomneet
+import unittest
+
+from neet.boolean.examples import myeloid
+from randomneet.constraints import HasCanalizingNodes
+from randomneet.dynamics import UniformBias
+from randomneet.importance import ImportanceSampler, canalizing_count, effective_sample_size, \
+    weighted_mean
+from randomneet.tables import is_canalizing
+from randomneet.topology import MeanDegree
+
+
+class TestImportance(unittest.TestCase):
+    """
+    Unit tests for the importance sampler
+    """
+
+    def test_importance_module(self):
+        """
+        Ensure that importance is exported from randomneet
+        """
+        self.assertIn('importance', randomneet.__all__)
+
+    def test_canalizing_count(self):
+        """
+        Ensure that canalizing functions are counted correctly, by comparison
+        with brute-force enumeration
+        """
+        for k in range(4):
+            volume = 2**k
+            counts = [0] * (volume + 1)
+            for table in itertools.product([False, True], repeat=volume):
+                if is_canalizing(np.array(table)):
+                    counts[sum(table)] += 1
+            self.assertEqual([canalizing_count(k, m) for m in range(volume + 1)], counts)
+
+    def test_effective_sample_size(self):
+        """
+        Ensure that the effective sample size and weighted means are computed
+        """
+        self.assertEqual(0.0, effective_sample_size([]))
+        self.assertAlmostEqual(4.0, effective_sample_size([-3.0] * 4))
+        self.assertAlmostEqual(1.0, effective_sample_size([0.0, -1000.0, -1000.0]))
+        self.assertAlmostEqual(1.8, effective_sample_size(np.log([1.0, 2.0])))
+
+        self.assertAlmostEqual(2.0, weighted_mean([1.0, 3.0], [5.0, 5.0]))
+        self.assertAlmostEqual(7.0 / 3.0, weighted_mean([1.0, 3.0], np.log([1.0, 2.0])))
+
+    def test_sampler_requires_network_randomizer(self):
+        """
+        Ensure that only network randomizers can be importance sampled
+        """
+        with self.assertRaises(TypeError):
+            ImportanceSampler(MeanDegree(myeloid), 3)
+        with self.assertRaises(ValueError):
+            ImportanceSampler(UniformBias(myeloid), -1)
+
+    def test_samples_hit_target(self):
+        """
+        Ensure that every sample has exactly the target number of canalizing
+        nodes, and that with a fixed topology every weight is equal
+        """
+        sampler = ImportanceSampler(UniformBias(myeloid, p=0.5), HasCanalizingNodes(3))
+        constraint = HasCanalizingNodes(3)
+        samples = [sampler.sample() for _ in range(20)]
+        for net, _ in samples:
+            self.assertTrue(constraint.satisfies(net))
+        weights = [w for _, w in samples]
+        self.assertTrue(np.all(np.isfinite(weights)))
+        self.assertTrue(np.allclose(weights, weights[0]))
+        self.assertAlmostEqual(20.0, sampler.effective_sample_size)
+
+    def test_samples_with_random_topology(self):
+        """
+        Ensure that weights vary with the topology, but never exceed one
+        """
+        sampler = ImportanceSampler(UniformBias(myeloid, trand=MeanDegree), 5)
+        weights = [w for _, w in itertools.islice(sampler, 20)]
+        self.assertEqual(weights, sampler.log_weights)
+        self.assertTrue(all(w <= 0 for w in weights))
+        self.assertLessEqual(sampler.effective_sample_size, 20.0)
@@ -0,0 +1,63 @@
+import randomneet
+import subprocess
+import sys
+import unittest
+
+
+class TestImports(unittest.TestCase):
+    """
+    Regression tests for the cost of importing randomneet
+    """
+
+    def run_python(self, code, *flags):
+        """
+        Run python code in a fresh interpreter and return its standard output
+        and error
+        """
+        result = subprocess.run([sys.executable] + list(flags) + ['-c', code],
+                                stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                                universal_newlines=True, check=True)
+        return result.stdout, result.stderr
+
+    def loaded(self, statement):
+        """
+        Get the heavy dependencies loaded by an import statement
+        """
+        code = statement + '; import sys; ' \
+            + 'print(sorted(m for m in ("neet", "networkx", "numpy") if m in sys.modules))'
+        return self.run_python(code)[0].strip()
+
+    def test_submodules_are_listed(self):
+        """
+        Lazily imported submodules are still listed and accessible
+        """
+        for name in randomneet.__all__:
+            self.assertIn(name, dir(randomneet))
+            self.assertEqual(getattr(randomneet, name).__name__, 'randomneet.' + name)
+        with self.assertRaises(AttributeError):
+            randomneet.missing
+
+    @unittest.skipIf(sys.version_info < (3, 7), 'lazy imports require Python 3.7')
+    def test_lazy_imports(self):
+        """
+        Importing randomneet, or only one subsystem, does not import
+        dependencies it does not need
+        """
+        self.assertEqual(self.loaded('import randomneet'), '[]')
+        self.assertEqual(self.loaded('import randomneet.cli'), '[]')
+        self.assertEqual(self.loaded('import randomneet.tables'), "['numpy']")
+        self.assertEqual(self.loaded('import randomneet.topology'), "['networkx', 'numpy']")
+        self.assertEqual(self.loaded('import randomneet.dynamics'),
+                         "['neet', 'networkx', 'numpy']")
+
+    @unittest.skipIf(sys.version_info < (3, 7), 'lazy imports require Python 3.7')
+    def test_import_is_cheap(self):
+        """
+        Importing randomneet loads none of its submodules, nor any heavy
+        dependency
+        """
+        heavy = ['neet', 'networkx', 'numpy', 'scipy', 'matplotlib', 'pandas']
+        code = 'import randomneet, sys; ' \
+            + 'print(sorted(m for m in sys.modules if m.split(".")[0] in {!r} '.format(heavy) \
+            + 'or m.startswith("randomneet.")))'
+        self.assertEqual(self.run_python(code)[0].strip(), '[]')
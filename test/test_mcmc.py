@@ -0,0 +1,243 @@
+import networkx as nx
+import numpy as np
+import randomneet
+import unittest
+
+from neet.boolean.examples import myeloid, s_pombe
+from randomneet.attractors import fixed_points
+from randomneet.constraints import IsConnected, IsIrreducible, HasCanalizingNodes, HasSensitivity, \
+    HasFixedPoints, IncrementalConstraint
+from randomneet.mcmc import EdgeSwap, TableSwap, run_chains, autocorrelation, decorrelation_lag, \
+    potential_scale_reduction
+from randomneet.tables import network_tables
+from randomneet.topology import InDegree
+
+
+class TestMCMC(unittest.TestCase):
+    """
+    Unit tests for the edge-swap Markov chain
+    """
+
+    def test_mcmc_module(self):
+        """
+        Ensure that mcmc is exported from randomneet
+        """
+        self.assertIn('mcmc', randomneet.__all__)
+
+    def test_autocorrelation(self):
+        """
+        Ensure that autocorrelations and decorrelation lags are computed
+        """
+        self.assertIsNone(autocorrelation([1.0] * 10))
+        self.assertEqual(decorrelation_lag([1.0] * 10), 1)
+
+        alternating = [1.0, -1.0] * 50
+        acf = autocorrelation(alternating, max_lag=2)
+        self.assertEqual(len(acf), 3)
+        self.assertAlmostEqual(acf[0], 1.0)
+        self.assertLess(acf[1], -0.9)
+        self.assertEqual(decorrelation_lag(alternating), 1)
+
+        self.assertIsNone(decorrelation_lag(np.arange(100.0), threshold=-2.0))
+
+    def test_potential_scale_reduction(self):
+        """
+        Ensure that the potential scale reduction detects unmixed chains
+        """
+        self.assertTrue(np.isnan(potential_scale_reduction([[1.0, 2.0]])))
+        mixed = np.random.rand(4, 500)
+        self.assertAlmostEqual(potential_scale_reduction(mixed), 1.0, delta=0.05)
+        self.assertGreater(potential_scale_reduction(mixed + np.arange(4)[:, np.newaxis]), 1.5)
+
+    def test_preserves_degrees(self):
+        """
+        Ensure that the chain preserves every node's degrees
+        """
+        rand = EdgeSwap(s_pombe)
+        graph = s_pombe.network_graph()
+        self.assertIn('in_degree', rand.preserves)
+        for _ in range(5):
+            G = rand.random()
+            self.assertEqual(dict(G.in_degree()), dict(graph.in_degree()))
+            self.assertEqual(dict(G.out_degree()), dict(graph.out_degree()))
+            self.assertEqual(G.number_of_edges(), graph.number_of_edges())
+        self.assertGreater(rand.swaps, 0)
+        self.assertLess(rand.overlap(), 1.0)
+
+    def test_self_loops(self):
+        """
+        Ensure that self-loops are not created if they are disallowed
+        """
+        graph = nx.DiGraph([(0, 1), (1, 2), (2, 3), (3, 0), (0, 2), (1, 3)])
+        rand = EdgeSwap(graph, self_loops=False, thin=20, burn_in=0)
+        for _ in range(20):
+            self.assertEqual(nx.number_of_selfloops(rand.random()), 0)
+
+    def test_node_labels(self):
+        """
+        Ensure that graphs must have nodes labeled 0, ..., n-1
+        """
+        with self.assertRaises(ValueError):
+            EdgeSwap(nx.DiGraph([(1, 2), (2, 3)]))
+
+    def test_tune(self):
+        """
+        Ensure that tuning sets the burn-in, thinning and diagnostics
+        """
+        rand = EdgeSwap(myeloid, constraints=[IsConnected()])
+        self.assertIsNone(rand.thin)
+        rand.random()
+        self.assertGreater(rand.thin, 0)
+        self.assertGreater(rand.burn_in, 0)
+        for key in ['burn_in', 'thin', 'swap_rate', 'overlap', 'expected_overlap',
+                    'assortativity', 'converged']:
+            self.assertIn(key, rand.diagnostics)
+        self.assertAlmostEqual(rand.diagnostics['overlap'],
+                               rand.diagnostics['expected_overlap'], delta=0.2)
+
+        steps = rand.steps
+        rand.random()
+        self.assertEqual(rand.steps - steps, rand.thin)
+
+    def test_burn_in_without_tuning(self):
+        """
+        Ensure that a chain with a fixed thinning interval still burns in,
+        unless the burn-in is provided
+        """
+        rand = EdgeSwap(myeloid, thin=1)
+        rand.random()
+        self.assertEqual(1, rand.thin)
+        self.assertGreater(rand.burn_in, 0)
+        self.assertEqual(rand.burn_in + 1, rand.steps)
+        self.assertEqual(rand.burn_in, rand.diagnostics['burn_in'])
+        self.assertAlmostEqual(rand.expected_overlap(), rand.overlap(), delta=0.3)
+
+        rand = EdgeSwap(myeloid, thin=1, burn_in=0)
+        rand.random()
+        self.assertEqual(1, rand.steps)
+        self.assertGreater(rand.overlap(), 0.9)
+
+    def test_run_chains(self):
+        """
+        Ensure that independent chains are run and diagnosed
+        """
+        with self.assertRaises(TypeError):
+            run_chains(myeloid, 4)
+        with self.assertRaises(ValueError):
+            run_chains(EdgeSwap(myeloid), 4, chains=0)
+
+        graphs, diagnostics = run_chains(EdgeSwap(myeloid), 10, chains=3, processes=0)
+        self.assertEqual(len(graphs), 10)
+        self.assertEqual(len(diagnostics['chains']), 3)
+        self.assertIn('rhat', diagnostics)
+
+        graphs, diagnostics = run_chains(EdgeSwap(myeloid, thin=50, burn_in=100), 6, chains=2)
+        self.assertEqual(len(graphs), 6)
+        for G in graphs:
+            self.assertEqual(dict(G.in_degree()), dict(myeloid.network_graph().in_degree()))
+
+
+class TestTableSwap(unittest.TestCase):
+    """
+    Unit tests for the truth-table row-swap Markov chain
+    """
+
+    def distance(self, a, b):
+        """
+        Count the truth-table rows in which two networks differ.
+        """
+        return sum(int(np.sum(x != y)) for (_, x), (_, y) in zip(network_tables(a), network_tables(b)))
+
+    def test_requires_logic_network(self):
+        """
+        Ensure that the chain requires a logic network and a fixed topology
+        """
+        with self.assertRaises(NotImplementedError):
+            TableSwap(s_pombe)
+        with self.assertRaises(NotImplementedError):
+            TableSwap(myeloid, trand=InDegree)
+        with self.assertRaises(ValueError):
+            TableSwap(myeloid, swaps=0)
+
+    def test_preserves_bias(self):
+        """
+        Ensure that samples have the topology and local bias of the base
+        network, within the expected distance when restarting
+        """
+        rand = TableSwap(myeloid, swaps=3, restart=True)
+        bias = [np.sum(table) for _, table in network_tables(myeloid)]
+        for _ in range(20):
+            net = rand.random()
+            self.assertEqual([p for p, _ in network_tables(net)],
+                             [p for p, _ in network_tables(myeloid)])
+            self.assertEqual([np.sum(table) for _, table in network_tables(net)], bias)
+            self.assertEqual(self.distance(net, myeloid), rand.distance)
+            self.assertLessEqual(rand.distance, 6)
+        self.assertEqual(rand.steps, 60)
+
+    def test_chain_continues(self):
+        """
+        Ensure that the chain continues from the previous sample unless it
+        restarts
+        """
+        rand = TableSwap(myeloid, swaps=2)
+        previous = rand.random()
+        for _ in range(10):
+            net = rand.random()
+            self.assertLessEqual(self.distance(net, previous), 4)
+            previous = net
+        self.assertEqual(self.distance(previous, myeloid), rand.distance)
+
+    def test_constraints(self):
+        """
+        Ensure that samples satisfy both tracked and untracked constraints
+        """
+        target = fixed_points(myeloid)
+        constraints = [IsIrreducible(), HasCanalizingNodes(myeloid),
+                       HasSensitivity(myeloid, 0.1), HasFixedPoints(target)]
+        rand = TableSwap(myeloid, constraints=constraints, swaps=2)
+        for _ in range(10):
+            net = rand.random()
+            for constraint in constraints:
+                self.assertTrue(constraint.satisfies(net))
+
+    def test_tracked_tables(self):
+        """
+        Ensure that tracked constraints are given each node's previous and
+        current truth tables, including when they are added mid-chain
+        """
+        class Follow(IncrementalConstraint):
+            __slots__ = ()
+
+            def satisfies(self, net):
+                return super().satisfies(net)
+
+            def begin(self, topology):
+                return {}
+
+            def update(self, state, node, predecessors, table):
+                state[node] = table.copy()
+                return True
+
+            def replace(self, state, node, predecessors, old, new):
+                if not np.array_equal(state[node], old) or np.sum(old != new) != 2:
+                    raise AssertionError('replace was given the wrong tables')
+                state[node] = new.copy()
+                return True
+
+        rand = TableSwap(myeloid, swaps=5)
+        rand.random()
+        rand.add_constraint(Follow())
+        for _ in range(10):
+            net = rand.random()
+        tables = rand._TableSwap__tracked[0][1]
+        for node, (_, table) in enumerate(network_tables(net)):
+            self.assertTrue(np.array_equal(tables[node], table))
+
+    def test_infeasible_start(self):
+        """
+        Ensure that the chain walks freely until it satisfies the constraints
+        """
+        rand = TableSwap(myeloid, constraints=[HasCanalizingNodes(10)], swaps=5)
+        for _ in range(5):
+            self.assertEqual(len(rand.random().canalizing_nodes()), 10)
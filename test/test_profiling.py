@@ -0,0 +1,137 @@
+import json
+import os
+import randomneet
+import tempfile
+import unittest
+
+from neet.boolean.examples import myeloid
+from randomneet.constraints import IsConnected, IsIrreducible, HasCanalizingNodes
+from randomneet.dynamics import UniformBias
+from randomneet.profiling import Profiler, HistogramProfiler, StageStats
+from randomneet.topology import FixedTopology, MeanDegree
+
+
+class RecordingProfiler(Profiler):
+    """
+    A profiler which records the order in which stages start and stop
+    """
+    def __init__(self):
+        self.calls = []
+
+    def start(self, stage):
+        self.calls.append(('start', stage))
+
+    def stop(self, stage):
+        self.calls.append(('stop', stage))
+
+
+class TestProfiling(unittest.TestCase):
+    """
+    Unit tests for the profiling hooks
+    """
+
+    def test_profiling_module(self):
+        """
+        Ensure that profiling is exported from randomneet
+        """
+        self.assertIn('profiling', randomneet.__all__)
+
+    def test_profiler_type(self):
+        """
+        Randomizers only accept Profiler instances
+        """
+        with self.assertRaises(TypeError):
+            FixedTopology(myeloid, profiler=object())
+        rand = FixedTopology(myeloid)
+        self.assertIsNone(rand.profiler)
+        with self.assertRaises(TypeError):
+            rand.profiler = 5
+
+    def test_stages(self):
+        """
+        Stages are properly nested and cover topology, function sampling,
+        construction and each constraint
+        """
+        profiler = RecordingProfiler()
+        rand = UniformBias(myeloid, trand=MeanDegree, profiler=profiler,
+                           constraints=[IsConnected(), HasCanalizingNodes(4)], timeout=0)
+        self.assertIs(rand.trand.profiler, profiler)
+        rand.random()
+
+        stack = []
+        for event, stage in profiler.calls:
+            if event == 'start':
+                stack.append(stage)
+            else:
+                self.assertEqual(stack.pop(), stage)
+        self.assertEqual(stack, [])
+
+        stages = set(stage for _, stage in profiler.calls)
+        self.assertTrue({'topology', 'randomize', 'functions', 'construct',
+                         'constraint:IsConnected', 'constraint:HasCanalizingNodes'} <= stages)
+
+    def test_disable(self):
+        """
+        Setting the profiler to None disables profiling
+        """
+        profiler = HistogramProfiler()
+        rand = UniformBias(myeloid, profiler=profiler)
+        rand.profiler = None
+        rand.random()
+        self.assertEqual(profiler.stats, {})
+
+    def test_stage_stats(self):
+        """
+        Stage statistics track durations and their distribution
+        """
+        stats = StageStats()
+        for duration in (1, 3, 4, 100):
+            stats.add(duration)
+        self.assertEqual((stats.count, stats.total, stats.min, stats.max), (4, 108, 1, 100))
+        self.assertEqual(stats.mean, 27.0)
+        self.assertEqual(stats.histogram[:7], [1, 1, 1, 0, 0, 0, 1])
+        self.assertEqual(stats.quantile(0.5), 4)
+        self.assertEqual(stats.quantile(1.0), 100)
+
+    def test_histogram_profiler(self):
+        """
+        The histogram profiler aggregates stage durations
+        """
+        profiler = HistogramProfiler()
+        rand = UniformBias(myeloid, constraints=[IsIrreducible()], profiler=profiler, timeout=0)
+        rand.random()
+        self.assertEqual(profiler.stats['topology'].count, 1)
+        self.assertEqual(profiler.stats['construct'].count, 1)
+        self.assertGreaterEqual(profiler.stats['constraint:IsIrreducible'].count, myeloid.size)
+        self.assertEqual(profiler.events, [])
+        self.assertIn('constraint:IsIrreducible', profiler.report())
+
+        with self.assertRaises(ValueError):
+            profiler.start('a')
+            profiler.stop('b')
+
+        profiler.clear()
+        self.assertEqual(profiler.stats, {})
+
+    def test_chrome_trace(self):
+        """
+        Recorded stages are exported in the Chrome trace event format
+        """
+        profiler = HistogramProfiler(trace=True, max_events=10)
+        rand = UniformBias(myeloid, profiler=profiler)
+        for _ in range(5):
+            rand.random()
+        self.assertEqual(len(profiler.events), 10)
+
+        handle, path = tempfile.mkstemp(suffix='.json')
+        os.close(handle)
+        try:
+            profiler.write_chrome_trace(path)
+            with open(path) as f:
+                trace = json.load(f)
+        finally:
+            os.remove(path)
+        self.assertEqual(len(trace['traceEvents']), 10)
+        for event in trace['traceEvents']:
+            self.assertEqual(event['ph'], 'X')
+            self.assertGreaterEqual(event['dur'], 0)
@@ -4,7 +4,10 @@ import unittest
 
 from neet.boolean.examples import s_pombe, myeloid
 from randomneet.randomizer import AbstractRandomizer
-from randomneet.constraints import IsIrreducible, IsConnected, GenericTopological, ConstraintError
+from randomneet.constraints import IsIrreducible, IsConnected, GenericTopological, ConstraintError, \
+    HasExternalNodes, HasCanalizingNodes, GenericDynamical
+from randomneet.dynamics import UniformBias
+from randomneet.topology import InDegree, MeanDegree, NonIsomorphic, ConfigurationModel
 from itertools import islice
 
 
@@ -24,6 +27,31 @@ class MockRandomizer(AbstractRandomizer):
         return g
 
 
+class OverridingConnected(IsConnected):
+    """
+    A connectivity constraint which only overrides ``satisfies``
+    """
+    def satisfies(self, graph):
+        return super().satisfies(graph)
+
+
+class CountingConnected(IsConnected):
+    """
+    A connectivity constraint which counts calls to ``satisfies`` and its
+    fast path
+    """
+    checked = 0
+    tested = 0
+
+    def satisfies(self, graph):
+        self.checked += 1
+        return super().satisfies(graph)
+
+    def _test(self, graph):
+        self.tested += 1
+        return super()._test(graph)
+
+
 class TestRandomizer(unittest.TestCase):
     """
     Unit tests for the abstract randomizer and it's ilk
@@ -162,6 +190,77 @@ class TestRandomizer(unittest.TestCase):
         g = rand.random()
         self.assertEqual(len(g), 3)
 
+    def test_randomizer_acceptance(self):
+        """
+        Ensure that randomizers count attempted and accepted candidates
+        """
+        constraint = GenericTopological(lambda g: len(g) % 2 == 1)
+        rand = MockRandomizer(s_pombe, constraints=[constraint])
+        self.assertIsNone(rand.acceptance_rate)
+        rand.random()
+        rand.random()
+        self.assertEqual((rand.attempts, rand.accepted), (4, 2))
+        self.assertEqual(rand.acceptance_rate, 0.5)
+
+    def test_constraint_compile(self):
+        """
+        Constraints compile to their fast path unless a subclass overrides
+        ``satisfies``
+        """
+        constraint = IsConnected()
+        self.assertEqual(constraint.compile(), constraint._test)
+        constraint = OverridingConnected()
+        self.assertEqual(constraint.compile(), constraint.satisfies)
+        constraint = CountingConnected()
+        self.assertEqual(constraint.compile(), constraint._test)
+
+    def test_constraint_chain_elides_proven(self):
+        """
+        Constraints whose invariant is preserved, and which hold for the base
+        graph, are elided from the constraint chain
+        """
+        external = HasExternalNodes(myeloid.network_graph())
+        self.assertEqual(len(InDegree(myeloid, constraints=[external])._constraint_chain()), 0)
+        with self.assertRaises(ConstraintError):
+            InDegree(myeloid, constraints=[HasExternalNodes(5)])
+        self.assertEqual(len(MeanDegree(myeloid, constraints=[external])._constraint_chain()), 1)
+        self.assertEqual(len(InDegree(myeloid, constraints=[IsConnected()])._constraint_chain()), 1)
+
+        rand = NonIsomorphic(InDegree(myeloid), constraints=[external])
+        self.assertEqual(rand.preserves, InDegree.preserves)
+        self.assertEqual(len(rand._constraint_chain()), 0)
+
+    def test_constraint_chain_recompiles(self):
+        """
+        The constraint chain is recompiled when the constraints change
+        """
+        rand = MockRandomizer(nx.DiGraph(), constraints=[IsConnected()])
+        chain = rand._constraint_chain()
+        self.assertIs(rand._constraint_chain(), chain)
+        rand.constraints = rand.constraints & GenericTopological(lambda g: True)
+        self.assertEqual(len(rand._constraint_chain()), 2)
+        rand.add_constraint(IsConnected())
+        self.assertEqual(len(rand._constraint_chain()), 3)
+        rand.constraints = []
+        self.assertEqual(len(rand._constraint_chain()), 0)
+
+    def test_constraint_chain_validates_once(self):
+        """
+        Only the first network tested after compiling the chain goes through
+        the type checks of ``satisfies``
+        """
+        constraint = CountingConnected()
+        rand = MockRandomizer(nx.DiGraph(), constraints=[constraint])
+        rand._randomize = lambda: nx.DiGraph([(0, 1)])
+        for _ in range(3):
+            rand.random()
+        self.assertEqual((constraint.checked, constraint.tested), (1, 3))
+
+        rand = MockRandomizer(nx.DiGraph(), constraints=[IsConnected()])
+        rand._randomize = lambda: s_pombe
+        with self.assertRaises(TypeError):
+            rand.random()
+
     def test_randomizers_are_iterable(self):
         """
         Ensure that randomizers are iterable.
@@ -172,3 +271,49 @@ class TestRandomizer(unittest.TestCase):
         rand = MockRandomizer(s_pombe)
         gs = list(map(len, take(5, rand)))
         self.assertEqual(gs, [0, 1, 2, 3, 4])
+
+    def test_infeasible_constraints_fail_immediately(self):
+        """
+        Ensure that constraints which can never be satisfied are rejected
+        when they are set or added
+        """
+        with self.assertRaises(ConstraintError):
+            ConfigurationModel(myeloid, constraints=[HasExternalNodes(5)])
+        rand = InDegree(myeloid)
+        with self.assertRaises(ConstraintError):
+            rand.add_constraint(HasExternalNodes(5))
+        self.assertEqual(0, len(rand.constraints))
+
+        with self.assertRaises(ConstraintError):
+            UniformBias(nx.DiGraph([(0, 1), (1, 2), (2, 1)]), trand=InDegree,
+                        constraints=[HasCanalizingNodes(3)])
+        rand = UniformBias(myeloid, trand=MeanDegree)
+        with self.assertRaises(ConstraintError):
+            rand.add_constraint(HasCanalizingNodes(myeloid.size + 1))
+        with self.assertRaises(ConstraintError):
+            rand.add_constraint(HasExternalNodes(myeloid.size))
+
+    def test_estimate_acceptance(self):
+        """
+        Ensure that the acceptance rate is estimated from a pilot run, and a
+        timeout recommended
+        """
+        rand = MockRandomizer(s_pombe, constraints=[GenericTopological(lambda g: len(g) % 2 == 0)])
+        estimate = rand.estimate_acceptance(trials=10)
+        self.assertEqual(0.5, estimate.rate)
+        self.assertEqual(10, estimate.trials)
+        self.assertEqual(10, estimate.timeout)
+        self.assertEqual(0, rand.attempts)
+        self.assertEqual(1000, rand.timeout)
+
+        rand = UniformBias(myeloid, trand=InDegree)
+        self.assertEqual((1.0, 20, 1), rand.estimate_acceptance(trials=20))
+        self.assertEqual((0, 0), (rand.attempts, rand.trand.attempts))
+
+        rand = UniformBias(myeloid, constraints=[GenericDynamical(lambda net: False)])
+        self.assertEqual((0.0, 5, None), rand.estimate_acceptance(trials=5))
+
+        with self.assertRaises(ValueError):
+            rand.estimate_acceptance(trials=0)
+        with self.assertRaises(ValueError):
+            rand.estimate_acceptance(failure=1.0)
@@ -0,0 +1,134 @@
+import asyncio
+import networkx as nx
+import randomneet
+import unittest
+
+from neet.boolean.examples import s_pombe
+from randomneet.constraints import ConstraintError, GenericTopological
+from randomneet.dynamics import UniformBias
+from randomneet.mcmc import EdgeSwap
+from randomneet.service import AsyncRandomizer
+from randomneet.topology import MeanDegree
+
+
+class TestAsyncRandomizer(unittest.TestCase):
+    """
+    Unit tests for the asynchronous randomizer service
+    """
+
+    def run_async(self, coroutine):
+        """
+        Run a coroutine on a fresh event loop
+        """
+        loop = asyncio.new_event_loop()
+        try:
+            return loop.run_until_complete(coroutine)
+        finally:
+            loop.close()
+
+    def test_service_module(self):
+        """
+        Ensure that service is exported from randomneet
+        """
+        self.assertTrue('service' in dir(randomneet))
+
+    def test_invalid_init(self):
+        """
+        AsyncRandomizer validates its arguments
+        """
+        with self.assertRaises(TypeError):
+            AsyncRandomizer(s_pombe)
+        with self.assertRaises(ValueError):
+            AsyncRandomizer(MeanDegree(s_pombe), maxsize=0)
+        with self.assertRaises(ValueError):
+            AsyncRandomizer(MeanDegree(s_pombe), workers=0)
+
+    def test_next_network(self):
+        """
+        Networks can be awaited and iterated over
+        """
+        async def consume():
+            rand = AsyncRandomizer(UniformBias(s_pombe), maxsize=4, workers=2)
+            self.assertFalse(rand.started)
+            first = await rand.next_network()
+            self.assertTrue(rand.started)
+            rest = []
+            async for net in rand:
+                rest.append(net)
+                if len(rest) == 3:
+                    break
+            self.assertLessEqual(rand.qsize(), 4)
+            await rand.close()
+            return [first] + rest
+
+        nets = self.run_async(consume())
+        self.assertEqual(len(nets), 4)
+        for net in nets:
+            self.assertEqual(net.size, s_pombe.size)
+
+    def test_processes(self):
+        """
+        Networks can be generated by worker processes
+        """
+        async def consume():
+            async with AsyncRandomizer(MeanDegree(s_pombe), workers=2, processes=True) as rand:
+                return [await rand.next_network() for _ in range(4)]
+
+        graphs = self.run_async(consume())
+        self.assertEqual(len(graphs), 4)
+        for graph in graphs:
+            self.assertIsInstance(graph, nx.DiGraph)
+            self.assertEqual(graph.size(), s_pombe.network_graph().size())
+
+    def test_thread_workers_use_copies(self):
+        """
+        Several thread workers draw from their own copies of a randomizer, as
+        randomizers are not thread-safe
+        """
+        graph = nx.gnm_random_graph(100, 600, directed=True, seed=2024)
+        chain = EdgeSwap(graph, thin=2000, burn_in=0)
+
+        async def consume():
+            async with AsyncRandomizer(chain, maxsize=2, workers=4) as rand:
+                return [await rand.next_network() for _ in range(8)]
+
+        graphs = self.run_async(consume())
+        self.assertEqual(len(graphs), 8)
+        for g in graphs:
+            self.assertEqual(dict(graph.in_degree()), dict(g.in_degree()))
+            self.assertEqual(dict(graph.out_degree()), dict(g.out_degree()))
+        self.assertEqual(0, chain.attempts)
+
+    def test_failure(self):
+        """
+        Errors raised by the randomizer are raised by the consumer
+        """
+        async def consume():
+            rand = MeanDegree(s_pombe, constraints=[GenericTopological(lambda g: False)],
+                              timeout=5)
+            async with AsyncRandomizer(rand) as service:
+                await service.next_network()
+
+        with self.assertRaises(ConstraintError):
+            self.run_async(consume())
+
+    def test_failure_is_kept(self):
+        """
+        Every request after a failure raises the error rather than waiting
+        for a network which will never be produced
+        """
+        async def consume():
+            rand = MeanDegree(s_pombe, constraints=[GenericTopological(lambda g: False)],
+                              timeout=5)
+            errors = []
+            async with AsyncRandomizer(rand) as service:
+                for _ in range(3):
+                    try:
+                        await asyncio.wait_for(service.next_network(), 5)
+                    except ConstraintError as err:
+                        errors.append(err)
+            return errors
+
+        errors = self.run_async(consume())
+        self.assertEqual(3, len(errors))
+        self.assertIs(errors[0], errors[2])
@@ -0,0 +1,120 @@
+import multiprocessing
+import networkx as nx
+import pickle
+import randomneet
+import unittest
+
+from neet.boolean.examples import myeloid
+from randomneet.dynamics import UniformBias
+from randomneet.encoded import EncodedLogicNetwork
+from randomneet.shared import SharedNetwork, shared_memory
+from randomneet.tables import network_tables
+from randomneet.topology import FixedTopology
+
+
+def _worker_tables(shared):
+    """
+    Reconstruct a shared network in a worker process
+    """
+    net = shared.network()
+    tables = [(p, t.tolist()) for p, t in network_tables(net)]
+    shared.close()
+    return tables
+
+
+@unittest.skipIf(shared_memory is None, 'shared memory requires Python 3.8 or later')
+class TestSharedNetwork(unittest.TestCase):
+    """
+    Unit tests for networks exported to shared memory
+    """
+
+    def test_shared_module(self):
+        """
+        Ensure that shared is exported from randomneet
+        """
+        self.assertIn('shared', randomneet.__all__)
+
+    def test_create_requires_network(self):
+        """
+        Ensure that only logic networks and graphs can be exported
+        """
+        with self.assertRaises(TypeError):
+            SharedNetwork.create(5)
+
+        graph = nx.DiGraph([('a', 'b')])
+        with self.assertRaises(ValueError):
+            SharedNetwork.create(graph)
+
+    def test_logic_network(self):
+        """
+        Ensure that logic networks round-trip through shared memory
+        """
+        with SharedNetwork.create(myeloid) as shared:
+            self.assertEqual(shared.size, myeloid.size)
+            expected = network_tables(myeloid)
+            for node, (predecessors, table) in enumerate(expected):
+                self.assertEqual(tuple(shared.predecessors(node)), predecessors)
+                self.assertEqual(shared.table(node).tolist(), table.tolist())
+
+            net = shared.network()
+            self.assertIsInstance(net, EncodedLogicNetwork)
+            self.assertEqual(net._encoded_table, myeloid._encoded_table)
+            self.assertEqual(net.names, myeloid.names)
+            self.assertEqual(net.table, myeloid.table)
+
+    def test_graph(self):
+        """
+        Ensure that graphs round-trip through shared memory
+        """
+        graph = myeloid.network_graph()
+        with SharedNetwork.create(graph) as shared:
+            got = shared.network()
+            self.assertEqual(set(got.nodes), set(graph.nodes))
+            self.assertEqual(set(got.edges), set(graph.edges))
+
+    def test_attach(self):
+        """
+        Ensure that attaching to a shared network gives views of the same memory
+        """
+        with SharedNetwork.create(myeloid) as shared:
+            attached = pickle.loads(pickle.dumps(shared))
+            self.assertFalse(attached.owner)
+            self.assertEqual(attached.indices.tolist(), shared.indices.tolist())
+            self.assertEqual(attached.tables.tolist(), shared.tables.tolist())
+
+            original = int(shared.tables[0])
+            shared.tables[0] = 255 - original
+            self.assertEqual(attached.tables[0], 255 - original)
+            shared.tables[0] = original
+            attached.close()
+
+    def test_pickle_is_small(self):
+        """
+        Ensure that pickling a shared network only pickles its handle
+        """
+        with SharedNetwork.create(myeloid) as shared:
+            self.assertLess(len(pickle.dumps(shared)), len(pickle.dumps(myeloid)))
+
+    def test_worker(self):
+        """
+        Ensure that worker processes can reconstruct the network
+        """
+        with SharedNetwork.create(myeloid) as shared:
+            pool = multiprocessing.Pool(2)
+            try:
+                results = pool.map(_worker_tables, [shared, shared])
+            finally:
+                pool.close()
+                pool.join()
+        expected = [(p, t.tolist()) for p, t in network_tables(myeloid)]
+        for tables in results:
+            self.assertEqual(tables, expected)
+
+    def test_randomizer(self):
+        """
+        Ensure that randomizers can be constructed from a shared network
+        """
+        with SharedNetwork.create(myeloid) as shared:
+            rand = shared.randomizer(UniformBias, trand=FixedTopology)
+            self.assertIsInstance(rand, UniformBias)
+            self.assertEqual(rand.random().size, myeloid.size)
@@ -0,0 +1,133 @@
+import numpy as np
+import pickle
+import randomneet
+import unittest
+
+from neet.boolean.examples import myeloid
+from randomneet.dynamics import UniformBias
+from randomneet.summary import Moments, Histogram, Summary, summarize
+from randomneet.topology import MeanDegree
+
+
+class TestSummary(unittest.TestCase):
+    """
+    Unit tests for the streaming summary accumulators
+    """
+
+    def test_summary_module(self):
+        """
+        Ensure that summary is exported from randomneet
+        """
+        self.assertIn('summary', randomneet.__all__)
+
+    def test_moments(self):
+        """
+        Ensure that streamed and merged moments agree with numpy
+        """
+        values = np.random.rand(100)
+        moments = Moments()
+        self.assertTrue(np.isnan(moments.variance))
+        moments.update(values[:10])
+        moments.update(values[10])
+        for value in values[11:50]:
+            moments.update(value)
+        other = Moments()
+        other.update(values[50:])
+        moments.merge(other)
+
+        self.assertEqual(moments.count, 100)
+        self.assertAlmostEqual(moments.mean, np.mean(values))
+        self.assertAlmostEqual(moments.variance, np.var(values, ddof=1))
+        self.assertAlmostEqual(moments.std, np.std(values, ddof=1))
+
+    def test_histogram(self):
+        """
+        Ensure that histograms grow as needed and can be merged
+        """
+        with self.assertRaises(ValueError):
+            Histogram(0)
+
+        hist = Histogram(0.5)
+        hist.update([0.0, 0.2, 0.5, 1.7])
+        self.assertEqual(hist.counts.tolist(), [2, 1, 0, 1])
+        self.assertEqual(hist.edges.tolist(), [0.0, 0.5, 1.0, 1.5, 2.0])
+
+        other = Histogram(0.5)
+        other.update(0.6)
+        hist.merge(other)
+        self.assertEqual(hist.counts.tolist(), [2, 2, 0, 1])
+
+        with self.assertRaises(ValueError):
+            hist.update(-1)
+        with self.assertRaises(ValueError):
+            hist.merge(Histogram(1))
+
+    def test_network(self):
+        """
+        Ensure that a network's statistics are accumulated
+        """
+        summary = Summary()
+        summary.update(myeloid)
+        self.assertEqual(summary.count, 1)
+        self.assertEqual(summary['in_degree'].moments.count, myeloid.size)
+        self.assertEqual(summary['out_degree'].moments.count, myeloid.size)
+        self.assertEqual(summary['canalizing'].moments.mean, len(myeloid.canalizing_nodes()))
+        self.assertAlmostEqual(summary['sensitivity'].moments.mean, myeloid.average_sensitivity())
+
+        graph = myeloid.network_graph()
+        self.assertAlmostEqual(summary['in_degree'].moments.mean,
+                               graph.number_of_edges() / len(graph))
+        self.assertAlmostEqual(summary['out_degree'].moments.mean,
+                               summary['in_degree'].moments.mean)
+
+    def test_graph(self):
+        """
+        Ensure that graphs only contribute degree statistics
+        """
+        summary = Summary().consume(MeanDegree(myeloid), 5)
+        self.assertEqual(summary.count, 5)
+        self.assertEqual(summary['in_degree'].moments.count, 5 * myeloid.size)
+        self.assertEqual(summary['bias'].moments.count, 0)
+
+    def test_consume(self):
+        """
+        Ensure that summaries consume randomizers and iterables
+        """
+        rand = UniformBias(myeloid)
+        with self.assertRaises(ValueError):
+            Summary().consume(rand)
+
+        summary = Summary().consume(rand, 10)
+        self.assertEqual(summary.count, 10)
+
+        summary = Summary().consume(rand.ensemble(size=3))
+        self.assertEqual(summary.count, 3)
+
+        summary = Summary().consume(iter(rand.random, None), 4)
+        self.assertEqual(summary.count, 4)
+
+    def test_merge(self):
+        """
+        Ensure that merged summaries agree with a single summary
+        """
+        nets = [UniformBias(myeloid).random() for _ in range(6)]
+        whole = Summary().consume(nets)
+        parts = Summary().consume(nets[:2]).merge(Summary().consume(nets[2:]))
+        parts = pickle.loads(pickle.dumps(parts))
+
+        self.assertEqual(whole.count, parts.count)
+        for name in Summary.STATISTICS:
+            self.assertEqual(whole[name].moments.count, parts[name].moments.count)
+            self.assertAlmostEqual(whole[name].moments.mean, parts[name].moments.mean)
+            self.assertEqual(whole[name].histogram.counts.tolist(),
+                             parts[name].histogram.counts.tolist())
+
+    def test_summarize(self):
+        """
+        Ensure that ensembles can be summarized across processes
+        """
+        rand = UniformBias(myeloid, p=0.25)
+        summary = summarize(rand, 7, processes=2)
+        self.assertEqual(summary.count, 7)
+        self.assertAlmostEqual(summary['bias'].moments.mean, 0.25, delta=0.1)
+        self.assertEqual(summarize(rand, 3).count, 3)
@@ -0,0 +1,71 @@
+import numpy as np
+import randomneet
+import unittest
+
+from neet.boolean import LogicNetwork
+from neet.boolean.examples import myeloid
+from randomneet.tables import truth_table, conditions, dependencies, is_irreducible, \
+    is_canalizing, network_tables, sensitivity
+
+
+class TestTables(unittest.TestCase):
+    """
+    Unit tests for the truth table utilities
+    """
+
+    def test_tables_module(self):
+        """
+        Ensure that tables is exported from randomneet
+        """
+        self.assertTrue('tables' in dir(randomneet))
+
+    def test_truth_table(self):
+        """
+        Conditions are encoded with the first predecessor as the most
+        significant bit
+        """
+        self.assertEqual(truth_table({'10', '11'}, 2).tolist(), [False, False, True, True])
+        self.assertEqual(truth_table(set(), 1).tolist(), [False, False])
+        self.assertEqual(truth_table({'0'}, 0).tolist(), [True])
+
+    def test_conditions_roundtrip(self):
+        """
+        Converting a truth table to conditions and back is lossless
+        """
+        for row in myeloid.table:
+            k = len(row[0])
+            self.assertEqual(conditions(truth_table(row[1], k)), row[1])
+
+    def test_dependencies(self):
+        """
+        Dependencies agree with ``LogicNetwork.is_dependent``
+        """
+        net = LogicNetwork([((1, 2), {'01', '10'}), ((0, 2), {'01', '10', '11'}),
+                            ((0, 1), {'11'})])
+        for node, (predecessors, conds) in enumerate(net.table):
+            got = dependencies(truth_table(conds, len(predecessors)))
+            expect = [net.is_dependent(node, p) for p in predecessors]
+            self.assertEqual(got, expect)
+        self.assertTrue(is_irreducible(truth_table({'01', '10'}, 2)))
+        self.assertFalse(is_irreducible(truth_table({'10', '11'}, 2)))
+
+    def test_is_canalizing(self):
+        """
+        Canalization agrees with ``LogicNetwork.canalizing_nodes``
+        """
+        expect = myeloid.canalizing_nodes()
+        for node, (predecessors, conds) in enumerate(myeloid.table):
+            got = is_canalizing(truth_table(conds, len(predecessors)))
+            self.assertEqual(got, node in expect)
+        self.assertFalse(is_canalizing(truth_table({'0'}, 0)))
+        self.assertFalse(is_canalizing(np.array([False, True, True, False])))
+
+    def test_sensitivity(self):
+        """
+        Average sensitivity agrees with ``LogicNetwork.average_sensitivity``
+        """
+        got = np.mean([sensitivity(table) for _, table in network_tables(myeloid)])
+        self.assertAlmostEqual(got, myeloid.average_sensitivity())
+        self.assertEqual(sensitivity(np.array([False, True, True, False])), 2.0)
+        self.assertEqual(sensitivity(np.array([False, False, False, True])), 1.0)
+        self.assertEqual(sensitivity(np.array([True])), 0.0)
@@ -3,11 +3,12 @@ import randomneet
 import unittest
 
 from collections import Counter
-from itertools import islice
+from itertools import cycle, islice
 from neet.boolean.examples import s_pombe
 from randomneet.constraints import IsIrreducible, IsConnected, GenericTopological, ConstraintError
 from randomneet.randomizer import AbstractRandomizer
-from randomneet.topology import TopologyRandomizer, FixedTopology, MeanDegree, InDegree, OutDegree
+from randomneet.topology import TopologyRandomizer, FixedTopology, MeanDegree, InDegree, OutDegree, \
+    NonIsomorphic, ConfigurationModel
 
 
 class MockTopologyRandomizer(TopologyRandomizer):
@@ -275,3 +276,74 @@ class TestTopologyRandomizers(unittest.TestCase):
                 self.assertEqual(out_degree(h), out_degree(g))
             except Exception as err:
                 raise Exception(h.in_degree, g.in_degree) from err
+
+    def test_configuration_model(self):
+        """
+        Ensure that the topologies generated by ConfigurationModel have the
+        same in- and out-degree of every node as the original topology, and no
+        multi-edges
+        """
+        for g in (nx.DiGraph([(0, 1), (1, 1), (2, 1), (1, 2)]), s_pombe.network_graph()):
+            rand = ConfigurationModel(g)
+            for h in islice(rand, 50):
+                self.assertEqual(sorted(h.nodes), sorted(g.nodes))
+                self.assertEqual(dict(h.in_degree), dict(g.in_degree))
+                self.assertEqual(dict(h.out_degree), dict(g.out_degree))
+
+            sources, targets = rand.random_edges()
+            self.assertEqual(len(sources), g.size())
+            self.assertEqual(len(set(zip(sources.tolist(), targets.tolist()))), g.size())
+
+    def test_configuration_model_self_loops(self):
+        """
+        ConfigurationModel can forbid self-loops, and gives up on degree
+        sequences it cannot repair
+        """
+        g = nx.DiGraph([(0, 1), (1, 2), (2, 0), (0, 2), (1, 1)])
+        rand = ConfigurationModel(g, self_loops=False)
+        for h in islice(rand, 50):
+            self.assertEqual(nx.number_of_selfloops(h), 0)
+            self.assertEqual(dict(h.in_degree), dict(g.in_degree))
+
+        rand = ConfigurationModel(nx.DiGraph([(0, 0)]), self_loops=False, max_repairs=3)
+        with self.assertRaises(ConstraintError):
+            rand.random()
+
+    def test_non_isomorphic(self):
+        """
+        Ensure that NonIsomorphic never generates isomorphic graphs
+        """
+        g = nx.DiGraph([(0, 1), (1, 2), (2, 0)])
+        rand = NonIsomorphic(MeanDegree(g))
+        graphs = list(islice(rand, 5))
+        for i, h in enumerate(graphs):
+            self.assertEqual(h.size(), g.size())
+            for other in graphs[:i]:
+                self.assertFalse(nx.is_isomorphic(h, other))
+        self.assertEqual(sum(map(len, rand.buckets.values())), 5)
+
+        rand.clear()
+        self.assertEqual(rand.buckets, {})
+
+        rand = NonIsomorphic(FixedTopology(g), timeout=5)
+        self.assertTrue(nx.is_isomorphic(rand.random(), g))
+        with self.assertRaises(ConstraintError):
+            rand.random()
+        self.assertEqual(rand.duplicates, 5)
+        self.assertEqual(rand.attempts, 6)
+
+        # the first result is consumed by the feasibility check of the base graph
+        flip = cycle([True, False])
+        rand = NonIsomorphic(FixedTopology(g), constraints=[lambda h: next(flip)], timeout=5)
+        rand.random()
+        with self.assertRaises(ConstraintError):
+            rand.random()
+        self.assertEqual(rand.attempts, 7)
+        self.assertEqual(rand.duplicates, 2)
+
+        rand = NonIsomorphic(InDegree(s_pombe), constraints=[IsConnected()])
+        for h in islice(rand, 3):
+            self.assertTrue(nx.is_weakly_connected(h))
+
+        with self.assertRaises(TypeError):
+            NonIsomorphic(s_pombe)